@@ -1,9 +1,14 @@
 # streamlit_app.py
+import atexit
+import logging
 import os
+from typing import Tuple
+
 import streamlit as st
 from dotenv import load_dotenv
 import subprocess
 
+from background import BackgroundRun, WorkflowPool
 from models import SearchConfig
 from workflow import Workflow
 
@@ -41,28 +46,93 @@ def ensure_storage_state(path: str):
             st.stop()
 
 
-def run_scraper(role, country, pages, batch_size, output_csv, browser, storage_state):
+@st.cache_resource
+def get_pool() -> WorkflowPool:
+    """
+    Workflows shared by every session of this server process: each run checks one
+    out, so up to MAX_CONCURRENT_RUNS users scrape at once, and idle Workflows keep
+    their LLM client, caches and browser for the next run.
+    """
+    pool = WorkflowPool(lambda: Workflow(keep_engine=True), size=int(os.getenv("MAX_CONCURRENT_RUNS", "2")))
+    atexit.register(pool.close)
+    return pool
+
+
+def start_scraper(role, country, pages, batch_size, output_csv, browser, storage_state, output_format="csv", resume_id="") -> Tuple[BackgroundRun, SearchConfig]:
+    """Start a run on a background thread; the returned run's `status` reports progress."""
     cfg = SearchConfig(
         role=role,
         country=country,
         pages=pages,
         batch_size=batch_size,
         output_csv=output_csv,
+        output_format=output_format,
         browser=browser,
         storage_state=storage_state,
+        run_id=resume_id or None,
+        resume=bool(resume_id),
     )
 
     ensure_storage_state(cfg.storage_state)
-
-    workflow = Workflow()
-    workflow.run(cfg)
-
-    return cfg.output_csv
+    output = os.path.abspath(cfg.resolved_output_path())
+
+    def job(status):
+        with get_pool().checkout(status, output) as workflow:
+            return workflow.run(cfg, status=status)
+
+    return BackgroundRun(job).start(), cfg
+
+
+def _fmt_eta(seconds) -> str:
+    if seconds is None:
+        return "–"
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}m {secs:02d}s" if minutes else f"{secs}s"
+
+
+def show_run(run: BackgroundRun, cfg: SearchConfig) -> None:
+    """Progress, cancel button and the rows saved so far; refreshes itself until the run ends."""
+    snap = run.status.snapshot()
+    if snap["batches_total"]:
+        done, total = snap["batches_done"], snap["batches_total"]
+    else:
+        done, total = snap["profiles_done"], snap["profiles_total"]
+    label = f"{snap['phase'].capitalize()}… run {snap['run_id']}" if snap["run_id"] else "Waiting for a free slot…"
+    st.progress(min(1.0, done / total) if total else 0.0, text=label)
+
+    cols = st.columns(5)
+    cols[0].metric("URLs found", snap["urls_found"])
+    cols[1].metric("Profiles", f"{snap['profiles_done']}/{snap['profiles_total']}")
+    cols[2].metric("Rows written", snap["rows_written"])
+    cols[3].metric("Rate", f"{snap['profiles_per_min']}/min")
+    cols[4].metric("ETA", _fmt_eta(snap["eta_s"]))
+
+    if not run.done:
+        if st.button("🛑 Cancel", disabled=run.status.cancelled):
+            run.cancel()
+    elif snap["phase"] == "done":
+        st.success(f"✅ Done. {snap['rows_written']} new rows saved to: {cfg.resolved_output_path()}")
+    elif snap["phase"] == "cancelled":
+        st.warning(f"🛑 Cancelled. Resume with run ID {snap['run_id']}" if snap["run_id"] else "🛑 Cancelled.")
+    else:
+        st.error(f"❌ Error: {snap['error']}")
+
+    # rows as the run writes them, not a re-read of the output file
+    rows = run.status.rows(200)
+    if rows:
+        st.dataframe(rows[::-1])
+
+    if run.done:
+        output_path = cfg.resolved_output_path()
+        if os.path.isfile(output_path):
+            with open(output_path, "rb") as f:
+                st.download_button("⬇️ Download results", f, file_name=os.path.basename(output_path))
 
 
 # ----------------- Streamlit UI -----------------
 def main():
     load_dotenv()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(message)s")
     st.title("🔍 ScrapedIn")
 
     st.sidebar.header("Configuration")
@@ -72,23 +142,32 @@ def main():
     pages = st.sidebar.number_input("Pages", min_value=1, max_value=20, value=int(os.getenv("PAGES", "3")))
     batch_size = int(os.getenv("BATCH_SIZE", "5"))
     output_csv = st.sidebar.text_input("Output CSV filename", value=os.getenv("OUTPUT", "output.csv"))
+    output_format = st.sidebar.selectbox("Output format", ["csv", "jsonl", "sqlite", "parquet"], index=0)
     browser = st.sidebar.selectbox("Browser", ["chromium", "firefox", "webkit"], index=0)
     storage_state = os.getenv("STORAGE_STATE", "linkedin_auth.json")
+    resume_id = st.sidebar.text_input("Resume run ID (optional)", value="").strip()
 
-    if st.button("🚀 Run Scraper"):
-        with st.spinner("Running scraper..."):
-            try:
-                output_path = run_scraper(role, country, pages, batch_size, output_csv, browser, storage_state)
-                st.success(f"✅ Done. Results saved to: {output_path}")
-
-                # Optionally, show a preview of CSV if exists
-                if os.path.exists(output_path):
-                    import pandas as pd
-                    df = pd.read_csv(output_path)
-                    st.dataframe(df.head(20))  # preview first 20 rows
-                    st.download_button("⬇️ Download CSV", df.to_csv(index=False), file_name=output_path)
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
+    current = st.session_state.get("run")
+    running = current is not None and not current[0].done
+    if st.button("🚀 Run Scraper", disabled=running):
+        try:
+            st.session_state["run"] = start_scraper(role, country, pages, batch_size, output_csv, browser,
+                                                    storage_state, output_format, resume_id)
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
+
+    if "run" in st.session_state:
+        run, cfg = st.session_state["run"]
+
+        # only this part reruns while the job is going; the rest of the page stays put
+        @st.fragment(run_every=None if run.done else 1.0)
+        def progress_panel():
+            show_run(run, cfg)
+            if run.done and st.session_state.get("run_shown") != run.id:
+                st.session_state["run_shown"] = run.id
+                st.rerun()  # one full rerun to stop polling and re-enable the Run button
+
+        progress_panel()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+# background.py
+import collections
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from sinks import PROFILE_HEADERS
+
+log = logging.getLogger(__name__)
+
+
+class RunCancelled(Exception):
+    """Raised inside a run at the next batch or SERP-page boundary after a cancel."""
+
+
+class RunStatus:
+    """
+    Progress channel between a running Workflow and whoever watches it (the Streamlit
+    UI polls `snapshot()` and `rows()`). The workflow reports URLs found, profiles
+    queued and scraped, and batches saved; the watcher may `cancel()`, which stops the
+    run at the next batch boundary (resumable with the same run ID when checkpointing
+    is on). Thread-safe; only the last `max_rows` saved rows are kept.
+    """
+
+    def __init__(self, max_rows: int = 500):
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._rows: Deque[Dict] = collections.deque(maxlen=max_rows)
+        self.phase = "queued"  # queued -> searching -> scraping -> done | cancelled | failed
+        self.run_id = ""
+        self.urls_found = 0
+        self.profiles_total = 0  # grows while the pipeline is still searching
+        self.profiles_done = 0
+        self.batches_done = 0
+        self.batches_total = 0  # 0 when batches are formed on the fly (pipeline mode)
+        self.rows_written = 0
+        self.error = ""
+        self._started = 0.0
+        self._scrape_started = 0.0
+        self._finished = 0.0
+
+    # ---- reported by the workflow ----
+    def start(self, run_id: str) -> None:
+        with self._lock:
+            self.run_id = run_id
+            self.phase = "searching"
+            self._started = time.monotonic()
+
+    def found(self, n: int) -> None:
+        with self._lock:
+            self.urls_found += n
+
+    def queued(self, n: int, batches: int = 0) -> None:
+        with self._lock:
+            self.profiles_total += n
+            self.batches_total += batches
+
+    def scraped(self, n: int) -> None:
+        with self._lock:
+            if not self._scrape_started:
+                self._scrape_started = time.monotonic()
+                self.phase = "scraping"
+            self.profiles_done += n
+
+    def saved(self, rows: List[Dict]) -> None:
+        """One batch went to the sink; `rows` are the ones it accepted."""
+        with self._lock:
+            self.batches_done += 1
+            self.rows_written += len(rows)
+            self._rows.extend({h: r.get(h, "") or "" for h in PROFILE_HEADERS} for r in rows)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._finished = time.monotonic()
+            if isinstance(error, RunCancelled):
+                self.phase = "cancelled"
+            elif error is not None:
+                self.phase = "failed"
+                self.error = str(error) or type(error).__name__
+            else:
+                self.phase = "done"
+
+    # ---- used by the watcher ----
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self) -> None:
+        """Raise RunCancelled if the watcher asked to stop."""
+        if self._cancel.is_set():
+            raise RunCancelled(f"Run {self.run_id or '(not started)'} cancelled")
+
+    @property
+    def finished(self) -> bool:
+        return bool(self._finished)
+
+    def snapshot(self) -> Dict:
+        """Counters plus profiles/min since scraping began and the ETA for what is queued so far."""
+        with self._lock:
+            now = self._finished or time.monotonic()
+            scraping_s = now - self._scrape_started if self._scrape_started else 0.0
+            rate = self.profiles_done / scraping_s if scraping_s > 0 else 0.0
+            left = max(0, self.profiles_total - self.profiles_done)
+            return {
+                "phase": self.phase,
+                "run_id": self.run_id,
+                "urls_found": self.urls_found,
+                "profiles_total": self.profiles_total,
+                "profiles_done": self.profiles_done,
+                "batches_done": self.batches_done,
+                "batches_total": self.batches_total,
+                "rows_written": self.rows_written,
+                "elapsed_s": round(now - self._started, 1) if self._started else 0.0,
+                "profiles_per_min": round(rate * 60, 1),
+                "eta_s": round(left / rate) if rate and not self._finished else None,
+                "error": self.error,
+            }
+
+    def rows(self, limit: Optional[int] = None) -> List[Dict]:
+        """The most recently saved rows, oldest first."""
+        with self._lock:
+            rows = list(self._rows)
+        return rows[-limit:] if limit else rows
+
+
+class BackgroundRun:
+    """`target(status)` on a daemon thread; `status` is the run's progress channel."""
+
+    def __init__(self, target: Callable[[RunStatus], object], max_rows: int = 500):
+        self.id = uuid.uuid4().hex[:8]
+        self.status = RunStatus(max_rows=max_rows)
+        self.result = None
+        self._target = target
+        self._thread = threading.Thread(target=self._main, name=f"run-{self.id}", daemon=True)
+
+    def start(self) -> "BackgroundRun":
+        self._thread.start()
+        return self
+
+    def _main(self) -> None:
+        try:
+            self.result = self._target(self.status)
+        except BaseException as e:
+            if not isinstance(e, RunCancelled):
+                log.exception(f"❌ Background run {self.id} failed")
+            self.status.finish(e)
+        else:
+            self.status.finish()
+
+    def cancel(self) -> None:
+        self.status.cancel()
+
+    @property
+    def done(self) -> bool:
+        return self.status.finished
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._thread.join(timeout)
+
+
+class WorkflowPool:
+    """
+    Long-lived Workflows for a UI with several users: every concurrent run checks out
+    its own Workflow (per-run state such as the sink and extract stats isn't shared),
+    so runs never wait on each other's batches. At most `size` run at once; later
+    ones stay "queued" until a Workflow frees up. Idle Workflows keep their browser.
+    """
+
+    def __init__(self, factory: Callable[[], object], size: int = 2):
+        self.factory = factory
+        self.size = max(1, size)
+        self._idle: List = []
+        self._busy = 0
+        self._outputs: Set[str] = set()
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def checkout(self, status: Optional[RunStatus] = None, output: str = ""):
+        """
+        A Workflow for one run. Waiting can be cancelled through `status`; a run
+        writing to an `output` another run is already writing to is refused.
+        """
+        with self._cond:
+            if output and output in self._outputs:
+                raise ValueError(f"{output} is already being written by another run")
+            self._outputs.add(output)  # reserved while queued, too
+            try:
+                while True:
+                    if status is not None:
+                        status.check()
+                    if self._idle or self._busy < self.size:
+                        break
+                    self._cond.wait(timeout=0.5)
+            except BaseException:
+                self._outputs.discard(output)
+                raise
+            workflow = self._idle.pop() if self._idle else None
+            self._busy += 1
+        try:
+            if workflow is None:
+                workflow = self.factory()
+            yield workflow
+        finally:
+            with self._cond:
+                self._busy -= 1
+                self._outputs.discard(output)
+                if workflow is not None:
+                    self._idle.append(workflow)
+                self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for workflow in idle:
+            workflow.close()
@@ -0,0 +1,51 @@
+# bench/compact_bench.py
+"""
+Prompt compaction: estimated profile-text tokens per prompt before and after
+PromptCompactor, on the fixtures, for both the legacy nested-div lines and the
+section extractor's lines. Also checks that nothing extraction needs was lost:
+the top-card name and headline and every email on the page must survive.
+
+    python bench/compact_bench.py
+    python bench/compact_bench.py --budget 200
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from compact import PromptCompactor, lines_tokens
+from fast_extract import EMAIL_RE
+from profile_text import extract_profile_text
+from profile_text_bench import FIXTURES, legacy_lines
+
+
+def kept_fields(lines, top_card, source_lines) -> bool:
+    text = "\n".join(lines).lower()
+    needed = [v for v in (top_card.get("name"), top_card.get("headline")) if v]
+    needed += EMAIL_RE.findall("\n".join(source_lines))
+    return all(v.lower() in text for v in needed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=int, default=350, help="Token budget per profile")
+    args = parser.parse_args()
+
+    compactor = PromptCompactor(token_budget=args.budget, learn=False)
+    for path in sorted(FIXTURES.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        parsed = extract_profile_text(html, 100)
+        for label, lines in (("legacy", legacy_lines(html)), ("sections", parsed["lines"])):
+            row = {"url": path.name, "lines": lines, "top_card": parsed["top_card"]}
+            out = compactor.compact(row)
+            raw = lines_tokens(lines)
+            ok = kept_fields(out["lines"], parsed["top_card"], lines)
+            print(f"{path.name:<24} {label:<9} {len(lines):>3} lines ~{raw:>5} tok -> "
+                  f"{len(out['lines']):>3} lines ~{out['tokens_after']:>5} tok "
+                  f"({1 - out['tokens_after'] / raw if raw else 0:.0%} smaller)  fields kept: {'yes' if ok else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
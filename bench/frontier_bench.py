@@ -0,0 +1,79 @@
+# bench/frontier_bench.py
+"""
+Large-run bookkeeping: peak Python memory and per-step checkpoint size while
+batching N URLs the default way (the urls list plus pre-chunked batches in
+GraphState, popped from the front) and the --large-run way (URLs in the on-disk
+Frontier, only a cursor in the state). No browser or LLM is involved, just the state the
+graph nodes carry.
+
+    python bench/frontier_bench.py
+    python bench/frontier_bench.py --urls 1000 100000 --batch-size 5
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from frontier import Frontier
+from tools import chunk_list
+
+
+def _urls(n: int, page: int = 10):
+    for start in range(0, n, page):  # one SERP page at a time
+        yield [f"https://www.linkedin.com/in/person-{i}" for i in range(start, min(n, start + page))]
+
+
+def in_state(n: int, batch_size: int) -> dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+    urls = sorted(u for page in _urls(n) for u in page)
+    state = {"urls": urls, "batches": chunk_list(urls, batch_size), "current_batch": []}
+    checkpoint_bytes = len(json.dumps(state))
+    while state["batches"]:
+        state["current_batch"] = state["batches"].pop(0)
+    wall = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"peak_mb": peak / 2**20, "checkpoint_bytes": checkpoint_bytes, "wall_s": wall}
+
+
+def on_disk(n: int, batch_size: int, path: str) -> dict:
+    frontier = Frontier(path)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for page in _urls(n):
+        frontier.add("bench", page)
+    state = {"frontier_cursor": 0, "frontier_left": frontier.remaining("bench", 0), "current_batch": []}
+    checkpoint_bytes = len(json.dumps(state))
+    while state["frontier_left"]:
+        state["current_batch"], state["frontier_cursor"] = frontier.batch("bench", state["frontier_cursor"], batch_size)
+        state["frontier_left"] -= len(state["current_batch"])
+    wall = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    frontier.clear("bench")
+    frontier.close()
+    return {"peak_mb": peak / 2**20, "checkpoint_bytes": checkpoint_bytes, "wall_s": wall}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--batch-size", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.urls:
+            for name, r in (("in state", in_state(n, args.batch_size)),
+                            ("frontier", on_disk(n, args.batch_size, f"{tmp}/frontier-{n}.sqlite"))):
+                print(f"{n:>7} URLs  {name:<8}  peak {r['peak_mb']:7.2f} MB  "
+                      f"checkpoint {r['checkpoint_bytes'] / 1024:8.1f} KiB/step  {r['wall_s']:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# bench/profile_text_bench.py
+"""
+Profile text extraction: old page.content() + BeautifulSoup walk vs the section extractor.
+
+    python bench/profile_text_bench.py                # snapshot path (lxml / bs4 fallback)
+    python bench/profile_text_bench.py --browser      # also time page.evaluate in Chromium
+
+Reports per fixture: CPU ms per parse, bytes that cross the Playwright pipe, and
+lines returned vs unique lines.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup
+
+from profile_text import PROFILE_TEXT_JS, _extract_bs4, extract_profile_text, js_args, lxml_html
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def legacy_lines(html: str, max_lines: int = 100) -> List[str]:
+    """The previous parser: get_text of every h1/span/div, nested wrappers included."""
+    results = []
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup.find_all(["h1", "span", "div"]):
+        text = tag.get_text(strip=True)
+        if text:
+            results.append(text)
+        if len(results) >= max_lines:
+            break
+    return results
+
+
+def cpu_ms(fn: Callable, html: str, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(html)
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def yield_of(lines: List[str]) -> str:
+    return f"{len(set(lines))}/{len(lines)}"
+
+
+async def browser_numbers(html: str, repeat: int) -> Dict:
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html)
+        t = time.perf_counter()
+        for _ in range(repeat):
+            content = await page.content()
+        content_ms = (time.perf_counter() - t) * 1000 / repeat
+        t = time.perf_counter()
+        for _ in range(repeat):
+            result = await page.evaluate(PROFILE_TEXT_JS, js_args(100))
+        evaluate_ms = (time.perf_counter() - t) * 1000 / repeat
+        await browser.close()
+    return {
+        "content_ms": round(content_ms, 2),
+        "evaluate_ms": round(evaluate_ms, 2),
+        "content_bytes": len(content.encode("utf-8")),
+        "evaluate_bytes": len(json.dumps(result).encode("utf-8")),
+        "matches_snapshot_parser": result == extract_profile_text(html),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--browser", action="store_true", help="Also measure the in-page path with Playwright")
+    args = parser.parse_args()
+
+    print(f"parser: {'lxml' if lxml_html is not None else 'bs4 fallback'}, repeat={args.repeat}")
+    for path in sorted(FIXTURES.glob("profile_*.html")):
+        html = path.read_text(encoding="utf-8")
+        old = legacy_lines(html)
+        new = extract_profile_text(html)
+        row = {
+            "fixture": path.name,
+            "legacy_cpu_ms": round(cpu_ms(legacy_lines, html, args.repeat), 2),
+            "new_cpu_ms": round(cpu_ms(extract_profile_text, html, args.repeat), 2),
+            "bs4_fallback_cpu_ms": round(cpu_ms(lambda h: _extract_bs4(h, 100), html, args.repeat), 2),
+            "legacy_pipe_bytes": len(html.encode("utf-8")),
+            "new_pipe_bytes": len(json.dumps(new).encode("utf-8")),
+            "legacy_unique/lines": yield_of(old),
+            "new_unique/lines": yield_of(new["lines"]),
+        }
+        if args.browser:
+            row.update(asyncio.run(browser_numbers(html, args.repeat)))
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# bench/run_bench.py
+"""
+End-to-end offline benchmark: Workflow.run against the local stand-in server with a
+fake LLM, at several profile counts. Each size runs in its own process so peak RSS
+is per size.
+
+    python bench/run_bench.py                              # 10 / 100 / 1000 profiles
+    python bench/run_bench.py --profiles 100 --mode pipeline --save baseline.json
+    python bench/run_bench.py --profiles 100 --compare baseline.json
+
+Reports wall time, per-stage throughput and p50/p95 latency, peak RSS (this process
+and the browser/driver children) and bytes written to outputs and caches.
+"""
+import argparse
+import logging
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def _stage_summary(samples: Dict[str, List]) -> Dict:
+    from waits import percentile
+
+    out = {}
+    for stage, rows in samples.items():
+        secs = [s for s, _ in rows]
+        items = sum(n for _, n in rows)
+        busy = sum(secs)
+        out[stage] = {
+            "calls": len(rows),
+            "items": items,
+            "busy_s": round(busy, 3),
+            "items_per_s": round(items / busy, 2) if busy else 0.0,
+            "p50_ms": round(percentile([s * 1000 for s in secs], 50), 1),
+            "p95_ms": round(percentile([s * 1000 for s in secs], 95), 1),
+        }
+    return out
+
+
+def _dir_bytes(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def run_one(args) -> Dict:
+    """Run a single size in this process and return its measurements."""
+    from fakes import FakeExtractChatModel
+    from models import SearchConfig
+    from standin import StandInServer
+    from workflow import Workflow
+
+    samples: Dict[str, List] = defaultdict(list)
+
+    class TimedWorkflow(Workflow):
+        def _engine_args(self, config):
+            # the browser fetches Google and LinkedIn URLs from the stand-in server
+            return dict(super()._engine_args(config), upstreams=server.upstreams())
+
+        # per-call duration and item count for each stage of the graph
+        def _timed(self, stage, fn, state, count):
+            t = time.perf_counter()
+            out = fn(state)
+            samples[stage].append((time.perf_counter() - t, count(out)))
+            return out
+
+        def _node_search_pages(self, state):
+            # a large run's URLs are in the frontier, not the state
+            return self._timed("search", super()._node_search_pages, state,
+                               lambda s: s["frontier_left"] if s.get("frontier_cursor") is not None else len(s["urls"]))
+
+        def _node_scrape_batch(self, state):
+            return self._timed("scrape", super()._node_scrape_batch, state, lambda s: len(s["batch_results"]))
+
+        def _node_save_batch(self, state):
+            return self._timed("save", super()._node_save_batch, state, lambda s: len(s["batch_results"]))
+
+        def extract_rows(self, rows, cfg):
+            # shared by both modes (the pipeline calls it directly)
+            t = time.perf_counter()
+            out = super().extract_rows(rows, cfg)
+            samples["extract"].append((time.perf_counter() - t, len(rows)))
+            return out
+
+    n = args.one
+    work = Path(tempfile.mkdtemp(prefix="scrapedin-bench-"))
+    state_file = work / "storage_state.json"
+    state_file.write_text(json.dumps({"cookies": [], "origins": []}))
+    per_page = 10
+
+    with StandInServer(n, per_page=per_page, latency_ms=args.latency_ms, page_kb=args.page_kb) as server:
+        cfg = SearchConfig(
+            role="founder",
+            country="united kingdom",
+            pages=math.ceil(n / per_page),
+            per_page=per_page,
+            batch_size=args.batch_size,
+            output_csv=str(work / "output.csv"),
+            output_format=args.output_format,
+            storage_state=str(state_file),
+            headless=True,
+            concurrency=args.concurrency,
+            serp_concurrency=args.serp_concurrency,
+            min_request_interval=0.0,
+            serp_min_interval=0.0,
+            serp_jitter=0.0,
+            extract_mode=args.extract_mode,
+            fast_path=not args.no_fast_path,
+            mode=args.mode,
+            large_run=args.large_run,
+            llm_cache_path=str(work / "cache" / "llm_cache.sqlite"),
+            snapshot_path=str(work / "cache" / "snapshots.sqlite"),
+            checkpoint_path=str(work / "cache" / "checkpoints.sqlite"),
+            seen_index_path=str(work / "cache" / "seen.sqlite"),
+            frontier_path=str(work / "cache" / "frontier.sqlite"),
+        )
+        workflow = TimedWorkflow(llm=FakeExtractChatModel(latency=args.llm_latency))
+        started = time.perf_counter()
+        workflow.run(cfg)
+        wall = time.perf_counter() - started
+
+    output = Path(cfg.resolved_output_path())
+    output_bytes = _dir_bytes(output) if output.is_dir() else (output.stat().st_size if output.exists() else 0)
+    return {
+        "profiles": n,
+        "mode": args.mode + ("+large" if args.large_run else ""),
+        "wall_s": round(wall, 2),
+        "profiles_per_s": round(n / wall, 2) if wall else 0.0,
+        "stages": _stage_summary(samples),
+        "llm_calls": workflow.llm.calls,
+        "server_requests": server.requests,
+        "server_bytes": server.bytes_served,
+        "output_bytes": output_bytes,
+        "cache_bytes": _dir_bytes(work / "cache"),
+        # ru_maxrss is KiB on Linux; children = Playwright driver and browser processes
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_rss_children_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "workdir": str(work),
+    }
+
+
+def _child_argv(args, n: int) -> List[str]:
+    argv = [sys.executable, __file__, "--one", str(n)]
+    for flag in ("latency_ms", "page_kb", "llm_latency", "batch_size", "concurrency", "serp_concurrency",
+                 "mode", "extract_mode", "output_format", "log_level"):
+        argv += ["--" + flag.replace("_", "-"), str(getattr(args, flag))]
+    if args.no_fast_path:
+        argv.append("--no-fast-path")
+    if args.large_run:
+        argv.append("--large-run")
+    return argv
+
+
+def _print_table(results: List[Dict], baseline: Dict) -> None:
+    for r in results:
+        line = (f"{r['profiles']:>5} profiles [{r['mode']}]  {r['wall_s']:>7.2f}s  "
+                f"{r['profiles_per_s']:>6.2f}/s  rss {r['peak_rss_mb']}MB (+{r['peak_rss_children_mb']}MB children)  "
+                f"out {r['output_bytes'] / 1024:.0f}KiB  cache {r['cache_bytes'] / 1024:.0f}KiB")
+        base = baseline.get(str(r["profiles"]))
+        if base:
+            line += f"  vs baseline {base['wall_s']:.2f}s ({(r['wall_s'] / base['wall_s'] - 1) * 100:+.0f}%)"
+        print(line)
+        for stage, s in r["stages"].items():
+            print(f"        {stage:<8} {s['items']:>5} items  {s['items_per_s']:>8.2f}/s  "
+                  f"p50 {s['p50_ms']:>8.1f}ms  p95 {s['p95_ms']:>8.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stand-in server delay per response")
+    parser.add_argument("--page-kb", type=float, default=60.0, help="Profile page size")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Fake LLM seconds per call")
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--serp-concurrency", type=int, default=2)
+    parser.add_argument("--mode", choices=["graph", "pipeline"], default="graph")
+    parser.add_argument("--extract-mode", choices=["serial", "concurrent", "packed"], default="concurrent")
+    parser.add_argument("--output-format", choices=["csv", "jsonl", "sqlite", "parquet"], default="csv")
+    parser.add_argument("--no-fast-path", action="store_true")
+    parser.add_argument("--large-run", action="store_true", help="Graph mode with the on-disk URL frontier")
+    parser.add_argument("--save", type=str, help="Write results as a baseline JSON file")
+    parser.add_argument("--compare", type=str, help="Baseline JSON to compare wall time against")
+    parser.add_argument("--log-level", type=str, default="WARNING",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Workflow log level (to stderr)")
+    parser.add_argument("--one", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one is not None:
+        logging.basicConfig(level=args.log_level, format="%(message)s")  # stderr; stdout carries the result
+        print(json.dumps(run_one(args)))
+        return
+
+    results = []
+    for n in args.profiles:
+        proc = subprocess.run(_child_argv(args, n), stdout=subprocess.PIPE, text=True, cwd=ROOT)
+        if proc.returncode != 0:
+            print(f"❌ {n} profiles failed (exit {proc.returncode})")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    baseline = {}
+    if args.compare and os.path.exists(args.compare):
+        baseline = {str(r["profiles"]): r for r in json.load(open(args.compare))}
+    _print_table(results, baseline)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Saved {len(results)} results to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# bench/standin.py
+"""
+Local stand-in for Google and LinkedIn: synthetic SERPs and profile pages served over
+plain HTTP with configurable latency and page size. Point the scraper at it with
+build_engine(upstreams=server.upstreams()).
+"""
+import html
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+
+def profile_slug(i: int) -> str:
+    return f"bench-person-{i:05d}"
+
+
+def serp_page(total: int, start: int, per_page: int, query: str) -> str:
+    items = []
+    for i in range(start, min(start + per_page, total)):
+        items.append(
+            f'<div class="g"><a href="https://www.linkedin.com/in/{profile_slug(i)}" data-ved="x">'
+            f"<h3>Person {i} - Founder - LinkedIn</h3></a><div>Founder at Company {i}</div></div>"
+        )
+    pager = ""
+    if start + per_page < total:
+        pager = (
+            '<div role="navigation"><table><tr>'
+            f'<td><a id="pnnext" href="/search?q={html.escape(query)}&amp;start={start + per_page}">Next</a></td>'
+            "</tr></table></div>"
+        )
+    return (
+        f"<!DOCTYPE html><html><head><title>{html.escape(query)} - Google Search</title></head><body>"
+        f'<div id="result-stats">About {total} results (0.21 seconds)</div>'
+        f'<div id="search"><div id="rso">{"".join(items)}</div></div>'
+        f'<div id="botstuff">{pager}</div></body></html>'
+    )
+
+
+def profile_page(i: int, page_bytes: int) -> str:
+    # every other profile has a plain email so the fast path and the LLM both get work
+    email = f"<div>Reach me at person{i}@example.com</div>" if i % 2 == 0 else ""
+    body = (
+        '<main><section class="artdeco-card pv-top-card"><div class="ph5">'
+        f'<div><h1 class="text-heading-xlarge">Person Number{i}</h1></div>'
+        f'<div class="text-body-medium">Founder &amp; CEO at Company {i}</div>'
+        "<div><span>London, England, United Kingdom</span></div>"
+        '<button><span>Connect</span></button></div></section>'
+        '<section class="artdeco-card"><div id="about"></div>'
+        '<h2><span aria-hidden="true">About</span><span class="visually-hidden">About</span></h2>'
+        f"<div><span>Building products at Company {i} for teams across Europe and beyond.</span></div>"
+        f"{email}</section></main>"
+    )
+    head = f"<!DOCTYPE html><html><head><title>Person Number{i} | LinkedIn</title></head><body>"
+    tail = "</body></html>"
+    # pad with sidebar markup (outside the sections the extractor reads) up to page_bytes
+    filler = '<aside><div class="feed">' + "<div><span>People also viewed</span></div>" * 8 + "</div></aside>"
+    pad = max(0, page_bytes - len(head) - len(body) - len(tail))
+    return head + body + (filler * (pad // len(filler) + 1))[:pad] + tail
+
+
+class StandInServer:
+    """Threaded HTTP server with `total` profiles; every response is delayed by `latency_ms`."""
+
+    def __init__(self, total: int, per_page: int = 10, latency_ms: float = 50.0, page_kb: float = 60.0, port: int = 0):
+        self.total = total
+        self.per_page = per_page
+        self.latency_s = latency_ms / 1000.0
+        self.page_bytes = int(page_kb * 1024)
+        self.requests = {"serp": 0, "profile": 0, "other": 0}
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def upstreams(self) -> Dict[str, str]:
+        return {"www.google.com": self.base_url, "www.linkedin.com": self.base_url}
+
+    def start(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _count(self, kind: str, nbytes: int) -> None:
+        with self._lock:
+            self.requests[kind] += 1
+            self.bytes_served += nbytes
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(server.latency_s)
+                p = urlparse(self.path)
+                kind, status, body = "other", 404, "not found"
+                if p.path == "/search":
+                    qs = parse_qs(p.query)
+                    start = int(qs.get("start", ["0"])[0])
+                    kind, status = "serp", 200
+                    body = serp_page(server.total, start, server.per_page, qs.get("q", [""])[0])
+                elif p.path.startswith("/in/bench-person-"):
+                    i = int(p.path.rstrip("/").rsplit("-", 1)[-1])
+                    if i < server.total:
+                        kind, status, body = "profile", 200, profile_page(i, server.page_bytes)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                server._count(kind, len(data))
+
+            def log_message(self, format, *args):  # keep benchmark output clean
+                pass
+
+        return Handler
@@ -0,0 +1,83 @@
+# bench/startup_bench.py
+"""
+CLI startup time and import hygiene. Each measurement runs in a fresh interpreter.
+
+    python bench/startup_bench.py                      # report
+    python bench/startup_bench.py --max-ms 800         # also fail (exit 1) above 800 ms median
+
+Reports the median wall time of `import workflow` and `main.py --help`, the slowest
+imports from `python -X importtime`, and fails if any module in HEAVY is imported
+before a stage needs it (LangGraph, the LangChain/Gemini client, Playwright,
+BeautifulSoup, pyarrow are all loaded on first use).
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = ["langgraph", "langchain_core", "langchain_google_genai", "playwright", "bs4", "pyarrow", "pyinstrument"]
+
+CHECK_HEAVY = (
+    "import sys, workflow, main, jobs, workqueue\n"
+    "workflow.Workflow()\n"
+    f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+)
+
+
+def _wall_ms(argv: List[str], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(argv, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _slowest_imports(module: str, top: int) -> List[Tuple[int, str]]:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="Slowest imports to list")
+    parser.add_argument("--max-ms", type=float, help="Fail if `main.py --help` median exceeds this")
+    args = parser.parse_args()
+
+    import_ms = _wall_ms([sys.executable, "-c", "import workflow"], args.runs)
+    help_ms = _wall_ms([sys.executable, "main.py", "--help"], args.runs)
+    print(f"import workflow   {import_ms:8.1f} ms (median of {args.runs})")
+    print(f"main.py --help    {help_ms:8.1f} ms")
+    print("slowest imports (cumulative):")
+    for us, name in _slowest_imports("workflow", args.top):
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    loaded = subprocess.run([sys.executable, "-c", CHECK_HEAVY], cwd=ROOT, capture_output=True, text=True,
+                            check=True).stdout.strip()
+    failed = False
+    if loaded:
+        print(f"❌ imported at startup: {loaded}")
+        failed = True
+    else:
+        print("✅ no heavy modules imported at startup")
+    if args.max_ms is not None and help_ms > args.max_ms:
+        print(f"❌ startup {help_ms:.0f} ms is over the {args.max_ms:.0f} ms limit")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
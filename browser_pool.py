@@ -0,0 +1,199 @@
+# browser_pool.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+
+from network import RequestFilter, TrafficMeter
+
+
+# Flags that make headless Chromium look less like automation (used to live in the SERP fetcher)
+CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor'
+]
+
+
+class _PooledPage:
+    """A page plus how many times it has been lent out."""
+
+    def __init__(self, page):
+        self.page = page
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    One Playwright browser shared by named contexts ("serp", "profile", ...).
+    Callers borrow pages with `async with pool.page("profile") as page:`; at most
+    `size` pages per context are out at once, and pages are recycled after
+    `max_page_uses` loans or as soon as a loan raises.
+    An optional RequestFilter is installed on every context, and a TrafficMeter
+    counts bytes transferred per page.
+    Must be used from a single event loop (see engine.ScrapeEngine).
+    """
+
+    def __init__(
+        self,
+        browser: str = "chromium",
+        headless: bool = True,
+        size: int = 2,
+        max_page_uses: int = 25,
+        request_filter: Optional[RequestFilter] = None,
+    ):
+        self.browser = browser
+        self.headless = headless
+        self.size = max(1, size)
+        self.max_page_uses = max(1, max_page_uses)
+        self.request_filter = request_filter
+        self.meter = TrafficMeter(request_filter)
+
+        self._context_specs: Dict[str, Dict] = {}
+        self._contexts: Dict[str, object] = {}
+        self._idle: Dict[str, List[_PooledPage]] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+        self._pw = None
+        self._browser = None
+
+        # throughput stats
+        self.pages_served = 0
+        self.pages_recycled = 0
+        self.started_at: Optional[float] = None
+
+    # ---- configuration ----
+    def add_context(self, name: str, init_script: Optional[str] = None, **context_options) -> "BrowserPool":
+        """Register a named context; it is created lazily on first borrow."""
+        self._context_specs[name] = {"init_script": init_script, "options": context_options}
+        return self
+
+    # ---- lifecycle ----
+    async def start(self) -> "BrowserPool":
+        if self._browser is not None:
+            return self
+        from playwright.async_api import async_playwright  # deferred: only runs that browse pay for it
+
+        self._pw = await async_playwright().start()
+        launch_kwargs = {"headless": self.headless}
+        if self.browser == "chromium":
+            launch_kwargs["args"] = CHROMIUM_ARGS
+        self._browser = await getattr(self._pw, self.browser).launch(**launch_kwargs)
+        self.started_at = time.monotonic()
+        return self
+
+    async def close(self) -> None:
+        for pages in self._idle.values():
+            for pp in pages:
+                await self._safe_close(pp.page)
+        self._idle.clear()
+        for ctx in self._contexts.values():
+            await self._safe_close(ctx)
+        self._contexts.clear()
+        self._slots.clear()
+        if self._browser is not None:
+            await self._safe_close(self._browser)
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    # ---- borrowing ----
+    @asynccontextmanager
+    async def page(self, context: str = "default"):
+        """Borrow a page from `context`, waiting for a free slot; it goes back unless it crashed or is worn out."""
+        ctx = await self._get_context(context)
+        slots = self._slots[context]
+        await slots.acquire()
+        try:
+            pp = await self._acquire(context, ctx)
+            crashed = False
+            try:
+                yield pp.page
+            except Exception:
+                crashed = True
+                raise
+            finally:
+                await self._release(context, pp, crashed)
+        finally:
+            slots.release()
+
+    async def _get_context(self, name: str):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if name not in self._contexts:
+                if name not in self._context_specs:
+                    self.add_context(name)
+                await self.start()
+                spec = self._context_specs[name]
+                ctx = await self._browser.new_context(**spec["options"])
+                if spec["init_script"]:
+                    await ctx.add_init_script(spec["init_script"])
+                if self.request_filter is not None:
+                    await self.request_filter.install(ctx)
+                self.meter.attach(ctx)
+                self._contexts[name] = ctx
+                self._idle[name] = []
+                self._slots[name] = asyncio.Semaphore(self.size)
+        return self._contexts[name]
+
+    async def _acquire(self, context: str, ctx) -> _PooledPage:
+        idle = self._idle[context]
+        while idle:
+            pp = idle.pop()
+            if not pp.page.is_closed():
+                break
+        else:
+            pp = _PooledPage(await ctx.new_page())
+        self.meter.take(pp.page)  # drop late requests from the previous loan
+        pp.uses += 1
+        self.pages_served += 1
+        return pp
+
+    async def _release(self, context: str, pp: _PooledPage, crashed: bool) -> None:
+        self.meter.take(pp.page)
+        if crashed or pp.uses >= self.max_page_uses or pp.page.is_closed():
+            self.pages_recycled += 1
+            await self._safe_close(pp.page)
+            return
+        self._idle[context].append(pp)
+
+    # ---- metrics ----
+    def take_bytes(self, page) -> int:
+        """Bytes transferred by `page` since it was borrowed (or since the last call)."""
+        return self.meter.take(page)
+
+    def pages_per_minute(self) -> float:
+        if not self.started_at:
+            return 0.0
+        elapsed = time.monotonic() - self.started_at
+        return self.pages_served / elapsed * 60.0 if elapsed > 0 else 0.0
+
+    def stats(self) -> Dict:
+        out = {
+            "pages_served": self.pages_served,
+            "pages_recycled": self.pages_recycled,
+            "pages_per_minute": round(self.pages_per_minute(), 2),
+            "bytes_transferred": self.meter.total_bytes,
+            "bytes_per_page": self.meter.total_bytes // self.pages_served if self.pages_served else 0,
+        }
+        if self.request_filter is not None:
+            out.update(self.request_filter.stats())
+        return out
+
+    @staticmethod
+    async def _safe_close(obj) -> None:
+        try:
+            await obj.close()
+        except Exception:
+            pass
@@ -0,0 +1,77 @@
+# checkpoints.py
+import json
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from sqlite_store import SqliteStore
+
+
+def new_run_id() -> str:
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+
+def open_checkpointer(path: str):
+    """LangGraph SqliteSaver on `path`; GraphState is checkpointed after every node, keyed by run ID."""
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:  # pip install langgraph-checkpoint-sqlite
+        raise ImportError("Checkpointing needs langgraph-checkpoint-sqlite: pip install langgraph-checkpoint-sqlite")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+
+class RunProgress(SqliteStore):
+    """
+    Per-URL progress inside a run, stored next to the graph checkpoints. Each profile's
+    scrape result is recorded the moment it finishes, so a resumed batch only fetches
+    the URLs that never completed.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS run_progress ("
+        " run_id TEXT NOT NULL, url TEXT NOT NULL, status TEXT NOT NULL,"
+        " row TEXT, updated_at REAL NOT NULL, PRIMARY KEY (run_id, url))",
+    )
+
+    def record_scraped(self, run_id: str, row: Dict) -> None:
+        if row.get("error") or not row.get("lines"):
+            return  # failures are retried on resume
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO run_progress(run_id, url, status, row, updated_at) VALUES (?, ?, 'scraped', ?, ?)",
+                (run_id, row["url"], json.dumps(row), time.time()),
+            )
+            self._conn.commit()
+
+    def scraped_rows(self, run_id: str, urls: Iterable[str]) -> Dict[str, Dict]:
+        """Previously scraped rows for any of `urls` in this run."""
+        urls = list(urls)
+        if not urls:
+            return {}
+        marks = ",".join("?" * len(urls))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url, row FROM run_progress WHERE run_id = ? AND row IS NOT NULL AND url IN ({marks})",
+                (run_id, *urls),
+            ).fetchall()
+        return {u: json.loads(r) for u, r in rows}
+
+    def mark_saved(self, run_id: str, urls: List[str]) -> None:
+        # the raw row is no longer needed once the structured row is in the sink
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO run_progress(run_id, url, status, row, updated_at) VALUES (?, ?, 'saved', NULL, ?)"
+                " ON CONFLICT(run_id, url) DO UPDATE SET status='saved', row=NULL, updated_at=excluded.updated_at",
+                [(run_id, u, now) for u in urls],
+            )
+            self._conn.commit()
+
+    def clear(self, run_id: str) -> None:
+        """Drop a finished run's rows."""
+        with self._lock:
+            self._conn.execute("DELETE FROM run_progress WHERE run_id = ?", (run_id,))
+            self._conn.commit()
@@ -0,0 +1,183 @@
+# compact.py
+import hashlib
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from fast_extract import CHROME_WORDS, EMAIL_RE, NAME_RE, OBFUSCATED_EMAIL_RE
+from llm_cache import normalize_lines
+
+
+# Section labels are on nearly every profile but anchor the field after them ("About" -> the
+# About text, "Email" -> the address), so they are never stripped or learned as boilerplate
+SECTION_LABELS = {
+    "about", "contact info", "email", "phone", "website", "websites", "experience", "education", "skills",
+}
+
+# Page chrome and action labels that never help extraction
+BOILERPLATE = (CHROME_WORDS - SECTION_LABELS) | {
+    "pending", "save to pdf", "report / block", "share profile via message", "view in sales navigator",
+    "open to", "add profile section", "enhance profile", "resources", "show all", "show more", "show less",
+    "see more", "see all", "…see more", "...see more", "try premium for free", "premium", "people also viewed",
+    "people you may know", "you might like", "explore premium profiles", "more profiles for you",
+    "contact", "1st", "2nd", "3rd", "3rd+", "· 1st", "· 2nd", "· 3rd", "· 3rd+", "he/him", "she/her", "they/them",
+}
+BOILERPLATE_PATTERNS = [
+    re.compile(r"^[\d,.]+[km+]*\s+(followers?|connections?|mutual connections?)$", re.I),
+    re.compile(r"^(show|see) all \d+ ", re.I),
+    re.compile(r"^·?\s*(1st|2nd|3rd\+?) degree connection$", re.I),
+    re.compile(r"^\d+ (notifications?|new messages?)$", re.I),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token, the same rule of thumb as the extraction cost estimate."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def lines_tokens(lines: List[str]) -> int:
+    return sum(estimate_tokens(line) + 1 for line in lines)  # +1 for the newline
+
+
+class PromptCompactor:
+    """
+    Shrinks scraped profile lines before they go into an extraction prompt:
+    whitespace-normalized exact and substring-contained duplicates are dropped,
+    boilerplate (the built-in list, `extra_boilerplate`, and lines learned from
+    repeating across many different profiles) is stripped, and what is left is
+    ranked by how likely it is to carry name, headline, About or email and cut
+    to `token_budget`. Kept lines stay in page order.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 350,
+        extra_boilerplate: Iterable[str] = (),
+        learn: bool = True,
+        learn_min_profiles: int = 20,
+        learn_min_share: float = 0.5,
+    ):
+        self.token_budget = token_budget
+        self.boilerplate: Set[str] = BOILERPLATE | {b.strip().lower() for b in extra_boilerplate}
+        self.learn = learn
+        self.learn_min_profiles = learn_min_profiles
+        self.learn_min_share = learn_min_share
+        self.learned: Set[str] = set()
+        self._line_profiles: Counter = Counter()  # short line -> profiles it appeared in
+        self._profiles = 0
+        self._lock = threading.Lock()
+
+    def fingerprint(self) -> str:
+        """
+        Everything that changes the output for the same input (part of the LLM cache key):
+        the budget, the boilerplate list and the lines learned so far. Learning settles once
+        `learn_min_profiles` have been seen, so keys stop changing early in a run.
+        """
+        with self._lock:
+            stripped = "\n".join(sorted(self.boilerplate)) + "\n\n" + "\n".join(sorted(self.learned))
+        return f"compact:{self.token_budget}:{hashlib.sha256(stripped.encode('utf-8')).hexdigest()[:16]}"
+
+    def observe(self, rows: List[Dict]) -> None:
+        """Count short lines across profiles; ones on most profiles (bar section labels) become learned boilerplate."""
+        if not self.learn:
+            return
+        with self._lock:
+            for row in rows:
+                if not row.get("lines"):
+                    continue
+                self._profiles += 1
+                self._line_profiles.update(
+                    {l.lower() for l in normalize_lines(row["lines"]) if len(l) <= 40} - SECTION_LABELS
+                )
+            if self._profiles >= self.learn_min_profiles:
+                cutoff = self._profiles * self.learn_min_share
+                self.learned = {l for l, n in self._line_profiles.items() if n >= cutoff}
+
+    def _is_boilerplate(self, low: str) -> bool:
+        if low in self.boilerplate or low in self.learned:
+            return True
+        return any(p.match(low) for p in BOILERPLATE_PATTERNS)
+
+    @staticmethod
+    def _protected(line: str, anchors: Set[str]) -> bool:
+        # short lines that are likely a field on their own survive containment dedupe
+        return line.lower() in anchors or bool(NAME_RE.match(line) or EMAIL_RE.search(line))
+
+    def _dedupe(self, lines: List[str], anchors: Set[str]) -> List[str]:
+        """Drop exact repeats and lines contained in a longer line (nested-div echoes)."""
+        unique: List[str] = []
+        seen: Set[str] = set()
+        for line in lines:
+            low = line.lower()
+            if low not in seen:
+                seen.add(low)
+                unique.append(line)
+        lowered = [l.lower() for l in unique]
+        out = []
+        for i, line in enumerate(unique):
+            low = lowered[i]
+            if not self._protected(line, anchors) and any(len(o) > len(low) and low in o for o in lowered):
+                continue
+            out.append(line)
+        return out
+
+    @staticmethod
+    def _score(i: int, line: str, prev: str, anchors: Set[str]) -> float:
+        low = line.lower()
+        score = max(0.0, 30.0 - i)  # the top card comes first on the page
+        if low in anchors:
+            score += 200  # name and headline are never cut
+        if EMAIL_RE.search(line) or OBFUSCATED_EMAIL_RE.search(line):
+            score += 100
+        elif "email" in low:
+            score += 20
+        if prev == "about":
+            score += 60
+        if low == "about":
+            score += 40
+        if NAME_RE.match(line):
+            score += 15
+        return score + min(len(line), 300) / 30
+
+    def compact(self, row: Dict) -> Dict:
+        """{"lines", "tokens_before", "tokens_after"} for one scraped {"url","lines","top_card"} row."""
+        raw = normalize_lines(row.get("lines") or [])
+        before = lines_tokens(raw)
+        top = row.get("top_card") or {}
+        anchors = [a for a in (top.get("name", ""), top.get("headline", "")) if a]
+        anchor_set = {a.lower() for a in anchors}
+
+        lines = [
+            l for l in self._dedupe(raw, anchor_set)
+            if l.lower() in anchor_set or not self._is_boilerplate(l.lower())
+        ]
+        # name and headline lead the text even if the page walk missed them
+        missing = [a for a in anchors if a.lower() not in {l.lower() for l in lines}]
+        lines = missing + lines
+
+        scores = [self._score(i, l, lines[i - 1].lower() if i else "", anchor_set) for i, l in enumerate(lines)]
+        ranked = sorted(range(len(lines)), key=lambda i: -scores[i])
+        budget = self.token_budget
+        keep: Dict[int, str] = {}
+        for i in ranked:
+            cost = estimate_tokens(lines[i]) + 1
+            if cost <= budget:
+                keep[i] = lines[i]
+                budget -= cost
+        # then whatever room is left goes to the best line that didn't fit (usually a long About)
+        for i in ranked:
+            if budget <= 10:
+                break
+            if i not in keep and scores[i] >= 60:
+                keep[i] = lines[i][: (budget - 2) * 4].rstrip() + "…"
+                budget = 0
+        out = [keep[i] for i in sorted(keep)]
+        return {"lines": out, "tokens_before": before, "tokens_after": lines_tokens(out)}
+
+
+def build_compactor(token_budget: int, extra_boilerplate: Iterable[str] = (), learn: bool = True) -> Optional[PromptCompactor]:
+    """A compactor, or None when compaction is off (token_budget <= 0)."""
+    if token_budget <= 0:
+        return None
+    return PromptCompactor(token_budget=token_budget, extra_boilerplate=extra_boilerplate, learn=learn)
@@ -0,0 +1,77 @@
+# engine.py
+import asyncio
+import threading
+from typing import Any, Awaitable, Dict, Optional
+
+from browser_pool import BrowserPool
+from ratelimit import RateLimiter
+from waits import WaitStrategy, default_waits
+
+
+class ScrapeEngine:
+    """
+    Runs a BrowserPool on a dedicated asyncio loop thread so synchronous callers
+    (LangGraph nodes, Streamlit) can submit async scraping work with `run()`.
+    The browser stays alive across calls until `close()`.
+    """
+
+    def __init__(
+        self,
+        pool: BrowserPool,
+        concurrency: int = 4,
+        limiter: Optional[RateLimiter] = None,
+        waits: Optional[Dict[str, WaitStrategy]] = None,
+        serp_concurrency: int = 1,
+        serp_limiter: Optional[RateLimiter] = None,
+    ):
+        self.pool = pool
+        self.concurrency = max(1, concurrency)
+        self.limiter = limiter or RateLimiter(min_interval=1.0)
+        self.serp_concurrency = max(1, serp_concurrency)
+        # Google gets its own pacing; the default matches the old 2-5s sleep between pages
+        self.serp_limiter = serp_limiter or RateLimiter(min_interval=2.0, jitter=3.0)
+        self.waits = waits if waits is not None else default_waits()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ScrapeEngine":
+        if self._loop is not None:
+            return self
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="scrape-engine", daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self, coro: Awaitable) -> Any:
+        """Run `coro` on the engine loop and block until it finishes."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def rates(self) -> Dict[str, Dict]:
+        """Current pacing per limiter (adaptive ones report their learned rate and window)."""
+        return {"profile": self.limiter.stats(), "serp": self.serp_limiter.stats()}
+
+    def readiness(self) -> Dict[str, Dict]:
+        """Observed time-to-ready per context, plus the ceiling currently in force."""
+        return {
+            name: {**w.stats.summary(), "ceiling_ms": w.current_ceiling()}
+            for name, w in self.waits.items()
+        }
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+        try:
+            self.run(self.pool.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+    def __enter__(self) -> "ScrapeEngine":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,62 @@
+# fakes.py
+import asyncio
+import json
+import re
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+
+class FakeExtractChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatGoogleGenerativeAI that answers extraction prompts with
+    canned JSON after `latency` seconds. Understands both `extract_user` (one object)
+    and `extract_many` (array) prompts, so every extract mode can run without network.
+    """
+
+    model: str = "fake-extractor"
+    latency: float = 0.2
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-extract"
+
+    def _answer(self, messages: List[BaseMessage]) -> str:
+        self.calls += 1
+        prompt = str(messages[-1].content)
+
+        packed = re.split(r"^### PROFILE \d+\n", prompt, flags=re.M)[1:]
+        if packed:
+            return json.dumps([self._fields(block) for block in packed])
+
+        m = re.search(r"exact URL: (\S+)", prompt)
+        body = prompt.split("Text lines:\n", 1)[-1]
+        return json.dumps(self._fields(f"URL: {m.group(1) if m else ''}\nText lines:\n{body}"))
+
+    @staticmethod
+    def _fields(block: str) -> dict:
+        m = re.search(r"^URL: (\S*)", block, flags=re.M)
+        lines = [ln for ln in block.split("Text lines:\n", 1)[-1].splitlines() if ln.strip()]
+        email = EMAIL_RE.search(block)
+        return {
+            "name": lines[0] if lines else "",
+            "role": lines[1] if len(lines) > 1 else "",
+            "email": email.group(0) if email else "",
+            "about": "",
+            "url": m.group(1) if m else "",
+        }
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._answer(messages)))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._answer(messages)))])
@@ -0,0 +1,82 @@
+# fast_extract.py
+import re
+from typing import Dict, List, Tuple
+
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# "john at gmail dot com" style spellings that only an LLM will untangle
+OBFUSCATED_EMAIL_RE = re.compile(r"\b(at|\[at\]|\(at\))\s*(gmail|yahoo|outlook|hotmail)\b", re.I)
+NAME_RE = re.compile(r"^[A-Z][\w'’.-]+(?: [A-Z][\w'’.-]+){1,4}$")
+
+# Page chrome that can never be a name or headline
+CHROME_WORDS = {
+    "home", "my network", "jobs", "messaging", "notifications", "me", "for business",
+    "connect", "message", "follow", "more", "contact info", "about", "activity",
+}
+
+
+def _name_confidence(text: str) -> float:
+    if not text or text.lower() in CHROME_WORDS or len(text) > 60:
+        return 0.0
+    return 0.95 if NAME_RE.match(text) else 0.6
+
+
+def _email(lines: List[str]) -> Tuple[str, float]:
+    found = []
+    for line in lines:
+        for m in EMAIL_RE.findall(line):
+            if m.lower() not in found:
+                found.append(m.lower())
+    if len(found) == 1:
+        return found[0], 0.95
+    if found:
+        gmail = [e for e in found if e.endswith("@gmail.com")]
+        return (gmail or found)[0], 0.7
+    # nothing matched: a missing field is the LLM's job (it may find a spelled-out address)
+    return "", 0.0
+
+
+def _about(lines: List[str]) -> Tuple[str, float]:
+    for i, line in enumerate(lines[:-1]):
+        if line.strip().lower() == "about":
+            nxt = lines[i + 1].strip()
+            if len(nxt) >= 40 and nxt.lower() not in CHROME_WORDS:
+                return nxt[:500], 0.6
+    return "", 0.0
+
+
+def fast_extract(row: Dict) -> Dict:
+    """
+    Rule-based extraction from a scraped {"url", "lines", "top_card"} row.
+    Returns {"fields": {name, role, email, about, url}, "confidence": {field: 0..1}}.
+    Name/headline come from the top card (h1 + following text) when present,
+    otherwise from the first name-like line; email is a regex over all lines.
+    """
+    lines = row.get("lines") or []
+    top = row.get("top_card") or {}
+
+    name, name_conf = top.get("name", ""), _name_confidence(top.get("name", ""))
+    if not name:
+        for line in lines[:30]:
+            if NAME_RE.match(line) and line.lower() not in CHROME_WORDS:
+                name, name_conf = line, 0.5
+                break
+
+    role = top.get("headline", "")
+    role_conf = 0.9 if role and role != name and 3 <= len(role) <= 220 else 0.0
+    if top.get("headline_guessed"):
+        role_conf = min(role_conf, 0.5)  # first line after the name, not the headline element
+
+    email, email_conf = _email(lines)
+    about, about_conf = _about(lines)
+
+    return {
+        "fields": {"name": name, "role": role, "email": email, "about": about, "url": row.get("url", "")},
+        "confidence": {"name": name_conf, "role": role_conf, "email": email_conf, "about": about_conf},
+    }
+
+
+def is_confident(result: Dict, required: List[str], threshold: float) -> bool:
+    """True when every `required` field cleared `threshold` (a missing field never does)."""
+    conf = result["confidence"]
+    return all(conf.get(f, 0.0) >= threshold for f in required)
@@ -0,0 +1,64 @@
+# frontier.py
+from typing import Iterable, List, Set, Tuple
+
+from seen_index import canonical_profile_url
+from sqlite_store import SqliteStore
+
+
+class Frontier(SqliteStore):
+    """
+    Disk-backed URL frontier for large runs. Each run's URLs are appended once (deduped
+    by canonical URL) under an increasing sequence number, and batches are read back
+    after a cursor, so the graph state only carries the cursor and counts. Memory
+    is one batch however many URLs a run covers. A crashed run resumes from
+    the checkpointed cursor. URLs the run skips (saved recently by another run) are
+    kept too, flagged, so the search can still tell a page's URLs were already found;
+    batches never include them.
+    """
+
+    PRAGMAS = SqliteStore.PRAGMAS + ("synchronous=NORMAL",)  # WAL stays consistent; a crash re-runs the search
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS frontier ("
+        " seq INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, url TEXT NOT NULL,"
+        " skip INTEGER NOT NULL DEFAULT 0, UNIQUE (run_id, url))",
+        "CREATE INDEX IF NOT EXISTS frontier_run_seq ON frontier(run_id, seq)",
+    )
+
+    def add(self, run_id: str, urls: Iterable[str], skip: Iterable[str] = ()) -> List[str]:
+        """
+        Append URLs not yet in this run's frontier; returns the new ones (canonical).
+        URLs also in `skip` are recorded as found but never batched.
+        """
+        skipped: Set[str] = {canonical_profile_url(u) for u in skip}
+        new: List[str] = []
+        with self._lock:
+            for url in dict.fromkeys(canonical_profile_url(u) for u in urls if u):
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO frontier(run_id, url, skip) VALUES (?, ?, ?)",
+                    (run_id, url, int(url in skipped)),
+                )
+                if cur.rowcount == 1:
+                    new.append(url)
+            self._conn.commit()
+        return new
+
+    def batch(self, run_id: str, cursor: int, size: int) -> Tuple[List[str], int]:
+        """Up to `size` URLs after `cursor`, and the cursor to pass next time."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, url FROM frontier WHERE run_id = ? AND seq > ? AND skip = 0 ORDER BY seq LIMIT ?",
+                (run_id, cursor, size),
+            ).fetchall()
+        return [url for _, url in rows], (rows[-1][0] if rows else cursor)
+
+    def remaining(self, run_id: str, cursor: int) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM frontier WHERE run_id = ? AND seq > ? AND skip = 0", (run_id, cursor)
+            ).fetchone()[0]
+
+    def clear(self, run_id: str) -> None:
+        """Drop a finished run's URLs."""
+        with self._lock:
+            self._conn.execute("DELETE FROM frontier WHERE run_id = ?", (run_id,))
+            self._conn.commit()
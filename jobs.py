@@ -0,0 +1,177 @@
+# jobs.py
+import asyncio
+import itertools
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from models import SearchConfig
+from pipeline import StreamingPipeline, _DONE
+from prompts import LinkedInPrompts
+from seen_index import canonical_profile_url
+from tools import iter_linkedin_urls_async
+from metrics import METRICS
+
+try:
+    import yaml
+except ImportError:  # optional: pip install pyyaml (JSON job files work without it)
+    yaml = None
+
+log = logging.getLogger(__name__)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _read_job_file(path: str) -> Dict:
+    text = Path(path).read_text(encoding="utf-8")
+    if path.endswith(".json"):
+        return json.loads(text)
+    if yaml is None:
+        raise ImportError("YAML job files need: pip install pyyaml (or use a .json job file)")
+    return yaml.safe_load(text) or {}
+
+
+def load_jobs(path: str, base: SearchConfig) -> Tuple[SearchConfig, Dict[str, SearchConfig]]:
+    """
+    The shared config and the job configs (keyed by job name) from a YAML/JSON file:
+
+        defaults: {pages: 3, output_csv: "out/{role}_{country}.csv"}
+        matrix: {role: [founder, cto], country: [united kingdom, germany]}
+        jobs:
+          - {role: designer, country: france, pages: 5, name: designers-fr}
+
+    Every job is `base` (CLI/env settings) updated with `defaults`, then with its own
+    entry. `matrix` adds one job per combination. `{role}`, `{country}` and `{name}`
+    in output paths are filled in per job; outputs must be distinct. The shared config
+    (`base` + `defaults`) sets the browser, caches and concurrency budgets for all jobs.
+    """
+    spec = _read_job_file(path)
+    defaults = spec.get("defaults") or {}
+    entries = list(spec.get("jobs") or [])
+    matrix = spec.get("matrix") or {}
+    if matrix:
+        keys = list(matrix)
+        for combo in itertools.product(*(matrix[k] for k in keys)):
+            entries.append(dict(zip(keys, combo)))
+    if not entries:
+        raise ValueError(f"{path} defines no jobs")
+
+    base_fields = base.model_dump()
+    shared = SearchConfig(**{**base_fields, **defaults})
+    if "output_csv" not in defaults:
+        base_fields["output_csv"] = "output/{name}.csv"  # one file per job unless told otherwise
+    jobs: Dict[str, SearchConfig] = {}
+    outputs: Dict[str, str] = {}
+    for entry in entries:
+        fields = {**base_fields, **defaults, **entry}
+        name = fields.pop("name", None) or _slug(f"{fields['role']}-{fields['country']}")
+        fill = {"name": name, "role": _slug(fields["role"]), "country": _slug(fields["country"])}
+        for key in ("output_csv", "output_path"):
+            if fields.get(key):
+                fields[key] = fields[key].format(**fill)
+        cfg = SearchConfig(**fields)
+        if name in jobs:
+            raise ValueError(f"Duplicate job name {name!r} in {path}")
+        out = str(Path(cfg.resolved_output_path()).resolve())
+        if out in outputs:
+            raise ValueError(f"Jobs {outputs[out]!r} and {name!r} both write to {out}")
+        outputs[out] = name
+        jobs[name] = cfg
+    return shared, jobs
+
+
+class MultiJobPipeline(StreamingPipeline):
+    """
+    Several searches feeding one streaming pipeline. Each job gets its own query and
+    sink; the browser pool, limiters, LLM, caches and seen index are the workflow's.
+    A profile found by several jobs while it is in flight is scraped and extracted once,
+    then written to every job's output that found it. Rows are not kept after they
+    are written: a job that finds a profile after another job saved it queues it again,
+    and the snapshot store and LLM cache answer that second pass without a fetch or a
+    model call (when they are enabled).
+
+    Global budget: `concurrency` profile scrapers and `llm_concurrency` LLM calls for
+    all jobs together, and at most `serp_concurrency` jobs paging through Google at once.
+    """
+
+    def __init__(self, workflow, jobs: Dict[str, SearchConfig], sinks: Dict):
+        super().__init__(workflow)
+        self.jobs = jobs
+        self.sinks = sinks
+        self.written: Dict[str, int] = {name: 0 for name in jobs}
+        self._subscribers: Dict[str, Set[str]] = {}  # in-flight URL -> jobs waiting for its row
+        self._saved: Set[str] = set()  # URLs saved this run: re-queued, not skipped as seen, if found again
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def _search_stage(self, cfg: SearchConfig, query_base: str, url_q: asyncio.Queue, queued: List[str]) -> None:
+        # query_base is unused: every job builds its own query
+        self._locks = {name: asyncio.Lock() for name in self.jobs}
+        gate = asyncio.Semaphore(max(1, cfg.serp_concurrency))
+        await asyncio.gather(*(
+            self._search_job(name, job, url_q, queued, gate) for name, job in self.jobs.items()
+        ))
+
+    async def _search_job(self, name: str, job: SearchConfig, url_q: asyncio.Queue,
+                          queued: List[str], gate: asyncio.Semaphore) -> None:
+        eng = self.workflow.engine
+        index = self.workflow.seen
+        sink = self.sinks[name]
+        query = LinkedInPrompts.build_base_query(job.role, job.country)
+        found = 0
+        async with gate:
+            log.info(f"🔍 [{name}] {query}")
+            async for new in iter_linkedin_urls_async(
+                query,
+                job.pages or 1,
+                job.per_page,
+                eng.pool,
+                wait=eng.waits.get("serp"),
+                snapshots=self.workflow.snapshots,
+                limiter=eng.serp_limiter,
+            ):
+                found += len(new)
+                unknown = [u for u in new if u not in self._saved and u not in self._subscribers]
+                fresh = await asyncio.to_thread(index.fresh, unknown) if index is not None and unknown else set()
+                for url in new:
+                    if url in sink:
+                        continue
+                    if url in self._subscribers:  # another job queued it; join in
+                        self._subscribers[url].add(name)
+                    elif url in self._saved or url not in fresh:
+                        self._subscribers[url] = {name}
+                        queued.append(url)
+                        self.counts["urls"] += 1
+                        await url_q.put(url)
+        log.info(f"🔗 [{name}] {found} URLs found")
+
+    async def _save_stage(self, out_q: asyncio.Queue) -> None:
+        while True:
+            rows = await out_q.get()
+            if rows is _DONE:
+                return
+            by_job: Dict[str, List[Dict]] = {}
+            ok = self._savable(rows)
+            ok_ids = {id(r) for r in ok}
+            for row in rows:
+                url = canonical_profile_url(row.get("url", ""))
+                names = self._subscribers.pop(url, ())  # failed rows stop being in flight too
+                if id(row) not in ok_ids:
+                    continue
+                self._saved.add(url)
+                for name in names:
+                    by_job.setdefault(name, []).append(row)
+            rows = ok
+            for name, job_rows in by_job.items():
+                await self._write_job(name, job_rows)
+            await asyncio.to_thread(self._mark_saved, rows)
+
+    async def _write_job(self, name: str, rows: List[Dict]) -> None:
+        async with self._locks[name]:  # one writer per sink
+            n = await asyncio.to_thread(self._write, self.sinks[name], rows)
+        self.written[name] += n
+        self.counts["written"] += n
+        METRICS.inc("rows_written", n)
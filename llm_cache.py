@@ -0,0 +1,115 @@
+# llm_cache.py
+import hashlib
+import json
+import time
+from typing import Dict, List, Optional
+
+from sqlite_store import SqliteStore
+
+
+def normalize_lines(lines: List[str], max_lines: int = 100) -> List[str]:
+    """Whitespace-collapsed, non-empty lines as the prompt would see them."""
+    out = []
+    for line in lines[:max_lines]:
+        norm = " ".join(str(line).split())
+        if norm:
+            out.append(norm)
+    return out
+
+
+def cache_key(model: str, system_prompt: str, lines: List[str]) -> str:
+    """Content address for one extraction: model + system prompt + normalized profile text."""
+    h = hashlib.sha256()
+    for part in (model, system_prompt, "\n".join(normalize_lines(lines))):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class LLMCache(SqliteStore):
+    """
+    SQLite-backed cache of extracted fields keyed by `cache_key`. Entries expire after
+    `ttl_seconds`; when more than `max_entries` are stored the least recently used go first.
+    Reads never write: hits are remembered and their `last_used` is stored by the next
+    `put_many` (or `close`), so a reader never holds the file's write lock.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS llm_cache ("
+        " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+        " created_at REAL NOT NULL, last_used REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache(last_used)",
+    )
+
+    def __init__(self, path: str, ttl_seconds: float = 30 * 86400, max_entries: int = 100_000):
+        super().__init__(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._touched: Dict[str, float] = {}  # hit key -> last use, not yet stored
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._touched[key] = now
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put_many(self, items: Dict[str, Dict]) -> None:
+        """Store fresh entries and the pending hit touches in one transaction, then evict."""
+        now = time.time()
+        with self._lock:
+            if not items and not self._touched:
+                return
+            self._store_touches()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO llm_cache(key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                [(k, json.dumps(v), now, now) for k, v in items.items()],
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _store_touches(self) -> None:
+        self._conn.executemany(
+            "UPDATE llm_cache SET last_used = MAX(last_used, ?) WHERE key = ?",
+            [(t, k) for k, t in self._touched.items()],
+        )
+        self._touched = {}
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched = {}
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "llm_cache_hits": self.hits,
+            "llm_cache_misses": self.misses,
+            "llm_cache_hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._touched:
+                self._store_touches()
+                self._conn.commit()
+        super().close()
@@ -1,10 +1,10 @@
 # main.py
 import os
 import argparse
+import logging
 from dotenv import load_dotenv
 
 from models import SearchConfig
-from workflow import Workflow
 
 
 def ensure_storage_state(path: str):
@@ -24,14 +24,67 @@ def parse_args():
     parser.add_argument("--pages", type=int, help="Number of Google pages to paginate")
     parser.add_argument("--batch-size", type=int, help="Scraping batch size")
     parser.add_argument("--output-csv", type=str, help="Output CSV path")
+    parser.add_argument("--output-format", type=str, choices=["csv", "jsonl", "sqlite", "parquet"],
+                        help="Output sink (default csv)")
+    parser.add_argument("--output-path", type=str, help="Output path for non-CSV sinks (default: output CSV with new suffix)")
     parser.add_argument("--browser", type=str, choices=["chromium", "firefox", "webkit"])
     parser.add_argument("--storage-state", type=str, help="Path to Playwright storage_state JSON")
+    parser.add_argument("--headless", action="store_true", help="Run the browser pool headless")
+    parser.add_argument("--pool-size", type=int, help="Max pages open per browser context")
+    parser.add_argument("--max-page-uses", type=int, help="Recycle a page after this many loads")
+    parser.add_argument("--concurrency", type=int, help="Profile pages scraped in parallel")
+    parser.add_argument("--serp-concurrency", type=int, help="Google result pages fetched in parallel")
+    parser.add_argument("--fixed-rate", action="store_true",
+                        help="Keep fixed request spacing instead of adapting the rate to responses")
+    parser.add_argument("--max-rate", type=float, help="Profile requests/s the adaptive limiter may reach")
+    parser.add_argument("--no-block", action="store_true", help="Load images/fonts/css/trackers instead of aborting them")
+    parser.add_argument("--allow-url", action="append", default=[], help="fnmatch pattern never blocked (repeatable)")
+    parser.add_argument("--http-cache-dir", type=str, help="Directory for the on-disk static asset cache")
+    parser.add_argument("--extract-mode", type=str, choices=["serial", "concurrent", "packed"],
+                        help="How LLM extraction calls are issued")
+    parser.add_argument("--llm-concurrency", type=int, help="Max LLM requests in flight")
+    parser.add_argument("--pack-size", type=int, help="Profiles per prompt in packed mode")
+    parser.add_argument("--prompt-token-budget", type=int,
+                        help="Profile-text tokens per profile sent to the LLM (0 = no compaction)")
+    parser.add_argument("--no-fast-path", action="store_true", help="Send every profile to the LLM")
+    parser.add_argument("--no-llm-cache", action="store_true", help="Bypass the on-disk LLM response cache")
+    parser.add_argument("--clear-llm-cache", action="store_true", help="Empty the LLM response cache before running")
+    parser.add_argument("--llm-cache-path", type=str, help="SQLite file for the LLM response cache")
+    parser.add_argument("--no-snapshots", action="store_true", help="Don't read or write raw HTML snapshots")
+    parser.add_argument("--snapshot-path", type=str, help="SQLite file for raw HTML snapshots")
+    parser.add_argument("--mode", type=str, choices=["graph", "pipeline"],
+                        help="graph: sequential LangGraph (default); pipeline: overlapping search/scrape/extract/save")
+    parser.add_argument("--from-snapshots", action="store_true",
+                        help="Re-run parse/extract/save from stored snapshots without a browser")
+    parser.add_argument("--no-seen-index", action="store_true", help="Scrape profiles even if an earlier run saved them")
+    parser.add_argument("--rescrape-after-days", type=float, help="Re-scrape saved profiles older than this")
+    parser.add_argument("--log-level", type=str, default=os.getenv("LOG_LEVEL", "INFO"),
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Console log level")
+    parser.add_argument("--profile", type=str, nargs="?", const=".scrapedin/profile", metavar="DIR",
+                        help="Write per-stage profiles to DIR (default .scrapedin/profile)")
+    parser.add_argument("--profiler", type=str, choices=["cprofile", "pyinstrument"], help="Profiler backend")
+    parser.add_argument("--report-dir", type=str, help="Directory for the JSON run report")
+    parser.add_argument("--prom-file", type=str, help="Also write metrics to this Prometheus textfile")
+    parser.add_argument("--jobs", type=str, metavar="FILE",
+                        help="YAML/JSON file of searches to run together, sharing the browser, LLM and caches")
+    parser.add_argument("--coordinator", action="store_true",
+                        help="Search and queue URLs for workers, then collect their results into the output")
+    parser.add_argument("--worker", action="store_true", help="Scrape + extract URLs leased from the work queue")
+    parser.add_argument("--queue", type=str, help="Work queue URL (default .scrapedin/queue.sqlite)")
+    parser.add_argument("--worker-id", type=str, help="Name for this worker (default host + random suffix)")
+    parser.add_argument("--lease-seconds", type=float, help="Redeliver a leased URL if not acked within this")
+    parser.add_argument("--resume", type=str, metavar="RUN_ID", help="Continue an interrupted run from its last checkpoint")
+    parser.add_argument("--run-id", type=str, help="Name this run (default: timestamp + random suffix)")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Don't checkpoint graph state or per-URL progress")
+    parser.add_argument("--large-run", action="store_true",
+                        help="Keep the URL frontier on disk and only a cursor in graph state (flat memory for huge runs)")
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     load_dotenv()
     args = parse_args()
+    logging.basicConfig(level=args.log_level, format="%(message)s")
 
     # prefer CLI > ENV > defaults
     role = args.role or os.getenv("ROLE") or "founder"
@@ -44,6 +97,14 @@ if __name__ == "__main__":
     output_csv = args.output_csv or os.path.join(os.getcwd(), "output.csv")
     browser = args.browser or os.getenv("BROWSER", "chromium")
     storage_state = args.storage_state or os.getenv("STORAGE_STATE", "linkedin_auth.json")
+    headless = args.headless or os.getenv("HEADLESS", "").lower() in ("1", "true", "yes")
+    pool_size = args.pool_size or int(os.getenv("POOL_SIZE", "2"))
+    max_page_uses = args.max_page_uses or int(os.getenv("MAX_PAGE_USES", "25"))
+    concurrency = args.concurrency or int(os.getenv("CONCURRENCY", "4"))
+    http_cache_dir = args.http_cache_dir or os.getenv("HTTP_CACHE_DIR")
+    extract_mode = args.extract_mode or os.getenv("EXTRACT_MODE", "concurrent")
+    llm_concurrency = args.llm_concurrency or int(os.getenv("LLM_CONCURRENCY", "4"))
+    pack_size = args.pack_size or int(os.getenv("PACK_SIZE", "5"))
 
     # build config
     cfg = SearchConfig(
@@ -52,14 +113,82 @@ if __name__ == "__main__":
         pages=pages,
         batch_size=batch_size,
         output_csv=output_csv,
+        output_format=args.output_format or os.getenv("OUTPUT_FORMAT", "csv"),
+        output_path=args.output_path,
         browser=browser,
         storage_state=storage_state,
+        headless=headless,
+        pool_size=pool_size,
+        max_page_uses=max_page_uses,
+        concurrency=concurrency,
+        serp_concurrency=args.serp_concurrency or int(os.getenv("SERP_CONCURRENCY", "2")),
+        adaptive_rate=not args.fixed_rate,
+        max_request_rate=args.max_rate or float(os.getenv("MAX_RATE", "4.0")),
+        block_resources=not args.no_block,
+        allow_urls=args.allow_url,
+        http_cache_dir=http_cache_dir,
+        llm_model=os.getenv("LLM_MODEL", "gemini-2.5-flash"),
+        extract_mode=extract_mode,
+        llm_concurrency=llm_concurrency,
+        pack_size=pack_size,
+        fast_path=not args.no_fast_path,
+        prompt_token_budget=(args.prompt_token_budget if args.prompt_token_budget is not None
+                             else int(os.getenv("PROMPT_TOKEN_BUDGET", "350"))),
+        llm_cache=not args.no_llm_cache,
+        llm_cache_path=args.llm_cache_path or os.getenv("LLM_CACHE_PATH", ".scrapedin/llm_cache.sqlite"),
+        snapshots=not args.no_snapshots,
+        snapshot_path=args.snapshot_path or os.getenv("SNAPSHOT_PATH", ".scrapedin/snapshots.sqlite"),
+        from_snapshots=args.from_snapshots,
+        seen_index=not args.no_seen_index,
+        seen_index_path=os.getenv("SEEN_INDEX_PATH", ".scrapedin/seen.sqlite"),
+        rescrape_after_days=(args.rescrape_after_days if args.rescrape_after_days is not None
+                             else float(os.getenv("RESCRAPE_AFTER_DAYS", "30"))),
+        mode=args.mode or os.getenv("MODE", "graph"),
+        checkpoint=not args.no_checkpoint,
+        checkpoint_path=os.getenv("CHECKPOINT_PATH", ".scrapedin/checkpoints.sqlite"),
+        run_id=args.resume or args.run_id,
+        resume=bool(args.resume),
+        large_run=args.large_run or os.getenv("LARGE_RUN", "").lower() in ("1", "true", "yes"),
+        frontier_path=os.getenv("FRONTIER_PATH", ".scrapedin/frontier.sqlite"),
+        report_dir=args.report_dir or os.getenv("REPORT_DIR", ".scrapedin/reports"),
+        prometheus_textfile=args.prom_file or os.getenv("PROM_FILE"),
+        profile_dir=args.profile,
+        profiler=args.profiler or "cprofile",
+        queue_url=args.queue or os.getenv("QUEUE_URL", ".scrapedin/queue.sqlite"),
+        lease_seconds=args.lease_seconds or float(os.getenv("LEASE_SECONDS", "300")),
     )
 
-    ensure_storage_state(cfg.storage_state)
+    if args.clear_llm_cache:
+        from llm_cache import LLMCache
+        cache = LLMCache(cfg.llm_cache_path)
+        cache.clear()
+        cache.close()
+        logging.info(f"🧹 Cleared LLM cache at {cfg.llm_cache_path}")
+
+    if not cfg.from_snapshots:
+        ensure_storage_state(cfg.storage_state)
+
+    # imported only now so --help and argument errors don't wait on it
+    from workflow import Workflow
+
+    if args.worker:
+        Workflow().run_worker(cfg, args.worker_id)
+        raise SystemExit(0)
+    if args.coordinator:
+        Workflow().run_coordinator(cfg)
+        logging.info(f"✅ Done. Results saved to: {cfg.resolved_output_path()}")
+        raise SystemExit(0)
+
+    if args.jobs:
+        from jobs import load_jobs
+        shared, jobs = load_jobs(args.jobs, cfg)
+        Workflow().run_jobs(shared, jobs)
+        logging.info(f"✅ Done. {len(jobs)} jobs finished.")
+        raise SystemExit(0)
 
     # run workflow
     workflow = Workflow()
-    workflow.run(cfg)
+    final = workflow.run(cfg)
+    cfg = final.get("config") or cfg  # a resumed run keeps the settings it started with
 
-    print(f"✅ Done. Results saved to: {cfg.output_csv}")
+    logging.info(f"✅ Done. Results saved to: {cfg.resolved_output_path()}")
@@ -0,0 +1,289 @@
+# metrics.py
+import asyncio
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from waits import percentile
+
+
+# Histogram buckets (seconds) for everything from a parse to a whole SERP walk
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+MAX_SAMPLES = 10_000  # per histogram, kept for exact p50/p95 in the JSON report
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(DURATION_BUCKETS) + 1)  # last one is +Inf
+        self.total = 0.0
+        self.n = 0
+        self.samples: List[float] = []
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.n += 1
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(value)
+
+
+class Metrics:
+    """
+    In-process counters, gauges and duration histograms, optionally labelled.
+    Each run records into its own registry (see `run_metrics`), exported at the end
+    as a JSON report and a Prometheus textfile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters: Dict[Key, float] = {}
+            self.gauges: Dict[Key, float] = {}
+            self.histograms: Dict[Key, _Histogram] = {}
+            self.started_at = time.time()
+
+    def inc(self, name: str, n: float = 1, **labels) -> None:
+        if not n:
+            return
+        k = _key(name, labels)
+        with self._lock:
+            self.counters[k] = self.counters.get(k, 0) + n
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        k = _key(name, labels)
+        with self._lock:
+            hist = self.histograms.get(k)
+            if hist is None:
+                hist = self.histograms[k] = _Histogram()
+            hist.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the block's wall time into the `name` histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self.counters.get(_key(name, labels), 0)
+
+    # ---- export ----
+    @staticmethod
+    def _label_str(labels) -> str:
+        return ",".join(f"{k}={v}" for k, v in labels)
+
+    def report(self) -> Dict:
+        with self._lock:
+            durations = {}
+            for (name, labels), h in self.histograms.items():
+                durations.setdefault(name, {})[self._label_str(labels) or "all"] = {
+                    "count": h.n,
+                    "total_s": round(h.total, 4),
+                    "p50_ms": round(percentile(h.samples, 50) * 1000, 2),
+                    "p95_ms": round(percentile(h.samples, 95) * 1000, 2),
+                    "max_ms": round(max(h.samples) * 1000, 2) if h.samples else 0.0,
+                }
+            counters: Dict[str, Dict] = {}
+            for (name, labels), v in self.counters.items():
+                counters.setdefault(name, {})[self._label_str(labels) or "all"] = v
+            gauges: Dict[str, Dict] = {}
+            for (name, labels), v in self.gauges.items():
+                gauges.setdefault(name, {})[self._label_str(labels) or "all"] = v
+            return {
+                "started_at": self.started_at,
+                "elapsed_s": round(time.time() - self.started_at, 3),
+                "counters": counters,
+                "gauges": gauges,
+                "durations": durations,
+            }
+
+    def prometheus(self, prefix: str = "scrapedin") -> str:
+        """Prometheus text exposition format (for node_exporter's textfile collector)."""
+        def fmt(labels, extra=()) -> str:
+            items = list(labels) + list(extra)
+            if not items:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+        out: List[str] = []
+        with self._lock:
+            seen = set()
+            for (name, labels), v in sorted(self.counters.items()):
+                metric = f"{prefix}_{name}_total"
+                if metric not in seen:
+                    out.append(f"# TYPE {metric} counter")
+                    seen.add(metric)
+                out.append(f"{metric}{fmt(labels)} {v}")
+            for (name, labels), v in sorted(self.gauges.items()):
+                metric = f"{prefix}_{name}"
+                if metric not in seen:
+                    out.append(f"# TYPE {metric} gauge")
+                    seen.add(metric)
+                out.append(f"{metric}{fmt(labels)} {v}")
+            for (name, labels), h in sorted(self.histograms.items(), key=lambda kv: kv[0]):
+                metric = f"{prefix}_{name}_seconds"
+                if metric not in seen:
+                    out.append(f"# TYPE {metric} histogram")
+                    seen.add(metric)
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, h.counts):
+                    cumulative += count
+                    out.append(f"{metric}_bucket{fmt(labels, [('le', bound)])} {cumulative}")
+                out.append(f"{metric}_bucket{fmt(labels, [('le', '+Inf')])} {h.n}")
+                out.append(f"{metric}_sum{fmt(labels)} {h.total}")
+                out.append(f"{metric}_count{fmt(labels)} {h.n}")
+        return "\n".join(out) + "\n"
+
+    def write_json(self, path: str, **extra) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({**extra, **self.report()}, f, indent=2, default=str)
+
+    def write_prometheus(self, path: str) -> None:
+        # write-then-rename so the collector never reads a half-written file
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        Path(tmp).replace(path)
+
+
+_current: ContextVar[Optional[Metrics]] = ContextVar("metrics", default=None)
+
+
+class _CurrentMetrics:
+    """
+    `METRICS`, what the workflow and the tools record into: the registry of the run in
+    progress in this thread or task, or a process-wide one outside any run.
+    """
+
+    def __init__(self):
+        self._default = Metrics()
+
+    def __getattr__(self, name: str):
+        return getattr(_current.get() or self._default, name)
+
+
+METRICS = _CurrentMetrics()
+
+
+@contextmanager
+def run_metrics():
+    """
+    A fresh registry behind `METRICS` for the block, and for the tasks and threads it
+    starts (asyncio copies the context into tasks and `to_thread`). Concurrent runs in
+    one process (background runs, the UI) each keep their own counters. Also a decorator.
+    """
+    token = _current.set(Metrics())
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def timed(name: str, **labels) -> Callable:
+    """Decorator: observe each call's duration (sync or async) into the `name` histogram."""
+    def wrap(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_inner(*args, **kwargs):
+                with METRICS.timer(name, **labels):
+                    return await fn(*args, **kwargs)
+            return async_inner
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with METRICS.timer(name, **labels):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+class StageProfiler:
+    """
+    Opt-in per-stage profiler (`--profile DIR`). Each stage accumulates across calls
+    and is written on `dump()`: cProfile gives <stage>.prof (pstats) + <stage>.txt,
+    pyinstrument gives <stage>.html. Only the calling thread is profiled, so browser
+    work on the engine loop shows up as time spent waiting on it.
+    """
+
+    def __init__(self, out_dir: str, backend: str = "cprofile"):
+        self._pyinstrument = None
+        if backend == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:  # optional: pip install pyinstrument
+                raise ImportError("pyinstrument profiling needs: pip install pyinstrument")
+            self._pyinstrument = Profiler
+        self.out_dir = Path(out_dir)
+        self.backend = backend
+        self._profiles: Dict[str, object] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        prof = self._profiles.get(name)
+        if prof is None:
+            prof = self._profiles[name] = (
+                self._pyinstrument() if self.backend == "pyinstrument" else cProfile.Profile()
+            )
+        if self.backend == "pyinstrument":
+            prof.start()
+        else:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if self.backend == "pyinstrument":
+                prof.stop()
+            else:
+                prof.disable()
+
+    def dump(self) -> List[str]:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for name, prof in self._profiles.items():
+            if self.backend == "pyinstrument":
+                path = self.out_dir / f"{name}.html"
+                path.write_text(prof.output_html(), encoding="utf-8")
+            else:
+                path = self.out_dir / f"{name}.prof"
+                prof.dump_stats(str(path))
+                buf = io.StringIO()
+                pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(40)
+                (self.out_dir / f"{name}.txt").write_text(buf.getvalue(), encoding="utf-8")
+            written.append(str(path))
+        return written
+
+
+def maybe_stage(profiler: Optional[StageProfiler], name: str):
+    """`profiler.stage(name)`, or a no-op when profiling is off."""
+    return profiler.stage(name) if profiler is not None else nullcontext()
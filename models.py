@@ -2,6 +2,8 @@
 from typing import List, Dict, Optional, TypedDict
 from pydantic import BaseModel
 
+from sinks import default_output_path
+
 class SearchConfig(BaseModel):
     # user-provided
     role: str
@@ -12,8 +14,83 @@ class SearchConfig(BaseModel):
     dedupe: bool = True
     batch_size: int = 5          # Playwright scraping batch size
     output_csv: str = "output.csv"
+    output_format: str = "csv"   # "csv" | "jsonl" | "sqlite" | "parquet"
+    output_path: Optional[str] = None  # defaults to output_csv with the format's suffix
     browser: str = "chromium"    # "chromium" | "firefox" | "webkit"
     storage_state: str = "linkedin_auth.json"  # saved session for LinkedIn
+    # browser pool (one browser per run, pages reused across profiles)
+    headless: bool = False       # set True on servers / CI
+    pool_size: int = 2           # max pages open per context
+    max_page_uses: int = 25      # recycle a page after this many loads
+    # async scraping engine
+    concurrency: int = 4         # profile pages scraped in parallel
+    min_request_interval: float = 1.0  # seconds between request starts (shared limiter)
+    serp_concurrency: int = 2    # Google result pages fetched in parallel
+    serp_min_interval: float = 1.0  # seconds between SERP request starts (+ up to serp_jitter)
+    serp_jitter: float = 1.5
+    adaptive_rate: bool = True   # AIMD-tune the rates above from responses; back off on blocks
+    max_request_rate: float = 4.0  # profile requests/s the adaptive limiter may ramp up to
+    serp_max_rate: float = 1.0     # same for Google
+    # request interception
+    block_resources: bool = True       # abort images/fonts/media/css + tracker hosts
+    allow_urls: List[str] = []         # fnmatch patterns that are never blocked
+    http_cache_dir: Optional[str] = None  # on-disk cache for static assets that must load
+    adaptive_waits: bool = True        # learn readiness ceilings from observed p95
+
+    # observability
+    report_dir: Optional[str] = ".scrapedin/reports"  # JSON metrics report per run ID (None = off)
+    prometheus_textfile: Optional[str] = None  # e.g. /var/lib/node_exporter/textfile/scrapedin.prom
+    profile_dir: Optional[str] = None  # per-stage profiler output (--profile)
+    profiler: str = "cprofile"         # "cprofile" | "pyinstrument"
+    # LLM extraction
+    llm_model: str = "gemini-2.5-flash"  # Gemini model built when no chat model is injected
+    extract_mode: str = "concurrent"   # "serial" | "concurrent" | "packed"
+    llm_concurrency: int = 4           # max LLM requests in flight
+    pack_size: int = 5                 # profiles per prompt in "packed" mode
+    # rule-based fast path ahead of the LLM
+    fast_path: bool = True
+    fast_path_fields: List[str] = ["name", "role", "email"]  # must all be confident to skip the LLM
+    fast_path_min_confidence: float = 0.8
+    llm_usd_per_1k_input_tokens: float = 0.0003  # only used for the "cost saved" estimate
+    # prompt compaction ahead of the LLM
+    prompt_token_budget: int = 350     # max profile-text tokens per profile in a prompt (0 = send lines as-is)
+    boilerplate_lines: List[str] = []  # extra lines to always strip (case-insensitive, whole line)
+    learn_boilerplate: bool = True     # also strip short lines repeated on most profiles of the run
+    # on-disk LLM response cache
+    llm_cache: bool = True
+    llm_cache_path: str = ".scrapedin/llm_cache.sqlite"
+    llm_cache_ttl_days: float = 30.0
+    llm_cache_max_entries: int = 100_000
+    # compressed raw-HTML snapshots (read-through cache + offline re-parse source)
+    snapshots: bool = True
+    snapshot_path: str = ".scrapedin/snapshots.sqlite"
+    snapshot_ttl_days: float = 7.0
+    from_snapshots: bool = False       # re-run parse/extract/save from snapshots, no browser
+    seen_index: bool = True            # skip profiles any earlier run already saved
+    seen_index_path: str = ".scrapedin/seen.sqlite"
+    rescrape_after_days: float = 30.0  # saved profiles older than this are scraped again
+    # execution mode
+    mode: str = "graph"                # "graph" (sequential LangGraph) | "pipeline" (overlapping stages)
+    pipeline_queue_size: int = 50      # bound on each inter-stage queue (backpressure)
+    pipeline_linger_s: float = 0.5     # how long the extractor waits to fill a micro-batch
+    # crash-safe checkpointing (graph mode)
+    checkpoint: bool = True
+    checkpoint_path: str = ".scrapedin/checkpoints.sqlite"
+    run_id: Optional[str] = None       # generated when omitted
+    resume: bool = False               # continue run_id from its last checkpoint
+    large_run: bool = False            # graph mode: URL frontier + batch cursor on disk, not in GraphState
+    frontier_path: str = ".scrapedin/frontier.sqlite"
+    # distributed mode: a coordinator searches, workers on any host scrape + extract
+    queue_url: str = ".scrapedin/queue.sqlite"  # sqlite:///path or a bare path (see workqueue.QUEUES)
+    lease_seconds: float = 300.0       # an unacked URL is redelivered after this long
+    max_attempts: int = 3              # leases per URL before it's marked failed
+    worker_poll_s: float = 2.0         # how often idle workers / the collecting coordinator poll
+    worker_idle_exit_s: float = 60.0   # workers exit after the queue has been idle this long
+
+    def resolved_output_path(self) -> str:
+        if self.output_path:
+            return self.output_path
+        return default_output_path(self.output_format, self.output_csv)
 
 class Profile(BaseModel):
     name: str = ""
@@ -23,9 +100,12 @@ class Profile(BaseModel):
 
 class GraphState(TypedDict):
     config: SearchConfig
+    run_id: str                # checkpoint thread / per-URL progress key
     query_base: str            # e.g. site:linkedin.com/in "founder" "@gmail.com" "united kingdom"
     current_page: int          # 1-based page index while searching Google
     urls: List[str]            # aggregated LinkedIn profile URLs
     batches: List[List[str]]   # chunked URLs for scraping
     current_batch: List[str]   # batch currently being scraped
     batch_results: List[Dict]  # now holds structured rows before save, or {"url","lines"} right after scraping
+    frontier_cursor: int       # large-run mode: last frontier sequence number handed out (urls/batches stay empty)
+    frontier_left: int         # large-run mode: URLs after the cursor
@@ -0,0 +1,192 @@
+# network.py
+import asyncio
+import fnmatch
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+
+# We only need text and hrefs, so these never have to hit the wire
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
+# Analytics / ad hosts (matched on the host suffix)
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "connect.facebook.net",
+    "bat.bing.com",
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "platform.linkedin.com",
+    "scorecardresearch.com",
+    "hotjar.com",
+)
+
+# Static assets worth keeping on disk when they are allowed through
+CACHEABLE_RESOURCE_TYPES = {"script", "stylesheet", "font", "image"}
+# describe the bytes on the wire, not the decoded body the cache stores
+BODY_ENCODING_HEADERS = {"content-encoding", "content-length"}
+
+
+def _replayable_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {k: v for k, v in headers.items() if k.lower() not in BODY_ENCODING_HEADERS}
+
+
+class HttpCache:
+    """Tiny on-disk cache for static GET responses, keyed by URL hash."""
+
+    def __init__(self, cache_dir: str):
+        self.root = Path(cache_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        folder = self.root / key[:2]
+        return folder / f"{key}.bin", folder / f"{key}.json"
+
+    def get(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        body_path, meta_path = self._paths(url)
+        if not (body_path.exists() and meta_path.exists()):
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            return meta["status"], meta["headers"], body_path.read_bytes()
+        except Exception:
+            return None
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        body_path, meta_path = self._paths(url)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        body_path.write_bytes(body)
+        meta_path.write_text(json.dumps({"url": url, "status": status, "headers": _replayable_headers(headers)}), encoding="utf-8")
+
+
+class RequestFilter:
+    """
+    Route handler for a Playwright context: aborts heavy resource types and tracker
+    hosts, lets `allow` patterns (fnmatch on the full URL) through untouched, and
+    serves allowed static assets from an optional on-disk HttpCache. `upstreams`
+    maps hosts to a base URL fetched instead (local stand-ins for benchmarks).
+    """
+
+    def __init__(
+        self,
+        block_types: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+        block_hosts: Iterable[str] = TRACKER_HOSTS,
+        allow: Iterable[str] = (),
+        cache_dir: Optional[str] = None,
+        upstreams: Optional[Dict[str, str]] = None,
+    ):
+        self.block_types = set(block_types)
+        self.upstreams = {h.lower(): base.rstrip("/") for h, base in (upstreams or {}).items()}
+        self.block_hosts = tuple(block_hosts)
+        self.allow = list(allow)
+        self.cache = HttpCache(cache_dir) if cache_dir else None
+        self.blocked = 0
+        self._from_cache: Set[int] = set()
+
+    async def install(self, context) -> None:
+        await context.route("**/*", self._handle)
+
+    def is_allowed(self, url: str) -> bool:
+        return any(fnmatch.fnmatch(url, pat) for pat in self.allow)
+
+    def is_blocked(self, url: str, resource_type: str) -> bool:
+        if self.is_allowed(url):
+            return False
+        if resource_type in self.block_types:
+            return True
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == h or host.endswith("." + h) for h in self.block_hosts)
+
+    def served_from_cache(self, request) -> bool:
+        """True (once) if `request` was fulfilled from disk rather than the network."""
+        key = id(request)
+        if key in self._from_cache:
+            self._from_cache.discard(key)
+            return True
+        return False
+
+    def upstream_url(self, url: str) -> Optional[str]:
+        p = urlparse(url)
+        base = self.upstreams.get((p.hostname or "").lower())
+        if base is None:
+            return None
+        return f"{base}{p.path}" + (f"?{p.query}" if p.query else "")
+
+    async def _handle(self, route) -> None:
+        req = route.request
+        target = self.upstream_url(req.url) if self.upstreams else None
+        if target is not None:
+            await route.fulfill(response=await route.fetch(url=target))
+            return
+        if self.is_blocked(req.url, req.resource_type):
+            self.blocked += 1
+            await route.abort()
+            return
+
+        if self.cache is None or req.method != "GET" or req.resource_type not in CACHEABLE_RESOURCE_TYPES:
+            await route.continue_()
+            return
+
+        cached = await asyncio.to_thread(self.cache.get, req.url)
+        if cached is not None:
+            status, headers, body = cached
+            self.cache.hits += 1
+            self.cache.bytes_saved += len(body)
+            self._from_cache.add(id(req))
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+
+        self.cache.misses += 1
+        response = await route.fetch()
+        if response.status == 200:
+            body = await response.body()
+            await asyncio.to_thread(self.cache.put, req.url, response.status, response.headers, body)
+        await route.fulfill(response=response)
+
+    def stats(self) -> Dict:
+        out = {"requests_blocked": self.blocked}
+        if self.cache is not None:
+            out.update({
+                "http_cache_hits": self.cache.hits,
+                "http_cache_misses": self.cache.misses,
+                "http_cache_bytes_saved": self.cache.bytes_saved,
+            })
+        return out
+
+
+class TrafficMeter:
+    """Counts bytes transferred (headers + body) per page for every finished request."""
+
+    def __init__(self, request_filter: Optional[RequestFilter] = None):
+        self.request_filter = request_filter
+        self.total_bytes = 0
+        self._per_page: Dict[int, int] = {}
+
+    def attach(self, context) -> None:
+        context.on("requestfinished", self._on_finished)
+
+    async def _on_finished(self, request) -> None:
+        if self.request_filter is not None and self.request_filter.served_from_cache(request):
+            return
+        try:
+            sizes = await request.sizes()
+            page = request.frame.page
+        except Exception:
+            return
+        n = sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+        self.total_bytes += n
+        self._per_page[id(page)] = self._per_page.get(id(page), 0) + n
+
+    def take(self, page) -> int:
+        """Return and reset the bytes counted for `page` since the last call."""
+        return self._per_page.pop(id(page), 0)
@@ -0,0 +1,221 @@
+# pipeline.py
+import asyncio
+import logging
+from typing import Dict, List, Set
+
+from models import SearchConfig
+from tools import iter_linkedin_urls_async, scrape_profile_async
+from seen_index import profile_urls_with_data, savable_rows
+from metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+
+class StreamingPipeline:
+    """
+    search -> scrape -> extract -> save as concurrent stages joined by bounded queues,
+    all driven from the workflow's ScrapeEngine loop. URLs reach scrapers as soon as a
+    SERP page yields them, and the browser keeps working while the LLM is busy; full
+    queues block the stage upstream, so memory stays flat however long the run is.
+    Uses the workflow's engine, sink, caches and `extract_rows`, so results match the
+    graph path.
+    """
+
+    def __init__(self, workflow):
+        self.workflow = workflow
+        self.counts = {"urls": 0, "scraped": 0, "extracted": 0, "written": 0, "failed": 0}
+        self.run_id = ""
+
+    def run(self, cfg: SearchConfig, query_base: str, run_id: str = "") -> List[str]:
+        """Run the whole pipeline; returns the URLs that were queued for scraping."""
+        self.run_id = run_id
+        return self.workflow.engine.run(self._run(cfg, query_base))
+
+    async def _run(self, cfg: SearchConfig, query_base: str) -> List[str]:
+        size = max(1, cfg.pipeline_queue_size)
+        url_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        row_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        out_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        queued: List[str] = []
+
+        n_scrapers = max(1, cfg.concurrency)
+
+        async def search() -> None:
+            await self._search_stage(cfg, query_base, url_q, queued)
+            for _ in range(n_scrapers):
+                await url_q.put(_DONE)
+
+        async def scrape() -> None:
+            scrapers = [asyncio.create_task(self._scrape_stage(cfg, url_q, row_q)) for _ in range(n_scrapers)]
+            try:
+                await asyncio.gather(*scrapers)
+            except BaseException:
+                await self._cancel(scrapers)
+                raise
+            await row_q.put(_DONE)
+
+        stages = [
+            asyncio.create_task(search()),
+            asyncio.create_task(scrape()),
+            asyncio.create_task(self._extract_stage(cfg, row_q, out_q)),
+            asyncio.create_task(self._save_stage(out_q)),
+        ]
+        # a failed stage would leave its neighbours blocked on a full or empty queue:
+        # the first failure cancels every other stage and is raised from here
+        try:
+            done, pending = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+        except BaseException:
+            await self._cancel(stages)
+            raise
+        failed = [t for t in done if not t.cancelled() and t.exception() is not None]
+        if failed:
+            await self._cancel(pending)
+            raise failed[0].exception()
+
+        if self.workflow.status is not None:
+            self.workflow.status.check()  # stages drained early because of a cancel
+        log.info(f"🚰 Pipeline: {self.counts['urls']} URLs, {self.counts['scraped']} scraped, "
+              f"{self.counts['extracted']} extracted, {self.counts['written']} written, "
+              f"{self.counts['failed']} failed")
+        return queued
+
+    @staticmethod
+    async def _cancel(tasks) -> None:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _search_stage(self, cfg: SearchConfig, query_base: str, url_q: asyncio.Queue, queued: List[str]) -> None:
+        eng = self.workflow.engine
+        sink = self.workflow.sink
+        index = self.workflow.seen
+        status = self.workflow.status
+        seen: Set[str] = set()
+        async for new in iter_linkedin_urls_async(
+            query_base,
+            cfg.pages or 1,
+            cfg.per_page,
+            eng.pool,
+            wait=eng.waits.get("serp"),
+            snapshots=self.workflow.snapshots,
+            limiter=eng.serp_limiter,
+            concurrency=eng.serp_concurrency,
+        ):
+            if status is not None:
+                status.check()
+                status.found(len(new))
+            fresh = await asyncio.to_thread(index.fresh, new) if index is not None else set()
+            for url in new:
+                if url in seen or url in sink or url in fresh:
+                    continue
+                seen.add(url)
+                queued.append(url)
+                self.counts["urls"] += 1
+                if status is not None:
+                    status.queued(1)
+                await url_q.put(url)
+
+    async def _scrape_stage(self, cfg: SearchConfig, url_q: asyncio.Queue, row_q: asyncio.Queue) -> None:
+        eng = self.workflow.engine
+        while True:
+            url = await url_q.get()
+            if url is _DONE:
+                return
+            status = self.workflow.status
+            if status is not None and status.cancelled:
+                continue  # drain without scraping so upstream puts never block
+            progress = self.workflow.progress
+            if progress is not None:
+                done = await asyncio.to_thread(progress.scraped_rows, self.run_id, [url])
+                if url in done:
+                    self.counts["scraped"] += 1
+                    if status is not None:
+                        status.scraped(1)
+                    await row_q.put(done[url])
+                    continue
+            try:
+                row = await scrape_profile_async(
+                    url,
+                    eng.pool,
+                    max_lines=100,
+                    wait=eng.waits.get("profile"),
+                    snapshots=self.workflow.snapshots,
+                    limiter=eng.limiter,
+                )
+            except Exception as e:
+                METRICS.inc("errors", stage="scrape")
+                log.warning(f"⚠️  Scrape failed for {url}: {e}")
+                row = {"url": url, "lines": [], "error": str(e)}
+            if progress is not None:
+                await asyncio.to_thread(progress.record_scraped, self.run_id, row)
+            self.counts["scraped"] += 1
+            if status is not None:
+                status.scraped(1)
+            await row_q.put(row)
+
+    async def _extract_stage(self, cfg: SearchConfig, row_q: asyncio.Queue, out_q: asyncio.Queue) -> None:
+        """Micro-batch rows (up to batch_size, lingering briefly) and extract them off the loop."""
+        done = False
+        while not done:
+            first = await row_q.get()
+            if first is _DONE:
+                break
+            batch: List[Dict] = [first]
+            while len(batch) < cfg.batch_size:
+                try:
+                    item = await asyncio.wait_for(row_q.get(), timeout=cfg.pipeline_linger_s)
+                except asyncio.TimeoutError:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+            status = self.workflow.status
+            if status is not None and status.cancelled:
+                continue  # scraped rows stay in the run's progress for a re-run
+            rows = await asyncio.to_thread(self.workflow.extract_rows, batch, cfg)
+            self.counts["extracted"] += len(rows)
+            await out_q.put(rows)
+        await out_q.put(_DONE)
+
+    async def _save_stage(self, out_q: asyncio.Queue) -> None:
+        sink = self.workflow.sink
+        while True:
+            rows = await out_q.get()
+            if rows is _DONE:
+                return
+            rows = self._savable(rows)
+            status = self.workflow.status
+            if not rows:
+                if status is not None:
+                    status.saved([])  # the batch is done even if nothing in it was savable
+                continue
+            new = [r for r in rows if r["url"] not in sink] if status else []
+            n = await asyncio.to_thread(self._write, sink, rows)
+            if status is not None:
+                status.saved(new[:n])
+            self.counts["written"] += n
+            METRICS.inc("rows_written", n)
+            await asyncio.to_thread(self._mark_saved, rows)
+
+    def _savable(self, rows: List[Dict]) -> List[Dict]:
+        """Drop failed rows from a batch: they are never written or marked, so a later run retries them."""
+        ok = savable_rows(rows)
+        self.counts["failed"] += len(rows) - len(ok)
+        METRICS.inc("rows_unsaved", len(rows) - len(ok))
+        return ok
+
+    @staticmethod
+    def _write(sink, rows: List[Dict]) -> int:
+        n = sink.write_rows(rows)
+        sink.flush()  # batch boundary
+        return n
+
+    def _mark_saved(self, rows: List[Dict]) -> None:
+        if self.workflow.progress is not None:
+            self.workflow.progress.mark_saved(self.run_id, [r["url"] for r in rows])
+        if self.workflow.seen is not None:
+            self.workflow.seen.mark(profile_urls_with_data(rows))
@@ -0,0 +1,249 @@
+# profile_text.py
+from typing import Dict, List, Optional
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # pip install lxml; BeautifulSoup is the slow fallback
+    lxml_html = None
+
+
+# Elements that start a new line; inline text inside one block stays on one line
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "footer",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "li", "main", "nav", "ol", "p",
+    "section", "table", "td", "th", "tr", "ul",
+}
+# Never text we want: code, icons and action buttons ("Connect", "Message", ...)
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "button"}
+# LinkedIn renders visible text twice: aria-hidden copy + a .visually-hidden one for screen readers
+HIDDEN_CLASS = "visually-hidden"
+HEADLINE_CLASS = "text-body-medium"
+
+
+# Runs inside the page: same sections, block grouping and dedupe as `extract_profile_text`,
+# so only a few KB of lines cross the Playwright pipe instead of the serialized DOM.
+PROFILE_TEXT_JS = """
+({maxLines, blockTags, skipTags, hiddenClass, headlineClass}) => {
+    const blocks = new Set(blockTags.map(t => t.toUpperCase()));
+    const skips = new Set(skipTags.map(t => t.toUpperCase()));
+    const lines = [];
+    const seen = new Set();
+    const flush = (buf) => {
+        const t = buf.join(" ").replace(/\\s+/g, " ").trim();
+        if (t && !seen.has(t) && lines.length < maxLines) { seen.add(t); lines.push(t); }
+    };
+
+    const h1 = document.querySelector("h1");
+    const sectionOf = (el) => el ? (el.closest("section") || el.parentElement) : null;
+    const about = document.getElementById("about");
+    const contact = document.getElementById("contact-info") || document.querySelector(".pv-contact-info");
+    let roots = [sectionOf(h1), sectionOf(about), sectionOf(contact)];
+    roots = roots.filter((r, i) => r && roots.indexOf(r) === i && !roots.some((o, j) => j !== i && o && o !== r && o.contains(r)));
+    if (!roots.length) roots = [document.querySelector("main") || document.body];
+
+    for (const root of roots) {
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, {
+            acceptNode: (n) => n.nodeType === 1 && (skips.has(n.tagName) || n.hidden || n.classList.contains(hiddenClass))
+                ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT,
+        });
+        let block = null, buf = [];
+        for (let n = walker.nextNode(); n && lines.length < maxLines; n = walker.nextNode()) {
+            if (n.nodeType !== 3) continue;
+            let b = n.parentElement;
+            while (b !== root && !blocks.has(b.tagName)) b = b.parentElement;
+            if (b !== block) { flush(buf); block = b; buf = []; }
+            buf.push(n.nodeValue);
+        }
+        flush(buf);
+    }
+    for (const a of document.querySelectorAll('a[href^="mailto:"]')) flush([a.getAttribute("href").slice(7)]);
+
+    const clean = (el) => el ? el.innerText.replace(/\\s+/g, " ").trim() : "";
+    const name = clean(h1);
+    let headline = clean(document.querySelector("." + headlineClass));
+    const headline_guessed = !headline && !!name;
+    if (headline_guessed) headline = lines.find(l => l !== name && !l.includes(name)) || "";
+    return {lines, top_card: {name, headline, headline_guessed}};
+}
+"""
+
+
+def js_args(max_lines: int = 100) -> Dict:
+    """Arguments for `page.evaluate(PROFILE_TEXT_JS, js_args(...))`."""
+    return {
+        "maxLines": max_lines,
+        "blockTags": sorted(BLOCK_TAGS),
+        "skipTags": sorted(SKIP_TAGS),
+        "hiddenClass": HIDDEN_CLASS,
+        "headlineClass": HEADLINE_CLASS,
+    }
+
+
+class _Lines:
+    """Ordered, deduplicated lines built from text runs grouped by their block element."""
+
+    def __init__(self, max_lines: int):
+        self.max_lines = max_lines
+        self.lines: List[str] = []
+        self._seen = set()
+        self._block = None
+        self._buf: List[str] = []
+
+    @property
+    def full(self) -> bool:
+        return len(self.lines) >= self.max_lines
+
+    def text(self, block, text: Optional[str]) -> None:
+        if not text:
+            return
+        if block is not self._block:
+            self.flush()
+            self._block = block
+        self._buf.append(text)
+
+    def flush(self) -> None:
+        line = " ".join(" ".join(self._buf).split())
+        self._buf = []
+        if line and line not in self._seen and not self.full:
+            self._seen.add(line)
+            self.lines.append(line)
+
+
+def _skip_lxml(el) -> bool:
+    if not isinstance(el.tag, str):  # comments, processing instructions
+        return True
+    classes = (el.get("class") or "").split()
+    return el.tag in SKIP_TAGS or el.get("hidden") is not None or HIDDEN_CLASS in classes
+
+
+def _walk_lxml(el, block, out: _Lines) -> None:
+    block = el if el.tag in BLOCK_TAGS else block
+    out.text(block, el.text)
+    for child in el:
+        if out.full:
+            return
+        if not _skip_lxml(child):
+            _walk_lxml(child, block, out)
+        out.text(block, child.tail)
+
+
+def _section_of(el):
+    if el is None or el.tag == "section":
+        return el
+    for anc in el.iterancestors("section"):
+        return anc
+    return el.getparent()
+
+
+def _roots_lxml(doc) -> List:
+    h1 = next(iter(doc.iter("h1")), None)
+    about = doc.get_element_by_id("about", None)
+    contact = doc.get_element_by_id("contact-info", None)
+    if contact is None:
+        hits = doc.find_class("pv-contact-info")
+        contact = hits[0] if hits else None
+    candidates = [_section_of(h1), _section_of(about), _section_of(contact) if contact is not None else None]
+    roots = []
+    for r in candidates:
+        if r is None or any(r is o for o in roots):
+            continue
+        if any(o is not None and o is not r and o in r.iterancestors() for o in candidates):
+            continue  # nested inside another root
+        roots.append(r)
+    if not roots:
+        main = next(iter(doc.iter("main")), None)
+        roots = [main if main is not None else doc]
+    return roots
+
+
+def _extract_lxml(html: str, max_lines: int) -> Dict:
+    doc = lxml_html.document_fromstring(html)
+    out = _Lines(max_lines)
+    for root in _roots_lxml(doc):
+        _walk_lxml(root, root, out)
+        out.flush()
+    for a in doc.xpath('//a[starts-with(@href, "mailto:")]'):
+        out.text(a, a.get("href")[7:])
+        out.flush()
+
+    h1 = next(iter(doc.iter("h1")), None)
+    name = " ".join(h1.text_content().split()) if h1 is not None else ""
+    headline = ""
+    hits = doc.find_class(HEADLINE_CLASS)
+    if hits:
+        headline = " ".join(hits[0].text_content().split())
+    guessed = not headline and bool(name)
+    if guessed:
+        headline = next((l for l in out.lines if l != name and name not in l), "")
+    return {"lines": out.lines, "top_card": {"name": name, "headline": headline, "headline_guessed": guessed}}
+
+
+def _extract_bs4(html: str, max_lines: int) -> Dict:
+    # Slow path for installs without lxml: same sections and grouping, via BeautifulSoup
+    from bs4 import BeautifulSoup, NavigableString
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    def section_of(el):
+        if el is None or el.name == "section":
+            return el
+        return el.find_parent("section") or el.parent
+
+    h1 = soup.find("h1")
+    contact = soup.find(id="contact-info") or soup.select_one(".pv-contact-info")
+    candidates = [section_of(h1), section_of(soup.find(id="about")), section_of(contact)]
+    roots = []
+    for r in candidates:
+        if r is None or any(r is o for o in roots):
+            continue
+        if any(o is not None and o is not r and any(p is o for p in r.parents) for o in candidates):
+            continue
+        roots.append(r)
+    if not roots:
+        roots = [soup.find("main") or soup]
+
+    def skipped(tag) -> bool:
+        return tag.name in SKIP_TAGS or tag.has_attr("hidden") or HIDDEN_CLASS in (tag.get("class") or [])
+
+    out = _Lines(max_lines)
+    for root in roots:
+        for node in root.descendants:
+            if out.full:
+                break
+            if type(node) is not NavigableString:  # comments, doctype, CDATA
+                continue
+            block, hidden = None, False
+            for p in node.parents:
+                if skipped(p):
+                    hidden = True
+                    break
+                if block is None and (p.name in BLOCK_TAGS or p is root):
+                    block = p
+                if p is root:
+                    break
+            if not hidden:
+                out.text(block, str(node))
+        out.flush()
+    for a in soup.select('a[href^="mailto:"]'):
+        out.text(a, a["href"][7:])
+        out.flush()
+
+    name = h1.get_text(" ", strip=True) if h1 is not None else ""
+    node = soup.select_one("." + HEADLINE_CLASS)
+    headline = node.get_text(" ", strip=True) if node is not None else ""
+    guessed = not headline and bool(name)
+    if guessed:
+        headline = next((l for l in out.lines if l != name and name not in l), "")
+    return {"lines": out.lines, "top_card": {"name": " ".join(name.split()), "headline": " ".join(headline.split()),
+                                             "headline_guessed": guessed}}
+
+
+def extract_profile_text(html: str, max_lines: int = 100) -> Dict:
+    """
+    Profile text from saved HTML, matching what PROFILE_TEXT_JS returns in the browser:
+    {"lines": [...], "top_card": {"name", "headline"}}. Lines come from the top card,
+    About and contact-info sections, one per block element, deduplicated in page order.
+    """
+    if lxml_html is not None:
+        return _extract_lxml(html, max_lines)
+    return _extract_bs4(html, max_lines)
@@ -56,4 +56,27 @@ class LinkedInPrompts:
             f"- url: set to this exact URL: {url}\n"
             "- If uncertain about a field, leave it as an empty string.\n\n"
             "Text lines:\n" + "\n".join(lines[:100])
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def extract_many(profiles: list[tuple[str, list[str]]]) -> str:
+        """Several profiles in one prompt; the answer is a JSON array keyed by URL."""
+        blocks = []
+        for i, (url, lines) in enumerate(profiles, 1):
+            blocks.append(f"### PROFILE {i}\nURL: {url}\nText lines:\n" + "\n".join(lines[:100]))
+        return (
+            "Extract fields from each LinkedIn profile below.\n"
+            "Return a JSON array with one object per profile, each with exactly these keys:\n"
+            '{ "name": "", "role": "", "email": "", "about": "", "url": "" }\n\n'
+            "Rules:\n"
+            "- name: person's full name if present, else empty string.\n"
+            "- role: current role/position or headline.\n"
+            "- email: any email on the page (prefer the most plausible personal one). "
+            "If none, empty string.\n"
+            "- about: short summary (1–3 sentences) synthesized from the text, "
+            "or empty if not available.\n"
+            "- url: copy the profile's URL line exactly.\n"
+            "- Never mix text between profiles.\n"
+            "- If uncertain about a field, leave it as an empty string.\n\n"
+            + "\n\n".join(blocks)
+        )
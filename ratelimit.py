@@ -0,0 +1,225 @@
+# ratelimit.py
+import asyncio
+import logging
+import math
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Shared politeness limiter: spaces request *starts* at least `min_interval`
+    seconds apart (plus optional jitter) across all concurrent workers, instead
+    of each worker sleeping after its own request.
+    """
+
+    def __init__(self, min_interval: float = 1.0, jitter: float = 0.0):
+        self.min_interval = max(0.0, min_interval)
+        self.jitter = max(0.0, jitter)
+        self._next_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def wait(self) -> None:
+        """Block until this caller is allowed to start its request."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+                now = time.monotonic()
+            self._next_at = now + self.min_interval + random.uniform(0, self.jitter)
+
+    @asynccontextmanager
+    async def request(self):
+        """`async with limiter.request():` around one request (fixed spacing, no feedback)."""
+        await self.wait()
+        yield
+
+    def throttle(self, reason: str) -> None:
+        """Fixed pacing ignores block signals (see AdaptiveRateLimiter)."""
+
+    def stats(self) -> Dict:
+        rate = 1.0 / self.min_interval if self.min_interval else 0.0
+        return {"rate": round(rate, 3), "concurrency": 0, "throttles": 0, "paused_s": 0.0}
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Per-host token bucket whose rate and in-flight window are tuned by AIMD: each
+    healthy response adds `increase` req/s (up to `max_rate`) and grows the window
+    toward `max_concurrency`. A block signal (`throttle`: non-200, captcha, authwall,
+    navigation errors) halves both and pauses the host for an exponential backoff.
+    Latency drifting past `latency_factor` x its baseline trims the rate too.
+    The current rate and window are exported as the request_rate /
+    request_concurrency gauges.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate: float = 1.0,
+        max_rate: float = 4.0,
+        min_rate: float = 0.02,
+        burst: float = 1.0,
+        jitter: float = 0.0,
+        max_concurrency: int = 4,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        latency_factor: float = 2.0,
+    ):
+        super().__init__(min_interval=1.0 / rate, jitter=jitter)
+        self.host = host
+        self.min_rate = min_rate
+        self.max_rate = max(rate, max_rate)
+        self.rate = min(max(rate, min_rate), self.max_rate)
+        self.burst = max(1.0, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.window = float(max(1, math.ceil(self.max_concurrency / 2)))  # ramp up to max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.latency_factor = latency_factor
+        self.throttles = 0
+        self._tokens = 1.0
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._cooldown_until = 0.0  # one multiplicative decrease per backoff period
+        self._last_throttle = 0.0
+        self._strikes = 0  # consecutive throttles without a healthy response in between
+        self._latency: Optional[float] = None  # EWMA, seconds
+        self._baseline: Optional[float] = None
+        self._samples = 0
+        self._inflight = 0
+        self._slots: Optional[asyncio.Condition] = None
+        self._export()
+
+    async def wait(self) -> None:
+        """Take one token, honouring any backoff pause."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                delay = max(self._paused_until - now, (1.0 - self._tokens) / self.rate)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            self._tokens -= 1.0
+            if self.jitter:
+                await asyncio.sleep(random.uniform(0, self.jitter))
+
+    @asynccontextmanager
+    async def request(self):
+        """
+        One request: waits for an in-flight slot and a token, then learns from how it
+        went. Leaving normally counts as healthy unless `throttle` was called meanwhile;
+        an exception counts as a block.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Condition()
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._inflight < int(self.window))
+            self._inflight += 1
+        try:
+            await self.wait()
+            started = time.monotonic()
+            try:
+                yield
+            except Exception as e:
+                if self._last_throttle < started:
+                    self.throttle(f"error: {type(e).__name__}")
+                raise
+            if self._last_throttle < started:
+                self._healthy(time.monotonic() - started)
+        finally:
+            async with self._slots:
+                self._inflight -= 1
+                self._slots.notify_all()
+
+    def _healthy(self, latency: float) -> None:
+        self._strikes = 0
+        self._samples += 1
+        self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        if self._baseline is None or self._latency < self._baseline:
+            self._baseline = self._latency
+        else:
+            self._baseline += 0.01 * (self._latency - self._baseline)  # follow slow drift
+        now = time.monotonic()
+        if self._samples >= 5 and self._latency > self.latency_factor * self._baseline:
+            if now >= self._cooldown_until:
+                self.rate = max(self.min_rate, self.rate * 0.8)
+                self.window = max(1.0, self.window - 1)
+                self._cooldown_until = now + self.base_backoff
+                METRICS.inc("throttled", host=self.host, reason="latency")
+        else:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            self.window = min(float(self.max_concurrency), self.window + 1.0 / self.window)
+        self._export()
+
+    def throttle(self, reason: str) -> None:
+        """A block signal from `host`: back off now and slow down afterwards."""
+        now = time.monotonic()
+        self._last_throttle = now
+        self._strikes += 1
+        self.throttles += 1
+        pause = min(self.max_backoff, self.base_backoff * 2 ** (self._strikes - 1))
+        self._paused_until = max(self._paused_until, now + pause)
+        if now >= self._cooldown_until:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.window = max(1.0, self.window * self.decrease)
+            self._cooldown_until = now + pause
+        self._tokens = min(self._tokens, 0.0)
+        METRICS.inc("throttled", host=self.host, reason=reason.split(":")[0])
+        log.warning(f"🐢 {self.host}: {reason}; pausing {pause:.1f}s, now {self.rate:.2f} req/s")
+        self._export()
+
+    def _export(self) -> None:
+        METRICS.set("request_rate", round(self.rate, 4), host=self.host)
+        METRICS.set("request_concurrency", round(self.window, 2), host=self.host)
+
+    def stats(self) -> Dict:
+        return {
+            "rate": round(self.rate, 3),
+            "concurrency": int(self.window),
+            "throttles": self.throttles,
+            "paused_s": round(max(0.0, self._paused_until - time.monotonic()), 1),
+        }
+
+
+@asynccontextmanager
+async def limited(limiter: Optional[RateLimiter]):
+    """`limiter.request()`, or no pacing at all when `limiter` is None."""
+    if limiter is None:
+        yield
+        return
+    async with limiter.request():
+        yield
+
+
+def make_limiter(
+    host: str,
+    min_interval: float,
+    jitter: float = 0.0,
+    adaptive: bool = True,
+    max_rate: float = 4.0,
+    max_concurrency: int = 4,
+) -> RateLimiter:
+    """Adaptive limiter starting at 1/min_interval req/s, or fixed spacing when not adaptive."""
+    if not adaptive or min_interval <= 0:
+        return RateLimiter(min_interval=min_interval, jitter=jitter)
+    return AdaptiveRateLimiter(
+        host, rate=1.0 / min_interval, max_rate=max_rate, jitter=jitter, max_concurrency=max_concurrency,
+    )
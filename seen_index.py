@@ -0,0 +1,97 @@
+# seen_index.py
+import re
+import time
+from typing import Dict, Iterable, List, Set
+from urllib.parse import unquote, urlparse
+
+from sqlite_store import SqliteStore
+
+
+_PROFILE_SLUG_RE = re.compile(r"^/in/([^/?#]+)")  # profiles only, not /company/in/...
+
+
+def canonical_profile_url(url: str) -> str:
+    """
+    https://www.linkedin.com/in/<slug> for any LinkedIn profile URL: locale subdomains
+    (uk.linkedin.com), case, percent-encoding, trailing slashes, query strings and
+    sub-pages (/details/...) all fold to the same key. Other URLs are returned stripped.
+    """
+    raw = (url or "").strip()
+    if not raw:
+        return ""
+    p = urlparse(raw if "://" in raw else "https://" + raw.lstrip("/"))
+    host = (p.hostname or "").lower()
+    m = _PROFILE_SLUG_RE.match(unquote(p.path))
+    if not m or not (host == "linkedin.com" or host.endswith(".linkedin.com")):
+        return raw
+    return f"https://www.linkedin.com/in/{m.group(1).lower()}"
+
+
+def savable_rows(rows: List[Dict]) -> List[Dict]:
+    """
+    Extracted rows worth saving: a URL, no error and at least one field. The rest are
+    failed scrapes or extractions; they are never written or marked, so they stay retryable.
+    """
+    return [
+        r for r in rows
+        if r.get("url") and not r.get("error") and any(r.get(k) for k in ("name", "role", "email", "about"))
+    ]
+
+
+def profile_urls_with_data(rows: List[Dict]) -> List[str]:
+    """URLs of the savable rows among `rows`."""
+    return [r["url"] for r in savable_rows(rows)]
+
+
+class SeenIndex(SqliteStore):
+    """
+    Every profile scraped and saved by any run, whatever the output, keyed by canonical
+    URL. Profiles saved within `ttl_seconds` are skipped before scraping; older ones
+    are considered stale and fetched again.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS seen_profiles ("
+        " url TEXT PRIMARY KEY, first_seen REAL NOT NULL, last_scraped REAL NOT NULL)",
+    )
+
+    def __init__(self, path: str, ttl_seconds: float = 30 * 86400):
+        super().__init__(path)
+        self.ttl_seconds = ttl_seconds
+        self.skipped = 0
+
+    def fresh(self, urls: Iterable[str]) -> Set[str]:
+        """The subset of `urls` (canonical) saved recently enough to skip."""
+        keys = {canonical_profile_url(u): u for u in urls}
+        if not keys:
+            return set()
+        cutoff = time.time() - self.ttl_seconds
+        found: Set[str] = set()
+        items = list(keys)
+        with self._lock:
+            for i in range(0, len(items), 500):  # stay under SQLite's bound-parameter limit
+                chunk = items[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url FROM seen_profiles WHERE last_scraped >= ? AND url IN ({marks})",
+                    (cutoff, *chunk),
+                ).fetchall()
+                found.update(keys[r[0]] for r in rows)
+            self.skipped += len(found)
+        return found
+
+    def mark(self, urls: Iterable[str]) -> None:
+        now = time.time()
+        rows = [(canonical_profile_url(u), now, now) for u in urls if u]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO seen_profiles(url, first_seen, last_scraped) VALUES (?, ?, ?)"
+                " ON CONFLICT(url) DO UPDATE SET last_scraped = excluded.last_scraped",
+                rows,
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        return {"seen_skipped": self.skipped}
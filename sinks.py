@@ -0,0 +1,429 @@
+# sinks.py
+import csv
+import json
+from abc import ABC, abstractmethod
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Set
+
+from sqlite_store import SqliteStore
+
+# pyarrow is optional and slow to import: loaded by the first ParquetSink
+pa = None
+pq = None
+
+
+def _load_pyarrow() -> None:
+    global pa, pq
+    if pa is not None:
+        return
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("output_format='parquet' needs pyarrow: pip install pyarrow")
+    pa, pq = pyarrow, pyarrow.parquet
+
+
+PROFILE_HEADERS = ["name", "role", "email", "about", "url"]
+
+
+def _profile_row(r: Dict) -> Dict:
+    # Ensure keys exist even if empty
+    return {h: r.get(h, "") or "" for h in PROFILE_HEADERS}
+
+
+class ProfileSink(ABC):
+    """
+    Output backend for structured profile rows. A sink lives for a whole run:
+    `write_rows` dedupes by URL and buffers, `flush` is called at batch boundaries,
+    `preview` returns the most recent rows for UIs without re-reading everything.
+    """
+
+    path: Path
+
+    @abstractmethod
+    def write_rows(self, rows: List[Dict]) -> int:
+        """Accept rows whose URL is new; returns how many were accepted."""
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Batch boundary: accepted rows are on disk when this returns."""
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+    @abstractmethod
+    def __contains__(self, url: str) -> bool:
+        ...
+
+    @abstractmethod
+    def preview(self, limit: int = 20) -> List[Dict]:
+        ...
+
+    def __enter__(self) -> "ProfileSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class _UrlIndex:
+    """
+    Seen-URL set for append-only files, persisted in a `<file>.urls.idx` sidecar:
+    URLs followed by a `#size=<data bytes>` marker per flush, so a stale or
+    half-written sidecar is detected (size mismatch) and rebuilt with one scan.
+    """
+
+    def __init__(self, data_path: Path, scan: Callable[[Path], Iterable[str]]):
+        self.data_path = data_path
+        self.index_path = data_path.with_name(data_path.name + ".urls.idx")
+        self._scan = scan
+        self._pending: List[str] = []
+        self.seen: Set[str] = self._load()
+
+    def _data_size(self) -> int:
+        return self.data_path.stat().st_size if self.data_path.exists() else 0
+
+    def _load(self) -> Set[str]:
+        if not self.data_path.exists():
+            self.index_path.unlink(missing_ok=True)
+            return set()
+        if self.index_path.exists():
+            seen: Set[str] = set()
+            pending: List[str] = []
+            size = -1
+            with self.index_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if line.startswith("#size="):
+                        seen.update(pending)
+                        pending = []
+                        size = int(line[6:])
+                    elif line:
+                        pending.append(line)
+            if size == self._data_size():
+                return seen
+        seen = {u for u in self._scan(self.data_path) if u}
+        with self.index_path.open("w", encoding="utf-8") as f:
+            for u in seen:
+                f.write(u + "\n")
+            f.write(f"#size={self._data_size()}\n")
+        return seen
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.seen
+
+    def add(self, url: str) -> None:
+        self.seen.add(url)
+        self._pending.append(url)
+
+    def commit(self) -> None:
+        """Record URLs added since the last commit; call after the data file is flushed."""
+        with self.index_path.open("a", encoding="utf-8") as f:
+            for u in self._pending:
+                f.write(u + "\n")
+            f.write(f"#size={self._data_size()}\n")
+        self._pending = []
+
+
+class CsvSink(ProfileSink):
+    """
+    Append-only CSV (the original output format). Files with an older header are
+    left alone and rows go to `<stem>_v2.csv` instead.
+    """
+
+    def __init__(self, path: str):
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+
+        # If an old file has a different header (e.g., older schema), write to a new file suffix
+        if p.exists():
+            with p.open("r", encoding="utf-8", newline="") as f:
+                try:
+                    existing_headers = next(csv.reader(f))
+                except StopIteration:
+                    existing_headers = []
+            if existing_headers and existing_headers != PROFILE_HEADERS:
+                p = p.with_name(p.stem + "_v2" + p.suffix)
+
+        self.path = p
+        self.index = _UrlIndex(p, self._scan_urls)
+        self._recent: List[Dict] = []
+
+        write_header = not p.exists() or p.stat().st_size == 0
+        self._fh = p.open("a", encoding="utf-8", newline="", buffering=1 << 16)
+        self._writer = csv.DictWriter(self._fh, fieldnames=PROFILE_HEADERS)
+        if write_header:
+            self._writer.writeheader()
+
+    @staticmethod
+    def _scan_urls(path: Path) -> Iterable[str]:
+        with path.open("r", encoding="utf-8", newline="") as f:
+            for r in csv.DictReader(f):
+                yield r.get("url", "")
+
+    def write_rows(self, rows: List[Dict]) -> int:
+        written = 0
+        for r in rows:
+            url = r.get("url")
+            if not url or url in self.index:
+                continue
+            self.index.add(url)
+            row = _profile_row(r)
+            self._writer.writerow(row)
+            self._recent.append(row)
+            written += 1
+        self._recent = self._recent[-100:]
+        return written
+
+    def flush(self) -> None:
+        self._fh.flush()
+        self.index.commit()
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        self.flush()
+        self._fh.close()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def preview(self, limit: int = 20) -> List[Dict]:
+        if self._recent:
+            return self._recent[-limit:]
+        # fresh sink over an existing file: first rows are as good as any for a preview
+        out = []
+        with self.path.open("r", encoding="utf-8", newline="") as f:
+            for r in csv.DictReader(f):
+                out.append(r)
+                if len(out) >= limit:
+                    break
+        return out
+
+
+class JsonlSink(ProfileSink):
+    """One JSON object per line; same append + sidecar-index model as CsvSink."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.index = _UrlIndex(self.path, self._scan_urls)
+        self._recent: List[Dict] = []
+        self._fh = self.path.open("a", encoding="utf-8", buffering=1 << 16)
+
+    @staticmethod
+    def _scan_urls(path: Path) -> Iterable[str]:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line).get("url", "")
+                except ValueError:
+                    continue
+
+    def write_rows(self, rows: List[Dict]) -> int:
+        written = 0
+        for r in rows:
+            url = r.get("url")
+            if not url or url in self.index:
+                continue
+            self.index.add(url)
+            row = _profile_row(r)
+            self._fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._recent.append(row)
+            written += 1
+        self._recent = self._recent[-100:]
+        return written
+
+    def flush(self) -> None:
+        self._fh.flush()
+        self.index.commit()
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        self.flush()
+        self._fh.close()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def preview(self, limit: int = 20) -> List[Dict]:
+        if self._recent:
+            return self._recent[-limit:]
+        out = []
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                out.append(json.loads(line))
+                if len(out) >= limit:
+                    break
+        return out
+
+
+class SqliteSink(SqliteStore, ProfileSink):
+    """
+    SQLite table with a unique index on url. Rows are upserted in one transaction per
+    flush; dedupe and preview are indexed lookups rather than file scans.
+    Safe to share between threads (one connection behind a lock).
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS profiles ("
+        " name TEXT, role TEXT, email TEXT, about TEXT, url TEXT NOT NULL,"
+        " updated_at REAL NOT NULL)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS profiles_url ON profiles(url)",
+        "CREATE INDEX IF NOT EXISTS profiles_updated ON profiles(updated_at)",
+    )
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.path = Path(path)
+        self._pending: Dict[str, Dict] = {}
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._contains_locked(url)
+
+    def _contains_locked(self, url: str) -> bool:
+        if url in self._pending:
+            return True
+        return self._conn.execute("SELECT 1 FROM profiles WHERE url = ?", (url,)).fetchone() is not None
+
+    def write_rows(self, rows: List[Dict]) -> int:
+        written = 0
+        with self._lock:
+            for r in rows:
+                url = r.get("url")
+                if not url:
+                    continue
+                if not self._contains_locked(url):
+                    written += 1
+                self._pending[url] = _profile_row(r)  # upsert: later rows win
+        return written
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO profiles(name, role, email, about, url, updated_at) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(url) DO UPDATE SET name=excluded.name, role=excluded.role,"
+                " email=excluded.email, about=excluded.about, updated_at=excluded.updated_at",
+                [(r["name"], r["role"], r["email"], r["about"], r["url"], now) for r in self._pending.values()],
+            )
+        self._pending = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+        super().close()
+
+    def preview(self, limit: int = 20) -> List[Dict]:
+        with self._lock:
+            self._flush_locked()
+            cur = self._conn.execute(
+                "SELECT name, role, email, about, url FROM profiles ORDER BY updated_at DESC LIMIT ?", (limit,)
+            )
+            rows = cur.fetchall()
+        return [dict(zip(PROFILE_HEADERS, row)) for row in rows]
+
+
+class ParquetSink(ProfileSink):
+    """
+    Parquet dataset directory. Every `flush` (batch boundary) writes the buffered rows
+    as a complete, closed part file, so rows are on disk before the run marks them
+    saved. A Parquet file is unreadable until its footer is written, so row groups
+    appended to an open writer wouldn't survive a crash. On close, the run's parts
+    are merged into one `part-<ts>.parquet` with `row_group_size` row groups.
+    Existing parts are read back by the url column only to seed dedupe.
+    """
+
+    def __init__(self, path: str, row_group_size: int = 10_000):
+        _load_pyarrow()
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = row_group_size
+        self.seen: Set[str] = set()
+        for part in sorted(self.path.glob("*.parquet")):
+            self.seen.update(pq.read_table(part, columns=["url"]).column("url").to_pylist())
+        self._schema = pa.schema([(h, pa.string()) for h in PROFILE_HEADERS])
+        self._stamp = int(time.time() * 1000)
+        self._parts: List[Path] = []  # this run's per-batch files, merged on close
+        self._buffer: List[Dict] = []
+        self._recent: List[Dict] = []
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.seen
+
+    def write_rows(self, rows: List[Dict]) -> int:
+        written = 0
+        for r in rows:
+            url = r.get("url")
+            if not url or url in self.seen:
+                continue
+            self.seen.add(url)
+            row = _profile_row(r)
+            self._buffer.append(row)
+            self._recent.append(row)
+            written += 1
+        self._recent = self._recent[-100:]
+        return written
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        part = self.path / f"part-{self._stamp}-{len(self._parts) + 1:05d}.parquet"
+        pq.write_table(pa.Table.from_pylist(self._buffer, schema=self._schema), str(part))
+        self._parts.append(part)
+        self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        if len(self._parts) < 2:
+            return
+        merged = pa.concat_tables([pq.read_table(p, schema=self._schema) for p in self._parts])
+        tmp = self.path / f".part-{self._stamp}.tmp"
+        pq.write_table(merged, str(tmp), row_group_size=self.row_group_size)
+        # rename before deleting: a crash in between duplicates rows (dedupe ignores them), never loses them
+        tmp.replace(self.path / f"part-{self._stamp}.parquet")
+        for part in self._parts:
+            part.unlink()
+        self._parts = []
+
+    def preview(self, limit: int = 20) -> List[Dict]:
+        if self._recent:
+            return self._recent[-limit:]
+        parts = sorted(self.path.glob("*.parquet"))
+        if not parts:
+            return []
+        return pq.read_table(parts[-1]).slice(0, limit).to_pylist()
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "sqlite": SqliteSink,
+    "parquet": ParquetSink,
+}
+
+
+def open_sink(output_format: str, path: str) -> ProfileSink:
+    try:
+        cls = SINKS[output_format]
+    except KeyError:
+        raise ValueError(f"Unknown output_format '{output_format}' (choose from {', '.join(SINKS)})")
+    return cls(path)
+
+
+def default_output_path(output_format: str, base: str) -> str:
+    """`output.csv` -> `output.jsonl` / `output.sqlite` / `output.parquet` (a directory)."""
+    if output_format == "csv":
+        return base
+    return str(Path(base).with_suffix("." + output_format))
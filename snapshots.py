@@ -0,0 +1,81 @@
+# snapshots.py
+import gzip
+import time
+from typing import Dict, List, Optional
+
+from seen_index import canonical_profile_url
+from sqlite_store import SqliteStore
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is always available
+    zstandard = None
+
+
+def _compress(data: bytes):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "gzip", gzip.compress(data, compresslevel=6)
+
+
+def _decompress(codec: str, blob: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("snapshot was written with zstd; pip install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+class SnapshotStore(SqliteStore):
+    """
+    Compressed raw HTML of fetched pages ("profile" and "serp"), keyed by
+    `canonical_profile_url` (SERP URLs are built deterministically and kept as is).
+    Used as a read-through cache (fresh within `ttl_seconds`) and as the offline source
+    for `--from-snapshots` re-parsing, which ignores the TTL.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS snapshots ("
+        " url TEXT PRIMARY KEY, kind TEXT NOT NULL, fetched_at REAL NOT NULL,"
+        " codec TEXT NOT NULL, size INTEGER NOT NULL, html BLOB NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS snapshots_kind ON snapshots(kind, fetched_at)",
+    )
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 86400):
+        super().__init__(path)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, url: str, html: str, kind: str = "profile") -> None:
+        raw = html.encode("utf-8")
+        codec, blob = _compress(raw)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots(url, kind, fetched_at, codec, size, html) VALUES (?, ?, ?, ?, ?, ?)",
+                (canonical_profile_url(url), kind, time.time(), codec, len(raw), blob),
+            )
+            self._conn.commit()
+
+    def get(self, url: str, max_age: Optional[float] = None) -> Optional[str]:
+        """HTML for `url` if stored and younger than `max_age` (default: the store TTL; pass float('inf') for any age)."""
+        max_age = self.ttl_seconds if max_age is None else max_age
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, codec, html FROM snapshots WHERE url = ?", (canonical_profile_url(url),)
+            ).fetchone()
+        if row is None or time.time() - row[0] > max_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _decompress(row[1], row[2]).decode("utf-8")
+
+    def urls(self, kind: str = "profile") -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM snapshots WHERE kind = ? ORDER BY url", (kind,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def stats(self) -> Dict:
+        return {"snapshot_hits": self.hits, "snapshot_misses": self.misses}
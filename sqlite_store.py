@@ -0,0 +1,32 @@
+# sqlite_store.py
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Tuple
+
+
+class SqliteStore:
+    """
+    Base of the on-disk stores (LLM cache, snapshots, seen index, run progress, frontier,
+    work queue, SQLite output sink): one SQLite file in WAL mode, one connection shared by every thread.
+    Subclasses list their `SCHEMA` statements (run on open, so they must be idempotent),
+    may extend `PRAGMAS`, and hold `_lock` around every use of `_conn`.
+    """
+
+    PRAGMAS: Tuple[str, ...] = ("journal_mode=WAL",)
+    SCHEMA: Tuple[str, ...] = ()
+
+    def __init__(self, path: str, **connect_args):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, **connect_args)
+        for pragma in self.PRAGMAS:
+            self._conn.execute(f"PRAGMA {pragma}")
+        for statement in self.SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,35 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+import pytest
+
+# modules live at the repo root (no package), as in bench/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class MemorySink:
+    """In-memory ProfileSink stand-in: keeps written rows, dedupes nothing."""
+
+    path = "memory"
+
+    def __init__(self):
+        self.rows = []
+
+    def __contains__(self, url):
+        return any(r["url"] == url for r in self.rows)
+
+    def write_rows(self, rows):
+        self.rows.extend(rows)
+        return len(rows)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_sink():
+    return MemorySink()
@@ -0,0 +1,77 @@
+# tests/test_background.py
+"""RunStatus counters and ETA, background-run outcomes, and WorkflowPool checkout rules."""
+import pytest
+
+import background
+from background import BackgroundRun, RunCancelled, RunStatus, WorkflowPool
+
+URL = "https://www.linkedin.com/in/jane-doe"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_counters_and_eta(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(background.time, "monotonic", clock)
+    status = RunStatus()
+    status.start("run1")
+    status.found(12)
+    status.queued(12, batches=3)
+    clock.now += 10
+    status.scraped(4)  # scraping starts here
+    clock.now += 30
+    status.scraped(4)
+    status.saved([{"url": URL, "name": "Jane Doe", "error": ""}])
+
+    snap = status.snapshot()
+    assert (snap["phase"], snap["profiles_done"], snap["batches_done"], snap["rows_written"]) == ("scraping", 8, 1, 1)
+    assert snap["elapsed_s"] == 40.0
+    assert snap["profiles_per_min"] == 16.0  # 8 profiles in the 30s since scraping began
+    assert snap["eta_s"] == 15  # 4 left
+    assert status.rows() == [{"name": "Jane Doe", "role": "", "email": "", "about": "", "url": URL}]
+
+    status.finish()
+    assert status.snapshot()["eta_s"] is None
+
+
+@pytest.mark.parametrize("target, phase", [
+    (lambda status: "ok", "done"),
+    (lambda status: status.check(), "cancelled"),
+    (lambda status: 1 / 0, "failed"),
+])
+def test_background_run_outcome(target, phase):
+    run = BackgroundRun(target)
+    if phase == "cancelled":
+        run.cancel()
+    run.start().join(5)
+    assert run.done and run.status.phase == phase
+
+
+def test_pool_refuses_an_output_already_being_written():
+    pool = WorkflowPool(factory=object, size=2)
+    with pool.checkout(output="out.csv") as first:
+        with pytest.raises(ValueError, match="already being written"):
+            with pool.checkout(output="out.csv"):
+                pass
+        with pool.checkout(output="other.csv") as second:
+            assert second is not first
+    with pool.checkout(output="out.csv") as again:  # released, and the Workflow is reused
+        assert again in (first, second)
+
+
+def test_pool_wait_can_be_cancelled():
+    pool = WorkflowPool(factory=object, size=1)
+    status = RunStatus()
+    with pool.checkout():
+        status.cancel()
+        with pytest.raises(RunCancelled):
+            with pool.checkout(status=status, output="out.csv"):
+                pass
+    with pool.checkout(output="out.csv"):  # the cancelled wait gave its output back
+        pass
@@ -0,0 +1,22 @@
+# tests/test_block_detection.py
+"""Block/challenge detection from responses and from harvested profile text."""
+from tools import block_reason, profile_block_reason
+
+
+def test_block_reason_from_status_url_and_text():
+    assert block_reason(999, "https://www.linkedin.com/in/x") == "http 999"
+    assert block_reason(200, "https://www.linkedin.com/authwall?trk=x") == "authwall"
+    assert block_reason(None, "", "Our systems have detected unusual traffic") == "captcha"
+    assert block_reason(200, "https://www.linkedin.com/in/x", "Jane Doe") is None
+
+
+def test_a_challenge_rendered_on_a_profile_url_is_a_block():
+    page = {"lines": ["Let's do a quick security check", "Verify you are not a robot"],
+            "top_card": {"name": "", "headline": "", "headline_guessed": False}}
+    assert profile_block_reason(page) == "captcha"
+
+
+def test_profile_text_far_down_the_page_is_not_a_block():
+    lines = ["Jane Doe", "Founder at Acme"] + [f"line {i}" for i in range(30)] + ["Built a CAPTCHA solver"]
+    page = {"lines": lines, "top_card": {"name": "Jane Doe", "headline": "Founder at Acme", "headline_guessed": False}}
+    assert profile_block_reason(page) is None
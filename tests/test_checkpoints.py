@@ -0,0 +1,21 @@
+# tests/test_checkpoints.py
+"""Per-URL run progress: what a resumed run skips, and pruning once a run finishes."""
+from checkpoints import RunProgress
+
+URL = "https://www.linkedin.com/in/jane-doe"
+
+
+def test_scraped_rows_survive_until_the_run_is_cleared(tmp_path):
+    progress = RunProgress(str(tmp_path / "checkpoints.sqlite"))
+    progress.record_scraped("r", {"url": URL, "lines": ["Jane Doe"]})
+    progress.record_scraped("r", {"url": "https://www.linkedin.com/in/x", "lines": [], "error": "timeout"})
+    progress.record_scraped("other", {"url": URL, "lines": ["Jane Doe"]})
+
+    assert list(progress.scraped_rows("r", [URL, "https://www.linkedin.com/in/x"])) == [URL]
+    progress.mark_saved("r", [URL])
+    assert progress.scraped_rows("r", [URL]) == {}  # saved rows drop their raw text
+
+    progress.clear("r")
+    assert progress._conn.execute("SELECT COUNT(*) FROM run_progress WHERE run_id = 'r'").fetchone()[0] == 0
+    assert list(progress.scraped_rows("other", [URL])) == [URL]
+    progress.close()
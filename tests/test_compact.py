@@ -0,0 +1,29 @@
+# tests/test_compact.py
+"""Boilerplate learning and the compactor's cache fingerprint."""
+from compact import PromptCompactor
+
+
+def test_section_labels_are_never_learned():
+    compactor = PromptCompactor(learn_min_profiles=3)
+    compactor.observe([
+        {"lines": [f"Person {i}", "About", "Email", "Contact info", "Try Premium for free"]} for i in range(3)
+    ])
+    assert compactor.learned == {"try premium for free"}
+    out = compactor.compact({"lines": ["Jane Doe", "Contact info", "Email", "jane@example.com", "Try Premium for free"]})
+    assert out["lines"] == ["Jane Doe", "Contact info", "Email", "jane@example.com"]
+
+
+def test_fingerprint_changes_with_the_boilerplate_list_not_just_its_size():
+    a = PromptCompactor(extra_boilerplate=["open to work"])
+    b = PromptCompactor(extra_boilerplate=["hiring"])
+    assert len(a.boilerplate) == len(b.boilerplate)
+    assert a.fingerprint() != b.fingerprint()
+    assert a.fingerprint() == PromptCompactor(extra_boilerplate=["Open to work "]).fingerprint()
+
+
+def test_fingerprint_changes_when_boilerplate_is_learned():
+    compactor = PromptCompactor(learn_min_profiles=4)
+    before = compactor.fingerprint()
+    compactor.observe([{"lines": [f"Person {i}", "Open to work"]} for i in range(4)])
+    assert compactor.learned == {"open to work"}
+    assert compactor.fingerprint() != before
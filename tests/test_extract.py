@@ -0,0 +1,47 @@
+# tests/test_extract.py
+"""The three LLM extract modes give the same rows; packed mode retries what a pack answer missed."""
+import json
+
+import pytest
+
+from fakes import FakeExtractChatModel
+from models import SearchConfig
+from workflow import Workflow
+
+ROWS = [
+    {"url": f"https://www.linkedin.com/in/person-{i}", "lines": [f"Person {i}", f"Engineer {i}", f"p{i}@acme.io"]}
+    for i in range(5)
+]
+
+
+class DroppingChatModel(FakeExtractChatModel):
+    """Leaves the last profile out of every packed answer."""
+
+    def _answer(self, messages):
+        out = super()._answer(messages)
+        items = json.loads(out)
+        return json.dumps(items[:-1]) if isinstance(items, list) else out
+
+
+def _config(mode: str) -> SearchConfig:
+    return SearchConfig(role="engineer", country="uk", extract_mode=mode, pack_size=2,
+                        fast_path=False, llm_cache=False, prompt_token_budget=0)
+
+
+@pytest.mark.parametrize("mode, calls", [("serial", 5), ("concurrent", 5), ("packed", 3)])
+def test_extract_modes(mode, calls):
+    llm = FakeExtractChatModel(latency=0.0)
+    out = Workflow(llm=llm).extract_rows(ROWS, _config(mode))
+
+    assert [(r["url"], r["name"], r["role"], r["email"]) for r in out] == [
+        (r["url"], f"Person {i}", f"Engineer {i}", f"p{i}@acme.io") for i, r in enumerate(ROWS)
+    ]
+    assert llm.calls == calls
+
+
+def test_packed_retries_profiles_missing_from_the_answer():
+    llm = DroppingChatModel(latency=0.0)
+    out = Workflow(llm=llm).extract_rows(ROWS, _config("packed"))
+
+    assert [r["name"] for r in out] == [f"Person {i}" for i in range(5)]
+    assert llm.calls == 3 + 3  # one single-profile retry per pack
@@ -0,0 +1,44 @@
+# tests/test_fast_extract.py
+"""Rule-based extraction: confident rows skip the LLM, anything doubtful goes to it."""
+from fast_extract import fast_extract, is_confident
+from models import SearchConfig
+from workflow import Workflow
+
+URL = "https://www.linkedin.com/in/jane-doe"
+REQUIRED = ["name", "role", "email"]
+
+
+def _row(lines, **top):
+    return {"url": URL, "lines": lines, "top_card": top}
+
+
+def test_top_card_and_single_email_are_confident():
+    result = fast_extract(_row(["Jane Doe", "Founder at Acme", "jane@acme.io"], name="Jane Doe", headline="Founder at Acme"))
+    assert result["fields"] == {"name": "Jane Doe", "role": "Founder at Acme", "email": "jane@acme.io", "about": "", "url": URL}
+    assert is_confident(result, REQUIRED, 0.8)
+
+
+def test_doubtful_fields_are_not_confident():
+    guessed = fast_extract(_row(["Jane Doe", "Founder", "jane@acme.io"],
+                                name="Jane Doe", headline="Founder", headline_guessed=True))
+    assert guessed["confidence"]["role"] == 0.5
+    two_emails = fast_extract(_row(["jane@acme.io", "jane@gmail.com"], name="Jane Doe", headline="Founder"))
+    assert (two_emails["fields"]["email"], two_emails["confidence"]["email"]) == ("jane@gmail.com", 0.7)
+    no_email = fast_extract(_row(["jane at gmail dot com"], name="Jane Doe", headline="Founder"))
+    chrome = fast_extract(_row(["Messaging"], name="Messaging", headline="Founder"))
+    for result in (guessed, two_emails, no_email, chrome):
+        assert not is_confident(result, REQUIRED, 0.8)
+
+
+def test_name_falls_back_to_the_first_name_like_line():
+    result = fast_extract(_row(["Home", "Jane Doe", "about"]))
+    assert (result["fields"]["name"], result["confidence"]["name"]) == ("Jane Doe", 0.5)
+
+
+def test_confident_rows_never_reach_the_llm():
+    cfg = SearchConfig(role="founder", country="uk", llm_cache=False)
+    row = _row(["Jane Doe", "Founder at Acme", "jane@acme.io"], name="Jane Doe", headline="Founder at Acme")
+    workflow = Workflow(llm=object())  # any call on it would fail the row
+
+    assert workflow.extract_rows([row], cfg) == [fast_extract(row)["fields"]]
+    assert workflow.extract_stats["fast_rows"] == 1
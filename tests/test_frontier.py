@@ -0,0 +1,47 @@
+# tests/test_frontier.py
+"""The large-run frontier: dedupe, skipped URLs and cursor resume."""
+import pytest
+
+from frontier import Frontier
+
+URLS = [f"https://www.linkedin.com/in/p{i}" for i in range(7)]
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    f = Frontier(str(tmp_path / "frontier.sqlite"))
+    yield f
+    f.close()
+
+
+def test_add_returns_only_new_canonical_urls(frontier):
+    assert frontier.add("r", URLS[:3]) == URLS[:3]
+    assert frontier.add("r", ["https://uk.linkedin.com/in/P1/", URLS[3]]) == [URLS[3]]
+    assert frontier.add("other", URLS[:1]) == URLS[:1]  # runs are separate
+
+
+def test_skipped_urls_count_as_found_but_are_never_batched(frontier):
+    assert frontier.add("r", URLS[:3], skip=[URLS[1]]) == URLS[:3]
+    assert frontier.add("r", [URLS[1]]) == []  # a later page repeating it adds nothing new
+    assert frontier.remaining("r", 0) == 2
+    assert frontier.batch("r", 0, 10)[0] == [URLS[0], URLS[2]]
+
+
+def test_cursor_resume_reads_each_url_once(frontier, tmp_path):
+    frontier.add("r", URLS)
+    first, cursor = frontier.batch("r", 0, 3)
+    assert first == URLS[:3]
+    frontier.close()
+
+    reopened = Frontier(str(tmp_path / "frontier.sqlite"))  # a crashed run resumes from the checkpointed cursor
+    rest = []
+    while True:
+        batch, cursor = reopened.batch("r", cursor, 3)
+        if not batch:
+            break
+        rest += batch
+    assert rest == URLS[3:]
+    assert reopened.remaining("r", cursor) == 0
+    reopened.clear("r")
+    assert reopened.remaining("r", 0) == 0
+    reopened.close()
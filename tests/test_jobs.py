@@ -0,0 +1,75 @@
+# tests/test_jobs.py
+"""Job files: matrix expansion and per-job outputs; rows fan out to every job that found them."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import MemorySink
+from jobs import MultiJobPipeline, load_jobs
+from metrics import run_metrics
+from models import SearchConfig
+from pipeline import _DONE
+
+BASE = SearchConfig(role="ignored", country="ignored", pages=1)
+
+
+def _job_file(tmp_path, spec):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(spec))
+    return str(path)
+
+
+def test_matrix_and_listed_jobs(tmp_path):
+    path = _job_file(tmp_path, {
+        "defaults": {"pages": 3, "output_csv": str(tmp_path / "{role}_{country}.csv")},
+        "matrix": {"role": ["founder", "cto"], "country": ["united kingdom", "germany"]},
+        "jobs": [{"role": "designer", "country": "france", "pages": 5, "name": "designers-fr"}],
+    })
+    shared, jobs = load_jobs(path, BASE)
+
+    assert shared.pages == 3
+    assert sorted(jobs) == ["cto-germany", "cto-united-kingdom", "designers-fr",
+                            "founder-germany", "founder-united-kingdom"]
+    assert jobs["designers-fr"].pages == 5
+    assert jobs["cto-germany"].output_csv == str(tmp_path / "cto_germany.csv")
+
+
+def test_each_job_gets_its_own_output_by_default(tmp_path):
+    _, jobs = load_jobs(_job_file(tmp_path, {"matrix": {"role": ["founder", "cto"], "country": ["uk"]}}), BASE)
+    assert {j.output_csv for j in jobs.values()} == {"output/founder-uk.csv", "output/cto-uk.csv"}
+
+
+@pytest.mark.parametrize("spec, error", [
+    ({"defaults": {"output_csv": "same.csv"}, "matrix": {"role": ["a", "b"], "country": ["uk"]}}, "both write to"),
+    ({"jobs": [{"role": "a", "country": "uk"}, {"role": "a", "country": "uk"}]}, "Duplicate job name"),
+    ({"defaults": {"pages": 2}}, "defines no jobs"),
+])
+def test_bad_job_files(tmp_path, spec, error):
+    with pytest.raises(ValueError, match=error):
+        load_jobs(_job_file(tmp_path, spec), BASE)
+
+
+def test_rows_fan_out_to_every_job_that_found_them():
+    sinks = {"founders": MemorySink(), "ctos": MemorySink()}
+    workflow = SimpleNamespace(seen=None, progress=None, status=None)
+    pipeline = MultiJobPipeline(workflow, dict.fromkeys(sinks, BASE), sinks)
+    both, one, failed = (f"https://www.linkedin.com/in/{s}" for s in ("both", "one", "failed"))
+    pipeline._subscribers = {both: {"founders", "ctos"}, one: {"ctos"}, failed: {"founders"}}
+    pipeline._locks = {name: asyncio.Lock() for name in sinks}
+
+    async def run():
+        out_q = asyncio.Queue()
+        await out_q.put([{"url": both, "name": "Both"}, {"url": one, "name": "One"},
+                         {"url": failed, "name": "", "error": "timeout"}])
+        await out_q.put(_DONE)
+        await pipeline._save_stage(out_q)
+
+    with run_metrics():  # as in Workflow.run_jobs; keeps the process-wide counters clean
+        asyncio.run(run())
+
+    assert [r["url"] for r in sinks["founders"].rows] == [both]
+    assert [r["url"] for r in sinks["ctos"].rows] == [both, one]
+    assert pipeline.written == {"founders": 1, "ctos": 2}
+    assert pipeline._subscribers == {}  # nothing left in flight, failed rows included
@@ -0,0 +1,48 @@
+# tests/test_llm_cache.py
+"""LLM cache lookups in extract_rows."""
+from llm_cache import LLMCache, cache_key
+from models import SearchConfig
+from workflow import Workflow
+
+URL = "https://www.linkedin.com/in/jane-doe"
+LINES = ["Jane Doe", "Founder at Acme", "about", "x" * 60]
+
+
+def test_cache_hits_never_build_the_llm_client(tmp_path):
+    cfg = SearchConfig(role="founder", country="uk", fast_path=False, prompt_token_budget=0)
+    workflow = Workflow()
+    workflow.llm_cache = LLMCache(str(tmp_path / "llm.sqlite"))
+    prompt_id = workflow.prompts.EXTRACT_SYSTEM + workflow.prompts.extract_user("", [])
+    workflow.llm_cache.put_many({cache_key(cfg.llm_model, prompt_id, LINES): {"name": "Jane Doe", "role": "Founder"}})
+
+    out = workflow.extract_rows([{"url": URL, "lines": LINES}], cfg)
+
+    assert out == [{"name": "Jane Doe", "role": "Founder", "url": URL}]
+    assert workflow.llm is None  # langchain_google_genai was never imported
+    workflow.llm_cache.close()
+
+
+def test_hits_never_hold_the_write_lock(tmp_path):
+    """A hit in one connection must not block another connection's writes (shared cache file)."""
+    path = str(tmp_path / "llm.sqlite")
+    reader, writer = LLMCache(path), LLMCache(path)
+    writer.put_many({"old": {"name": "A"}, "hit": {"name": "B"}})
+
+    assert reader.get("hit") == {"name": "B"}
+    writer.put_many({"new": {"name": "C"}})  # used to raise "database is locked"
+
+    reader.put_many({})  # stores the pending touch
+    used = dict(writer._conn.execute("SELECT key, last_used FROM llm_cache").fetchall())
+    assert used["hit"] > used["old"]
+    reader.close()
+    writer.close()
+
+
+def test_lru_eviction_follows_hits_not_insertion(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.sqlite"), max_entries=2)
+    cache.put_many({"a": {"n": 1}})
+    cache.put_many({"b": {"n": 2}})
+    cache.get("a")
+    cache.put_many({"c": {"n": 3}})  # evicts b, the least recently used
+    assert cache.get("a") is not None and cache.get("b") is None
+    cache.close()
@@ -0,0 +1,40 @@
+# tests/test_metrics.py
+"""Each run records into its own metrics registry."""
+import asyncio
+import threading
+
+from engine import ScrapeEngine
+from metrics import METRICS, run_metrics
+
+
+class _Pool:
+    async def close(self):
+        pass
+
+
+def test_concurrent_runs_keep_their_own_counters():
+    engine = ScrapeEngine(pool=_Pool())
+    started = threading.Barrier(2)
+    reports = {}
+
+    async def scrape():
+        await asyncio.to_thread(METRICS.inc, "pages_fetched")  # engine loop, then a worker thread
+
+    @run_metrics()
+    def run(name, pages):
+        METRICS.inc("rows_written", pages)
+        started.wait()  # both runs are in progress from here on
+        for _ in range(pages):
+            engine.run(scrape())
+        started.wait()
+        reports[name] = (METRICS.counter("rows_written"), METRICS.counter("pages_fetched"))
+
+    threads = [threading.Thread(target=run, args=(name, n)) for name, n in (("a", 2), ("b", 5))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.close()
+
+    assert reports == {"a": (2, 2), "b": (5, 5)}
+    assert METRICS.counter("rows_written") == 0  # outside any run: the process-wide registry
@@ -0,0 +1,51 @@
+# tests/test_save_rows.py
+"""Failed scrapes and empty extractions are never written or marked as seen."""
+from background import RunStatus
+from models import SearchConfig
+from seen_index import SeenIndex, savable_rows
+from workflow import Workflow
+
+URL = "https://www.linkedin.com/in/jane-doe"
+EMPTY = "https://www.linkedin.com/in/no-text"
+
+
+def test_extract_rows_keeps_the_scrape_error():
+    rows = [{"url": URL, "lines": [], "error": "timeout"}, {"url": EMPTY, "lines": []}]
+    out = Workflow(llm=object()).extract_rows(rows, SearchConfig(role="founder", country="uk"))
+    assert [r["error"] for r in out] == ["timeout", "no profile text"]
+    assert savable_rows(out) == []
+
+
+def test_save_batch_skips_errored_and_empty_rows(tmp_path, fake_sink):
+    workflow = Workflow(llm=object())
+    workflow.sink = fake_sink
+    workflow.seen = SeenIndex(str(tmp_path / "seen.sqlite"))
+    good = {"url": URL, "name": "Jane Doe", "role": "", "email": "", "about": ""}
+    state = {"batch_results": [
+        good,
+        {"url": EMPTY, "name": "", "role": "", "email": "", "about": "", "error": "timeout"},
+        {"url": "https://www.linkedin.com/in/blank", "name": "", "role": "", "email": "", "about": ""},
+    ]}
+    workflow._node_save_batch(state)
+
+    assert workflow.sink.rows == [good]
+    assert workflow.seen.fresh([URL, EMPTY]) == {URL}
+    workflow.seen.close()
+
+
+def test_save_batch_counts_a_batch_with_nothing_savable(fake_sink):
+    workflow = Workflow(llm=object())
+    workflow.sink = fake_sink
+    workflow.status = RunStatus()
+    workflow._node_save_batch({"batch_results": [{"url": EMPTY, "name": "", "error": "timeout"}]})
+
+    snap = workflow.status.snapshot()
+    assert (snap["batches_done"], snap["rows_written"]) == (1, 0)
+
+
+def test_resume_totals_count_the_batches_left():
+    cfg = SearchConfig(role="founder", country="uk", batch_size=2)
+    values = {"config": cfg, "batches": [[URL, EMPTY], [URL]], "current_batch": [EMPTY, URL]}
+    assert Workflow._resume_totals(values, "next_batch") == (3, 2)
+    assert Workflow._resume_totals(values, "scrape_batch") == (5, 3)  # stopped part-way through a batch
+    assert Workflow._resume_totals({"config": cfg, "frontier_cursor": 4, "frontier_left": 5}, "next_batch") == (5, 3)
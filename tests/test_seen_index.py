@@ -0,0 +1,48 @@
+# tests/test_seen_index.py
+"""The canonical profile URL every store keys on, and the seen index's TTL."""
+import pytest
+
+from seen_index import SeenIndex, canonical_profile_url
+
+CANON = "https://www.linkedin.com/in/jane-doe"
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.linkedin.com/in/jane-doe",
+    "https://uk.linkedin.com/in/jane-doe",        # locale subdomain
+    "http://linkedin.com/in/jane-doe",
+    "https://www.linkedin.com/in/jane-doe/",      # trailing slash
+    "https://www.linkedin.com/in/Jane-Doe",       # case
+    "https://www.linkedin.com/in/jane-doe?trk=public_profile&originalSubdomain=uk",
+    "https://www.linkedin.com/in/jane-doe#experience",
+    "https://www.linkedin.com/in/jane%2Ddoe",      # percent-encoding
+    "https://www.linkedin.com/in/jane-doe/details/experience/",
+    "www.linkedin.com/in/jane-doe",               # no scheme
+    "  https://www.linkedin.com/in/jane-doe  ",
+])
+def test_profile_url_variants_fold_to_one_key(url):
+    assert canonical_profile_url(url) == CANON
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.linkedin.com/company/in/acme",
+    "https://www.linkedin.com/pub/dir/in/jane",
+    "https://www.linkedin.com/jobs/view/123",
+    "https://example.com/in/jane-doe",
+    "https://notlinkedin.com/in/jane-doe",
+])
+def test_non_profile_urls_are_left_alone(url):
+    assert canonical_profile_url(url) == url
+
+
+def test_empty_url():
+    assert canonical_profile_url("") == "" and canonical_profile_url(None) == ""
+
+
+def test_fresh_matches_any_variant_until_the_ttl(tmp_path):
+    index = SeenIndex(str(tmp_path / "seen.sqlite"))
+    index.mark(["https://uk.linkedin.com/in/Jane-Doe/"])
+    assert index.fresh([CANON, "https://www.linkedin.com/in/other"]) == {CANON}
+    index.ttl_seconds = -1  # everything is stale
+    assert index.fresh([CANON]) == set()
+    index.close()
@@ -0,0 +1,77 @@
+# tests/test_serp.py
+"""SERP pagination stops at Google's last page and never requests the offsets past it."""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from snapshots import SnapshotStore
+from tools import build_serp_url, iter_linkedin_urls_async, parse_serp, serp_end_reason
+
+QUERY = 'site:linkedin.com/in "founder"'
+
+
+def serp(slugs, stats="", notice="", next_page=True):
+    links = "".join(f'<div class="g"><a href="https://www.linkedin.com/in/{s}">{s}</a></div>' for s in slugs)
+    pager = '<div role="navigation"><table><tr><td>1</td></tr></table>'
+    pager += '<a id="pnnext" href="/search?start=10">Next</a></div>' if next_page else "</div>"
+    return f'<div id="result-stats">{stats}</div><div id="topstuff">{notice}</div>{links}{pager}'
+
+
+@pytest.mark.parametrize("html, start, reason", [
+    (serp(["a"], stats="About 2,340 results"), 0, ""),
+    (serp(["a"], stats="About 15 results"), 10, "only 15 results"),
+    (serp(["a"], next_page=False), 0, "no next page"),
+    (serp([], notice="Your search did not match any documents."), 0, "end-of-results notice"),
+])
+def test_serp_end_reason(html, start, reason):
+    assert serp_end_reason(parse_serp(html)[1], start, 10) == reason
+
+
+class _Pool:
+    """BrowserPool stand-in; every page in these tests comes from a snapshot."""
+
+    @asynccontextmanager
+    async def page(self, kind):
+        yield None
+
+
+class _Snapshots(SnapshotStore):
+    def __init__(self, path):
+        super().__init__(path)
+        self.asked = []
+
+    def get(self, url, max_age=None):
+        self.asked.append(url)
+        return super().get(url, max_age)
+
+
+def _collect(snapshots, pages):
+    async def run():
+        out = []
+        async for urls in iter_linkedin_urls_async(QUERY, pages, 10, _Pool(), snapshots=snapshots):
+            out += urls
+        return out
+    return asyncio.run(run())
+
+
+def test_stops_at_the_result_count(tmp_path):
+    snapshots = _Snapshots(str(tmp_path / "snap.sqlite"))
+    snapshots.put(build_serp_url(QUERY, 0), serp(["a", "b"], stats="About 15 results"), kind="serp")
+    snapshots.put(build_serp_url(QUERY, 10), serp(["c"], stats="About 15 results"), kind="serp")
+
+    urls = _collect(snapshots, pages=5)
+
+    assert [u.rsplit("/", 1)[-1] for u in urls] == ["a", "b", "c"]
+    assert snapshots.asked == [build_serp_url(QUERY, 0), build_serp_url(QUERY, 10)]
+    snapshots.close()
+
+
+def test_stops_at_a_page_with_nothing_new(tmp_path):
+    snapshots = _Snapshots(str(tmp_path / "snap.sqlite"))
+    for start in (0, 10, 20):
+        snapshots.put(build_serp_url(QUERY, start), serp(["a", "b"]), kind="serp")
+
+    assert len(_collect(snapshots, pages=3)) == 2
+    assert len(snapshots.asked) == 2
+    snapshots.close()
@@ -0,0 +1,67 @@
+# tests/test_sinks.py
+"""Output sinks: dedupe by URL across reopens, upserts, CSV header rotation and the sidecar URL index."""
+import pytest
+
+from sinks import CsvSink, SqliteSink, default_output_path, open_sink
+
+A = {"url": "https://www.linkedin.com/in/a", "name": "A", "role": "Founder", "email": "", "about": ""}
+B = {"url": "https://www.linkedin.com/in/b", "name": "B", "role": "CTO", "email": "b@x.io", "about": ""}
+
+
+def test_csv_dedupes_across_reopens(tmp_path):
+    path = str(tmp_path / "out.csv")
+    with CsvSink(path) as sink:
+        assert sink.write_rows([A, A]) == 1
+    with CsvSink(path) as sink:
+        assert A["url"] in sink
+        assert sink.write_rows([A, B]) == 1
+    assert (tmp_path / "out.csv").read_text().count("\n") == 3  # header + 2 rows
+
+
+def test_csv_with_an_old_header_moves_to_v2(tmp_path):
+    old = tmp_path / "out.csv"
+    old.write_text("name,url\nA,https://www.linkedin.com/in/a\n")
+    with CsvSink(str(old)) as sink:
+        sink.write_rows([B])
+    assert sink.path == tmp_path / "out_v2.csv"
+    assert old.read_text() == "name,url\nA,https://www.linkedin.com/in/a\n"
+
+
+def test_stale_url_index_is_rebuilt(tmp_path):
+    path = tmp_path / "out.csv"
+    with CsvSink(str(path)) as sink:
+        sink.write_rows([A])
+    index = tmp_path / "out.csv.urls.idx"
+    assert index.read_text().splitlines() == [A["url"], f"#size={path.stat().st_size}"]
+
+    with path.open("a") as f:  # rows appended behind the sidecar's back
+        f.write(f"B,CTO,,,{B['url']}\n")
+    with CsvSink(str(path)) as sink:
+        assert B["url"] in sink
+        assert sink.write_rows([B]) == 0
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "sqlite"])
+def test_streaming_sinks_round_trip(tmp_path, fmt):
+    path = default_output_path(fmt, str(tmp_path / "out.csv"))
+    with open_sink(fmt, path) as sink:
+        assert sink.write_rows([A, B, A]) == 2
+        sink.flush()
+    with open_sink(fmt, path) as sink:
+        assert A["url"] in sink and B["url"] in sink
+        assert sink.write_rows([A]) == 0
+        assert sorted(r["url"] for r in sink.preview()) == [A["url"], B["url"]]
+
+
+def test_sqlite_sink_upserts_a_known_url(tmp_path):
+    path = str(tmp_path / "out.sqlite")
+    with SqliteSink(path) as sink:
+        sink.write_rows([A])
+    with SqliteSink(path) as sink:
+        assert sink.write_rows([{**A, "email": "a@x.io"}]) == 0  # not new, but refreshed
+        assert sink.preview() == [{**A, "email": "a@x.io"}]
+
+
+def test_unknown_output_format():
+    with pytest.raises(ValueError, match="Unknown output_format"):
+        open_sink("xml", "out.xml")
@@ -0,0 +1,16 @@
+# tests/test_startup.py
+"""Startup import hygiene: heavy dependencies load on first use, never at import (see bench/startup_bench.py)."""
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "bench"))
+
+from startup_bench import CHECK_HEAVY  # noqa: E402
+
+
+def test_no_heavy_module_is_imported_at_startup():
+    proc = subprocess.run([sys.executable, "-c", CHECK_HEAVY], cwd=ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "", f"imported at startup: {proc.stdout.strip()}"
@@ -0,0 +1,134 @@
+# tests/test_workqueue.py
+"""Lease, redelivery and ack rules of the SQLite work queue, and the coordinator's drain loop."""
+import time
+
+import pytest
+
+from workqueue import SqliteWorkQueue, open_queue
+
+URL = "https://www.linkedin.com/in/jane-doe"
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = SqliteWorkQueue(str(tmp_path / "queue.sqlite"), max_attempts=2)
+    yield q
+    q.close()
+
+
+def test_push_dedupes_canonical_urls(queue):
+    assert queue.push("r", [URL, "https://uk.linkedin.com/in/Jane-Doe/", ""]) == 1
+    assert queue.push("r", [URL]) == 0
+    assert queue.counts("r")["pending"] == 1
+
+
+def test_an_item_is_leased_to_one_worker_at_a_time(queue):
+    queue.push("r", [URL])
+    assert len(queue.lease("w1", 10, 60)) == 1
+    assert queue.lease("w2", 10, 60) == []
+    assert queue.counts("r")["leased"] == 1
+
+
+def test_expired_lease_is_redelivered_and_stale_ack_refused(queue):
+    queue.push("r", [URL])
+    (first,) = queue.lease("w1", 1, 0.01)
+    time.sleep(0.05)
+    (second,) = queue.lease("w2", 1, 60)
+    assert second.url == first.url and second.token != first.token
+    assert not queue.ack(first, {"url": URL, "name": "stale"})
+    assert queue.ack(second, {"url": URL, "name": "Jane"})
+    assert [r["name"] for r in queue.results("r")] == ["Jane"]
+
+
+def test_extend_keeps_the_lease(queue):
+    queue.push("r", [URL])
+    (lease,) = queue.lease("w1", 1, 0.05)
+    queue.extend([lease], 60)
+    time.sleep(0.1)
+    assert queue.lease("w2", 1, 60) == []
+    assert queue.ack(lease, {"url": URL})
+
+
+def test_fail_retries_until_max_attempts(queue):
+    queue.push("r", [URL])
+    queue.fail(queue.lease("w1", 1, 60)[0], "timeout")
+    assert queue.counts("r")["pending"] == 1
+    queue.fail(queue.lease("w1", 1, 60)[0], "timeout")
+    assert queue.counts("r")["failed"] == 1
+    assert queue.lease("w1", 1, 60) == []
+
+
+def test_expired_lease_on_last_attempt_fails(queue):
+    queue.push("r", [URL])
+    for _ in range(2):
+        queue.lease("w1", 1, 0.01)
+        time.sleep(0.05)
+    assert queue.lease("w1", 1, 60) == []
+    assert queue.counts("r")["failed"] == 1
+
+
+def test_mark_saved_and_idle(queue):
+    queue.push("r", [URL])
+    assert not queue.idle()  # still searching
+    queue.finish_search("r")
+    lease = queue.lease("w1", 1, 60)[0]
+    assert not queue.idle()
+    queue.ack(lease, {"url": URL})
+    queue.mark_saved("r", [URL])
+    assert queue.results("r") == []
+    assert queue.counts("r")["saved"] == 1
+    assert queue.idle()
+
+
+def test_a_crashed_coordinator_does_not_keep_workers_up(queue):
+    queue.push("crashed", [])  # pushed, never reached finish_search
+    assert not queue.idle()
+    time.sleep(0.05)
+    assert queue.idle(stale_after=0.01)
+
+
+def test_counts_gives_up_on_spent_leases_without_workers(queue):
+    queue.push("r", [URL])
+    queue.finish_search("r")
+    for _ in range(2):
+        queue.lease("w1", 1, 0.01)  # the worker dies holding the lease
+        time.sleep(0.05)
+    # no worker calls lease() again; the coordinator's poll still sees the item fail
+    assert queue.counts("r") == {"pending": 0, "leased": 0, "done": 0, "saved": 0, "failed": 1}
+
+
+def test_open_queue_urls(tmp_path):
+    with open_queue(f"sqlite:///{tmp_path}/q.sqlite") as q:
+        assert isinstance(q, SqliteWorkQueue)
+    with pytest.raises(ValueError):
+        open_queue("redis://localhost")
+
+
+def test_collect_saves_a_row_acked_after_an_empty_results_call(tmp_path, fake_sink):
+    """The worker's ack lands between the coordinator's results() and counts() calls."""
+    from models import SearchConfig
+    from workflow import Workflow
+
+    class RacyQueue(SqliteWorkQueue):
+        lease_to_ack = None
+
+        def results(self, run_id, limit=100):
+            rows = super().results(run_id, limit)
+            if not rows and self.lease_to_ack is not None:
+                self.ack(self.lease_to_ack, {"url": URL, "name": "Jane"})
+                self.lease_to_ack = None
+            return rows
+
+    queue = RacyQueue(str(tmp_path / "queue.sqlite"))
+    queue.push("r", [URL])
+    queue.finish_search("r")
+    queue.lease_to_ack = queue.lease("w1", 1, 60)[0]
+
+    workflow = Workflow(llm=object())
+    workflow.sink = fake_sink
+    config = SearchConfig(role="founder", country="uk", worker_poll_s=0)
+    workflow._collect(queue, config, "r")
+
+    assert [r["name"] for r in workflow.sink.rows] == ["Jane"]
+    assert queue.counts("r")["saved"] == 1
+    queue.close()
@@ -1,10 +1,7 @@
 # tools.py
-import csv
+import logging
 import re
-import time
-from pathlib import Path
 from typing import List, Dict, Set
-from bs4 import BeautifulSoup
 
 import sys
 import asyncio
@@ -12,226 +9,593 @@ import asyncio
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-import time
 import random
-from typing import List, Set
-from urllib.parse import quote_plus, urljoin, urlparse, parse_qs
-from playwright.sync_api import sync_playwright
+from urllib.parse import quote_plus, urlparse, parse_qs
+from contextlib import contextmanager
+from typing import Callable, Optional, Tuple
 
-def google_collect_linkedin_urls(query_base: str, pages: int = 3, per_page: int = 10, browser: str = "chromium") -> List[str]:
+from browser_pool import BrowserPool
+from network import RequestFilter, BLOCKED_RESOURCE_TYPES, TRACKER_HOSTS
+from engine import ScrapeEngine
+from ratelimit import RateLimiter, limited, make_limiter
+from waits import WaitStrategy, default_waits, wait_ready
+from snapshots import SnapshotStore
+from seen_index import canonical_profile_url
+from profile_text import PROFILE_TEXT_JS, extract_profile_text, js_args as profile_js_args
+from sinks import CsvSink
+from metrics import METRICS, timed
+
+log = logging.getLogger(__name__)
+
+# Realistic user agent / viewport for Google SERPs
+SERP_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+SERP_VIEWPORT = {'width': 1920, 'height': 1080}
+
+# Stealth measures applied to every SERP page
+SERP_HOST = "www.google.com"
+PROFILE_HOST = "www.linkedin.com"
+
+# Signs that a host is rate-limiting or challenging us rather than serving the page
+BLOCK_STATUSES = {403, 429, 999}  # 999 is LinkedIn's "request denied"
+BLOCK_URL_MARKERS = {
+    "/sorry/": "captcha",                 # Google's unusual-traffic interstitial
+    "/checkpoint/challenge": "captcha",
+    "/authwall": "authwall",
+    "/uas/login": "authwall",
+    "linkedin.com/login": "authwall",
+}
+BLOCK_TEXT_MARKERS = ("captcha", "unusual traffic", "not a robot", "quick security check")
+BLOCK_TEXT_LINES = 20  # a profile's challenge text sits at the top; deeper lines are the person's own words
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined,
+    });
+"""
+
+
+def build_browser_pool(
+    browser: str = "chromium",
+    storage_state: str = "linkedin_auth.json",
+    headless: bool = False,
+    size: int = 2,
+    max_page_uses: int = 25,
+    block_resources: bool = True,
+    allow_urls: Optional[List[str]] = None,
+    http_cache_dir: Optional[str] = None,
+    upstreams: Optional[Dict[str, str]] = None,
+) -> BrowserPool:
+    """Browser pool with the two contexts the pipeline needs: anonymous "serp" and logged-in "profile"."""
+    request_filter = None
+    if block_resources or http_cache_dir or upstreams:
+        request_filter = RequestFilter(
+            block_types=BLOCKED_RESOURCE_TYPES if block_resources else (),
+            block_hosts=TRACKER_HOSTS if block_resources else (),
+            allow=allow_urls or (),
+            cache_dir=http_cache_dir,
+            upstreams=upstreams,
+        )
+    pool = BrowserPool(
+        browser=browser,
+        headless=headless,
+        size=size,
+        max_page_uses=max_page_uses,
+        request_filter=request_filter,
+    )
+    pool.add_context("serp", init_script=STEALTH_SCRIPT, user_agent=SERP_USER_AGENT, viewport=SERP_VIEWPORT)
+    pool.add_context("profile", storage_state=storage_state)
+    return pool
+
+
+def build_engine(
+    browser: str = "chromium",
+    storage_state: str = "linkedin_auth.json",
+    headless: bool = False,
+    pool_size: int = 2,
+    max_page_uses: int = 25,
+    concurrency: int = 4,
+    min_interval: float = 1.0,
+    serp_concurrency: int = 1,
+    serp_min_interval: float = 2.0,
+    serp_jitter: float = 3.0,
+    block_resources: bool = True,
+    allow_urls: Optional[List[str]] = None,
+    http_cache_dir: Optional[str] = None,
+    adaptive_waits: bool = True,
+    upstreams: Optional[Dict[str, str]] = None,
+    adaptive_rate: bool = True,
+    max_rate: float = 4.0,
+    serp_max_rate: float = 1.0,
+) -> ScrapeEngine:
+    """Async scraping engine over a pool with enough pages per context for both concurrencies."""
+    pool = build_browser_pool(
+        browser=browser,
+        storage_state=storage_state,
+        headless=headless,
+        size=max(pool_size, concurrency, serp_concurrency),
+        max_page_uses=max_page_uses,
+        block_resources=block_resources,
+        allow_urls=allow_urls,
+        http_cache_dir=http_cache_dir,
+        upstreams=upstreams,
+    )
+    return ScrapeEngine(
+        pool,
+        concurrency=concurrency,
+        limiter=make_limiter(PROFILE_HOST, min_interval, adaptive=adaptive_rate,
+                             max_rate=max_rate, max_concurrency=concurrency),
+        waits=default_waits(adaptive=adaptive_waits),
+        serp_concurrency=serp_concurrency,
+        serp_limiter=make_limiter(SERP_HOST, serp_min_interval, jitter=serp_jitter, adaptive=adaptive_rate,
+                                  max_rate=serp_max_rate, max_concurrency=serp_concurrency),
+    )
+
+
+@contextmanager
+def _borrowed_engine(engine: Optional[ScrapeEngine], **engine_kwargs):
+    """Yield `engine` as-is, or a throwaway engine (closed on exit) when none was given."""
+    if engine is not None:
+        yield engine
+        return
+    own = build_engine(**engine_kwargs)
+    try:
+        yield own.start()
+    finally:
+        own.close()
+
+
+def build_serp_url(query_base: str, start: int) -> str:
+    return f"https://www.google.com/search?q={quote_plus(query_base)}&start={start}"
+
+
+# Google result links, old per-selector fallbacks merged into one query
+SERP_LINK_SELECTOR = ", ".join([
+    "a[href*='linkedin.com/in/']",  # Direct LinkedIn links
+    "div.g a[href]",                # Standard Google result links
+    "h3 a[href]",                   # Title links
+    "a[href^='/url?']",             # Google redirect URLs
+    "a[data-ved]",                  # Google tracked links
+    "a:has(h3)",                    # Links containing h3 elements
+])
+SERP_NEXT_SELECTOR = "#pnnext, a[aria-label='Next page']"
+SERP_PAGER_SELECTOR = "[role='navigation'] table, #foot table"
+# Notices Google shows on the last page (or instead of results)
+SERP_END_MARKERS = ("did not match any documents", "omitted some entries very similar", "no results found for")
+
+# One round-trip per SERP: every result href plus what's needed to tell the last page
+SERP_HARVEST_JS = """
+({links, next, pager}) => {
+    const text = (sel) => { const el = document.querySelector(sel); return el ? el.textContent : ""; };
+    return {
+        hrefs: Array.from(document.querySelectorAll(links), a => a.getAttribute("href")).filter(Boolean),
+        stats: text("#result-stats"),
+        hasNext: !!document.querySelector(next),
+        hasPager: !!document.querySelector(pager),
+        notice: text("#topstuff") + " " + text("#ofr"),
+    };
+}
+"""
+_RESULT_COUNT_RE = re.compile(r"(\d[\d,.\u00a0\u202f ]*)\s+results?", re.I)
+
+
+def _clean_google_result_url(url: str) -> str:
+    """Clean and normalize LinkedIn URLs (direct or behind a Google /url? redirect)"""
+    if not url:
+        return ""
+
+    # Handle Google redirect URLs
+    if url.startswith('/url?'):
+        parsed = urlparse(f"https://google.com{url}")
+        query_params = parse_qs(parsed.query)
+        if 'url' in query_params:
+            url = query_params['url'][0]
+        elif 'q' in query_params:
+            url = query_params['q'][0]
+
+    # One canonical form per profile (locale host, case, encoding, slashes folded)
+    if "linkedin.com/in/" in url:
+        return canonical_profile_url(url)
+
+    return url
+
+
+def _is_linkedin_href(href: str) -> bool:
+    # Check if it's a LinkedIn URL (direct or through redirect)
+    return ("linkedin.com/in/" in href or
+            (href.startswith('/url?') and 'linkedin.com%2Fin%2F' in href))
+
+
+def harvest_linkedin_urls(hrefs: List[str]) -> List[str]:
+    """Clean a page's worth of hrefs at once: LinkedIn /in/ URLs only, deduped, in page order."""
+    found: Dict[str, None] = {}
+    for href in hrefs:
+        if href and _is_linkedin_href(href):
+            cleaned = _clean_google_result_url(href)
+            if cleaned and "linkedin.com/in/" in cleaned:
+                found.setdefault(cleaned)
+    return list(found)
+
+
+def parse_serp_html(html: str) -> List[str]:
+    """LinkedIn profile URLs from saved SERP HTML (the offline twin of the live harvest)."""
+    return parse_serp(html)[0]
+
+
+@timed("tool", tool="parse_serp")
+def parse_serp(html: str) -> Tuple[List[str], Dict]:
+    """(LinkedIn URLs, end-of-results info) from saved SERP HTML, same shape as SERP_HARVEST_JS."""
+    from bs4 import BeautifulSoup  # offline path only; live pages are harvested in the browser
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    def text(sel: str) -> str:
+        node = soup.select_one(sel)
+        return node.get_text(" ", strip=True) if node is not None else ""
+
+    info = {
+        "stats": text("#result-stats"),
+        "hasNext": soup.select_one(SERP_NEXT_SELECTOR) is not None,
+        "hasPager": soup.select_one(SERP_PAGER_SELECTOR) is not None,
+        "notice": text("#topstuff") + " " + text("#ofr"),
+    }
+    return harvest_linkedin_urls([a["href"] for a in soup.find_all("a", href=True)]), info
+
+
+def serp_end_reason(info: Dict, start: int, per_page: int) -> str:
+    """Why the SERP at offset `start` is the last one worth fetching ("" if it isn't)."""
+    notice = (info.get("notice") or "").lower()
+    if any(marker in notice for marker in SERP_END_MARKERS):
+        return "end-of-results notice"
+    if info.get("hasPager") and not info.get("hasNext"):
+        return "no next page"
+    m = _RESULT_COUNT_RE.search(info.get("stats") or "")
+    if m:
+        total = int(re.sub(r"\D", "", m.group(1)) or 0)
+        if start + per_page >= total:
+            return f"only {total} results"
+    return ""
+
+
+def google_collect_linkedin_urls(
+    query_base: str,
+    pages: int = 3,
+    per_page: int = 10,
+    browser: str = "chromium",
+    engine: Optional[ScrapeEngine] = None,
+    snapshots: Optional[SnapshotStore] = None,
+) -> List[str]:
     """
     Use Playwright to fetch Google SERPs and collect LinkedIn /in/ URLs with improved reliability.
+    Runs on `engine` ("serp" context, `serp_concurrency` pages in parallel under its
+    `serp_limiter`); a temporary headless engine is used if none is given.
+    Fresh SERP snapshots in `snapshots` are parsed instead of re-fetched.
+    """
+    with _borrowed_engine(engine, browser=browser, headless=True) as eng:
+        return eng.run(google_collect_linkedin_urls_async(
+            query_base, pages, per_page, eng.pool, wait=eng.waits.get("serp"), snapshots=snapshots,
+            limiter=eng.serp_limiter, concurrency=eng.serp_concurrency,
+        ))
+
+
+def collect_urls_from_snapshots(query_base: str, pages: int, per_page: int, snapshots: SnapshotStore) -> List[str]:
+    """
+    Offline URL collection: parse stored SERPs for this query (any age). If none were
+    stored for it, fall back to every stored profile.
+    """
+    urls: List[str] = []
+    found_serp = False
+    for page_index in range(pages):
+        html = snapshots.get(build_serp_url(query_base, page_index * per_page), max_age=float("inf"))
+        if html is None:
+            continue
+        found_serp = True
+        urls.extend(u for u in parse_serp_html(html) if u not in urls)
+    if not found_serp:
+        log.warning("⚠️  No SERP snapshots for this query; using every stored profile")
+        return sorted({canonical_profile_url(u) for u in snapshots.urls(kind="profile")})
+    return urls
+
+
+async def google_collect_linkedin_urls_async(
+    query_base: str,
+    pages: int,
+    per_page: int,
+    pool: BrowserPool,
+    wait: Optional[WaitStrategy] = None,
+    snapshots: Optional[SnapshotStore] = None,
+    limiter: Optional[RateLimiter] = None,
+    concurrency: int = 1,
+) -> List[str]:
+    """Async body of `google_collect_linkedin_urls`; pages are borrowed from `pool`."""
+    urls: List[str] = []
+    async for new in iter_linkedin_urls_async(
+        query_base, pages, per_page, pool, wait=wait, snapshots=snapshots, limiter=limiter, concurrency=concurrency,
+    ):
+        urls.extend(new)
+
+    log.info(f"🎉 Collected {len(urls)} unique LinkedIn URLs")
+    return urls
+
+
+async def iter_linkedin_urls_async(
+    query_base: str,
+    pages: int,
+    per_page: int,
+    pool: BrowserPool,
+    wait: Optional[WaitStrategy] = None,
+    snapshots: Optional[SnapshotStore] = None,
+    limiter: Optional[RateLimiter] = None,
+    concurrency: int = 1,
+    dedupe: Optional[Callable[[List[str]], List[str]]] = None,
+):
+    """
+    Async generator yielding the LinkedIn URLs each SERP page adds, as soon as that page is done.
+    Up to `concurrency` pages fetch different start= offsets at once, paced by `limiter`.
+    Pagination stops at the first page that adds nothing new or looks like Google's last
+    page; offsets past it are never requested. `dedupe` (run off the loop) records a page's
+    URLs and returns the ones the search hadn't found yet; by default an in-memory set,
+    which large runs replace with the on-disk frontier so nothing grows with the search.
     """
     urls: Set[str] = set()
 
-    def build_url(start: int) -> str:
-        return f"https://www.google.com/search?q={quote_plus(query_base)}&start={start}"
-
-    def _clean_linkedin_url(url: str) -> str:
-        """Clean and normalize LinkedIn URLs"""
-        if not url:
-            return ""
-        
-        # Handle Google redirect URLs
-        if url.startswith('/url?'):
-            parsed = urlparse(f"https://google.com{url}")
-            query_params = parse_qs(parsed.query)
-            if 'url' in query_params:
-                url = query_params['url'][0]
-            elif 'q' in query_params:
-                url = query_params['q'][0]
-        
-        # Clean the LinkedIn URL
-        if "linkedin.com/in/" in url:
-            # Extract just the LinkedIn profile part
-            start_idx = url.find("linkedin.com/in/")
-            if start_idx != -1:
-                linkedin_part = url[start_idx:]
-                # Remove any trailing parameters or fragments
-                linkedin_part = linkedin_part.split('?')[0].split('#')[0]
-                return f"https://{linkedin_part}"
-        
-        return url
-
-    with sync_playwright() as p:
-        # Use more realistic browser configuration
-        browser_obj = getattr(p, browser)
-        b = browser_obj.launch(
-            headless=True,
-            args=[
-                '--no-sandbox',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor'
-            ]
-        )
-        
-        # Set realistic user agent and viewport
-        ctx = b.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080}
-        )
-        
-        page = ctx.new_page()
-        
-        # Add stealth measures
-        page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined,
-            });
-        """)
-
-        for page_index in range(pages):
-            start = page_index * per_page
-            search_url = build_url(start)
-            
-            print(f"🔍 Fetching page {page_index + 1}/{pages}: {search_url}")
-            
+    def remember(found: List[str]) -> List[str]:
+        new = sorted(set(found) - urls)
+        urls.update(new)
+        return new
+
+    dedupe = dedupe or remember
+    results: asyncio.Queue = asyncio.Queue()
+    done = object()
+    cursor = {"next": 0, "stop_at": pages}
+
+    async def worker() -> None:
+        try:
+            async with pool.page("serp") as page:
+                while cursor["next"] < cursor["stop_at"]:
+                    page_index = cursor["next"]
+                    cursor["next"] += 1
+                    start = page_index * per_page
+                    search_url = build_serp_url(query_base, start)
+
+                    cached = None
+                    if snapshots is not None:
+                        cached = await asyncio.to_thread(snapshots.get, search_url)
+                    if cached is not None:
+                        found, info = await asyncio.to_thread(parse_serp, cached)
+                        METRICS.inc("snapshot_hits", kind="serp")
+                        log.info(f"📦 Page {page_index + 1}/{pages} from snapshot: {len(found)} LinkedIn URLs")
+                    else:
+                        fetched = await _fetch_serp_page(
+                            page, search_url, page_index, pages, wait=wait, snapshots=snapshots, limiter=limiter,
+                        )
+                        if fetched is None:
+                            continue  # navigation failed; not evidence that results ran out
+                        found, info = fetched
+
+                    new = await asyncio.to_thread(dedupe, sorted(set(found)))
+                    METRICS.inc("urls_found", len(new))
+                    reason = serp_end_reason(info, start, per_page) or ("" if new else "no new LinkedIn URLs")
+                    if reason and page_index + 1 < cursor["stop_at"]:
+                        cursor["stop_at"] = page_index + 1
+                        log.info(f"🛑 Stopping after page {page_index + 1}/{pages}: {reason}")
+                    if new:
+                        await results.put(new)
+        finally:
+            await results.put(done)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, pages)))]
+    try:
+        running = len(workers)
+        while running:
+            item = await results.get()
+            if item is done:
+                running -= 1
+            else:
+                yield item
+        await asyncio.gather(*workers)  # surface worker errors
+    finally:
+        for t in workers:
+            t.cancel()
+
+
+@timed("tool", tool="fetch_serp_page")
+async def _fetch_serp_page(
+    page,
+    search_url: str,
+    page_index: int,
+    pages: int,
+    wait: Optional[WaitStrategy] = None,
+    snapshots: Optional[SnapshotStore] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> Optional[Tuple[List[str], Dict]]:
+    """
+    Load one live SERP into `page`; returns (LinkedIn URLs, end-of-results info), or
+    None if the page couldn't be loaded.
+    """
+    log.info(f"🔍 Fetching page {page_index + 1}/{pages}: {search_url}")
+
+    try:
+        # Navigate with retry logic; each attempt goes through the limiter, which backs
+        # off on errors and block responses (a flat 2s pause without one)
+        max_retries = 3
+        for retry in range(max_retries):
             try:
-                # Navigate with retry logic
-                max_retries = 3
-                for retry in range(max_retries):
-                    try:
-                        response = page.goto(search_url, timeout=30000, wait_until="domcontentloaded")
-                        if response and response.status == 200:
-                            break
-                        print(f"⚠️  Response status: {response.status if response else 'None'}, retrying...")
-                    except Exception as e:
-                        print(f"⚠️  Navigation error (retry {retry + 1}): {e}")
-                        if retry == max_retries - 1:
-                            raise
-                        time.sleep(2)
-                
-                # Wait for content to load
-                page.wait_for_timeout(2000)
-                
-                # Try multiple selectors for Google results
-                selectors_to_try = [
-                    "a[href*='linkedin.com/in/']",  # Direct LinkedIn links
-                    "div.g a[href]",                # Standard Google result links
-                    "h3 a[href]",                   # Title links
-                    "a[href^='/url?']",             # Google redirect URLs
-                    "a[data-ved]",                  # Google tracked links
-                    "a:has(h3)",                    # Links containing h3 elements
-                ]
-                
-                found_links = False
-                for selector in selectors_to_try:
-                    try:
-                        anchors = page.locator(selector)
-                        count = anchors.count()
-                        
-                        if count > 0:
-                            print(f"✅ Found {count} links with selector: {selector}")
-                            found_links = True
-                            
-                            for i in range(count):
-                                try:
-                                    href = anchors.nth(i).get_attribute("href")
-                                    if href:
-                                        print(f"🔗 Checking link {i+1}/{count}: {href[:100]}...")
-                                        
-                                        # Check if it's a LinkedIn URL (direct or through redirect)
-                                        if ("linkedin.com/in/" in href or 
-                                            (href.startswith('/url?') and 'linkedin.com%2Fin%2F' in href)):
-                                            
-                                            cleaned_url = _clean_linkedin_url(href)
-                                            if cleaned_url and "linkedin.com/in/" in cleaned_url:
-                                                urls.add(cleaned_url)
-                                                print(f"✅ Added LinkedIn URL: {cleaned_url}")
-                                
-                                except Exception as e:
-                                    print(f"⚠️  Error processing link {i}: {e}")
-                                    continue
-                            
-                            # If we found LinkedIn links with this selector, we can break
-                            if any("linkedin.com/in/" in url for url in urls):
-                                break
-                                
-                    except Exception as e:
-                        print(f"⚠️  Error with selector '{selector}': {e}")
-                        continue
-                
-                if not found_links:
-                    print("⚠️  No links found with any selector. Page might be blocked or structure changed.")
-                    
-                    # Debug: Save page content for inspection
-                    if page_index == 0:  # Only for first page to avoid spam
-                        content = page.content()
-                        print(f"📄 Page title: {page.title()}")
-                        print(f"📄 Page content length: {len(content)}")
-                        
-                        # Check if we're being blocked
-                        if any(keyword in content.lower() for keyword in 
-                               ['captcha', 'unusual traffic', 'blocked', 'robot']):
-                            print("🚫 Detected blocking mechanism")
-                        
-                        # Optional: Save HTML for manual inspection
-                        # with open(f'debug_page_{page_index}.html', 'w', encoding='utf-8') as f:
-                        #     f.write(content)
-                
-                # Random delay between requests
-                delay = random.uniform(2, 5)
-                print(f"⏳ Waiting {delay:.1f} seconds...")
-                time.sleep(delay)
-                
+                async with limited(limiter):
+                    response = await page.goto(search_url, timeout=30000, wait_until="domcontentloaded")
+                    blocked = block_reason(response.status if response else None, page.url)
+                    if blocked and limiter is not None:
+                        limiter.throttle(blocked)
+                if not blocked:
+                    break
+                log.warning(f"⚠️  Response status: {response.status if response else 'None'} ({blocked}), retrying...")
             except Exception as e:
-                print(f"❌ Error on page {page_index + 1}: {e}")
-                continue
+                log.warning(f"⚠️  Navigation error (retry {retry + 1}): {e}")
+                if retry == max_retries - 1:
+                    raise
+                if limiter is None:
+                    await asyncio.sleep(2)
 
-        ctx.close()
-        b.close()
+        METRICS.inc("pages_fetched", kind="serp")
 
-    print(f"🎉 Collected {len(urls)} unique LinkedIn URLs")
-    return list(urls)
+        # Wait for the results container (falls back to the old fixed 2s without a strategy)
+        await wait_ready(page, wait, 2000)
 
+        # Every href under any of the result selectors, in one round-trip
+        info = await page.evaluate(SERP_HARVEST_JS, {
+            "links": SERP_LINK_SELECTOR, "next": SERP_NEXT_SELECTOR, "pager": SERP_PAGER_SELECTOR,
+        })
+        hrefs = info.pop("hrefs")
+        found_links = bool(hrefs)
+        found = harvest_linkedin_urls(hrefs)
+        log.info(f"✅ {len(hrefs)} result links, {len(found)} LinkedIn URLs")
 
-def _clean_linkedin_url(url: str) -> str:
-    from urllib.parse import urlparse
-    parsed = urlparse(url)
-    clean = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-    # normalize and keep only profile-like path
-    if "/in/" in clean:
-        return clean.rstrip("/")
-    return clean.rstrip("/")
+        if found_links and snapshots is not None:
+            await asyncio.to_thread(snapshots.put, search_url, await page.content(), "serp")
+
+        if not found_links:
+            log.warning("⚠️  No links found with any selector. Page might be blocked or structure changed.")
+            content = await page.content()
+
+            # Check if we're being blocked; the limiter slows Google down if so
+            blocked = block_reason(None, page.url, content)
+            if blocked:
+                log.warning(f"🚫 Detected blocking mechanism ({blocked})")
+                if limiter is not None:
+                    limiter.throttle(blocked)
+                METRICS.inc("errors", stage="serp_blocked")
+                return None
+
+            # Debug: Save page content for inspection
+            if page_index == 0:  # Only for first page to avoid spam
+                log.info(f"📄 Page title: {await page.title()}")
+                log.info(f"📄 Page content length: {len(content)}")
+
+                # Optional: Save HTML for manual inspection
+                # with open(f'debug_page_{page_index}.html', 'w', encoding='utf-8') as f:
+                #     f.write(content)
+
+        if limiter is None:
+            # Random delay between requests (the limiter paces requests otherwise)
+            delay = random.uniform(2, 5)
+            log.debug(f"⏳ Waiting {delay:.1f} seconds...")
+            await asyncio.sleep(delay)
+
+    except Exception as e:
+        log.error(f"❌ Error on page {page_index + 1}: {e}")
+        METRICS.inc("errors", stage="serp")
+        return None
+    return found, info
+
+
+def block_reason(status: Optional[int], url: str = "", text: str = "") -> Optional[str]:
+    """Why a response looks like a block/challenge instead of content, or None."""
+    for marker, reason in BLOCK_URL_MARKERS.items():
+        if marker in url:
+            return reason
+    if status is not None and status != 200:
+        return f"http {status}"
+    lowered = text.lower()
+    if any(m in lowered for m in BLOCK_TEXT_MARKERS):
+        return "captcha"
+    return None
 
 
 # ---------- LinkedIn profile scraping ----------
+def profile_block_reason(parsed: Dict) -> Optional[str]:
+    """`block_reason` for harvested profile text: challenge copy in the top card or first lines."""
+    top = [v for v in (parsed.get("top_card") or {}).values() if isinstance(v, str)]
+    return block_reason(None, "", "\n".join(top + (parsed.get("lines") or [])[:BLOCK_TEXT_LINES]))
+
+
+def parse_profile_html(html: str, max_lines: int = 100) -> List[str]:
+    """Deduplicated text lines of a saved profile page, up to `max_lines`."""
+    return parse_profile(html, max_lines)["lines"]
+
+
+@timed("tool", tool="parse_profile")
+def parse_profile(html: str, max_lines: int = 100) -> Dict:
+    """
+    Parse saved profile HTML into {"lines": [...], "top_card": {"name", "headline"}}.
+    Same output as the in-page extractor, so snapshots re-parse like live pages.
+    """
+    return extract_profile_text(html, max_lines)
+
+
 def scrape_linkedin_text(
     url: str,
     browser: str = "chromium",
     storage_state: str = "linkedin_auth.json",
-    max_lines: int = 100
+    max_lines: int = 100,
+    engine: Optional[ScrapeEngine] = None,
 ) -> List[str]:
     """
-    Scrape raw text snippets (h1, span, div) from a LinkedIn profile page.
+    Scrape deduplicated text lines (top card, About, contact info) from a LinkedIn profile page.
     Returns up to `max_lines` of text content.
     """
-    results = []
+    with _borrowed_engine(engine, browser=browser, storage_state=storage_state) as eng:
+        return eng.run(scrape_linkedin_text_async(
+            url, eng.pool, max_lines=max_lines, wait=eng.waits.get("profile"),
+        ))
 
-    with sync_playwright() as p:
-        b = getattr(p, browser).launch(headless=False)
-        ctx = b.new_context(storage_state=storage_state)
-        page = ctx.new_page()
-        page.goto(url, timeout=60000)
-        page.wait_for_timeout(5000)
 
-        html = page.content()
-        ctx.close()
-        b.close()
+async def scrape_linkedin_text_async(
+    url: str,
+    pool: BrowserPool,
+    max_lines: int = 100,
+    wait: Optional[WaitStrategy] = None,
+) -> List[str]:
+    """Async body of `scrape_linkedin_text`."""
+    row = await scrape_profile_async(url, pool, max_lines=max_lines, wait=wait)
+    return row["lines"]
 
-    # --- Parse with BeautifulSoup ---
-    soup = BeautifulSoup(html, "html.parser")
 
-    # Collect <h1>, <span>, <div>
-    for tag in soup.find_all(["h1", "span", "div"]):
-        text = tag.get_text(strip=True)
-        if text:
-            results.append(text)
-        if len(results) >= max_lines:
-            break
+@timed("tool", tool="scrape_profile")
+async def scrape_profile_async(
+    url: str,
+    pool: BrowserPool,
+    max_lines: int = 100,
+    wait: Optional[WaitStrategy] = None,
+    snapshots: Optional[SnapshotStore] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> Dict:
+    """
+    Fetch one profile with a page borrowed from `pool` ("profile" context), or parse a
+    fresh snapshot of it without touching the browser (or the limiter).
+    Returns {"url", "lines", "top_card", "bytes"}; bytes is what the page pulled over the network.
+    """
+    if snapshots is not None:
+        cached = await asyncio.to_thread(snapshots.get, url)
+        if cached is not None:
+            parsed = await asyncio.to_thread(parse_profile, cached, max_lines)
+            METRICS.inc("snapshot_hits", kind="profile")
+            return {"url": url, "lines": parsed["lines"], "top_card": parsed["top_card"], "bytes": 0}
 
-    return results
+    async with limited(limiter), pool.page("profile") as page:
+        response = await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        blocked = block_reason(response.status if response else None, page.url)
+        if blocked:
+            # an authwall/999 page has no profile in it: slow down and fail this URL (retryable)
+            if limiter is not None:
+                limiter.throttle(blocked)
+            raise RuntimeError(f"blocked by LinkedIn ({blocked})")
+        # wait for the top card (falls back to the old fixed 5s without a strategy)
+        await wait_ready(page, wait, 5000)
+        # text is pulled out in the page; the full DOM only crosses the pipe when archiving it
+        parsed = await page.evaluate(PROFILE_TEXT_JS, profile_js_args(max_lines))
+        # a 200 on the profile URL can still render a checkpoint/captcha interstitial
+        blocked = profile_block_reason(parsed)
+        if blocked:
+            if limiter is not None:
+                limiter.throttle(blocked)
+            raise RuntimeError(f"blocked by LinkedIn ({blocked} page content)")
+        html = await page.content() if snapshots is not None else None
+        nbytes = pool.take_bytes(page)
+    METRICS.inc("pages_fetched", kind="profile")
+    METRICS.inc("profile_bytes", nbytes)
+
+    if html is not None:
+        await asyncio.to_thread(snapshots.put, url, html, "profile")
+    return {"url": url, "lines": parsed["lines"], "top_card": parsed["top_card"], "bytes": nbytes}
 
 
 def scrape_batch(
@@ -239,79 +603,86 @@ def scrape_batch(
     browser: str = "chromium",
     storage_state: str = "linkedin_auth.json",
     max_lines: int = 100,
+    engine: Optional[ScrapeEngine] = None,
+    snapshots: Optional[SnapshotStore] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
 ) -> List[Dict]:
     """
     Scrape a batch of LinkedIn profiles into raw text lines.
     Returns: [{"url": <profile_url>, "lines": [<up to max_lines text lines>]}, ...]
+    Profiles are fetched concurrently on `engine` (or a throwaway one for this batch);
+    fresh snapshots are parsed instead of fetched. `on_result` sees each row as soon as
+    its profile is done (used for per-URL checkpointing).
     """
+    with _borrowed_engine(engine, browser=browser, storage_state=storage_state) as eng:
+        return eng.run(scrape_batch_async(
+            urls,
+            eng.pool,
+            limiter=eng.limiter,
+            concurrency=eng.concurrency,
+            max_lines=max_lines,
+            wait=eng.waits.get("profile"),
+            snapshots=snapshots,
+            on_result=on_result,
+        ))
+
+
+def load_snapshot_batch(urls: List[str], snapshots: SnapshotStore, max_lines: int = 100) -> List[Dict]:
+    """Offline twin of `scrape_batch`: parse stored HTML (any age), no browser involved."""
     out: List[Dict] = []
     for u in urls:
-        try:
-            lines = scrape_linkedin_text(
-                u,
-                browser=browser,
-                storage_state=storage_state,
-                max_lines=max_lines,
-            )
-            out.append({"url": u, "lines": lines})
-        except Exception as e:
-            out.append({"url": u, "lines": [], "error": str(e)})
-        time.sleep(1.0)  # polite delay
+        html = snapshots.get(u, max_age=float("inf"))
+        if html is None:
+            out.append({"url": u, "lines": [], "error": "no snapshot"})
+            continue
+        parsed = parse_profile(html, max_lines)
+        out.append({"url": u, "lines": parsed["lines"], "top_card": parsed["top_card"], "bytes": 0})
     return out
 
 
+async def scrape_batch_async(
+    urls: List[str],
+    pool: BrowserPool,
+    limiter: Optional[RateLimiter] = None,
+    concurrency: int = 4,
+    max_lines: int = 100,
+    wait: Optional[WaitStrategy] = None,
+    snapshots: Optional[SnapshotStore] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+) -> List[Dict]:
+    """
+    Scrape `urls` with up to `concurrency` pages in flight; politeness comes from the
+    shared `limiter` instead of per-profile sleeps. Result order matches `urls`.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(u: str) -> Dict:
+        async with sem:
+            try:
+                row = await scrape_profile_async(
+                    u, pool, max_lines=max_lines, wait=wait, snapshots=snapshots, limiter=limiter,
+                )
+            except Exception as e:
+                METRICS.inc("errors", stage="scrape")
+                log.warning(f"⚠️  Scrape failed for {u}: {e}")
+                row = {"url": u, "lines": [], "error": str(e)}
+        if on_result is not None:
+            await asyncio.to_thread(on_result, row)
+        return row
+
+    return list(await asyncio.gather(*(one(u) for u in urls)))
+
+
 # ---------- CSV append + dedupe ----------
 def write_profiles_csv(rows: List[Dict], path: str) -> str:
     """
     Append rows to CSV, deduping by URL.
     Expects each row to have: name, role, email, about, url
+    One-shot convenience; long runs should keep a sinks.CsvSink open instead.
     """
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-
-    # Dedupe by existing URLs in file (if any)
-    seen: Set[str] = set()
-    existing_headers = []
-    if p.exists():
-        with p.open("r", encoding="utf-8", newline="") as f:
-            rdr = csv.reader(f)
-            try:
-                existing_headers = next(rdr)
-            except StopIteration:
-                existing_headers = []
-        # If an old file has a different header (e.g., older schema), write to a new file suffix
-        target_headers = ["name", "role", "email", "about", "url"]
-        if existing_headers and existing_headers != target_headers:
-            p = p.with_name(p.stem + "_v2" + p.suffix)
-
-    # Recompute seen from the (possibly rotated) file
-    if p.exists():
-        with p.open("r", encoding="utf-8", newline="") as f:
-            rdr = csv.DictReader(f)
-            for r in rdr:
-                if r.get("url"):
-                    seen.add(r["url"])
-
-    headers = ["name", "role", "email", "about", "url"]
-    new_rows = [r for r in rows if r.get("url") and r["url"] not in seen]
-
-    write_header = not p.exists()
-    with p.open("a", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=headers)
-        if write_header:
-            w.writeheader()
-        for r in new_rows:
-            # Ensure keys exist even if empty
-            row = {
-                "name": r.get("name", ""),
-                "role": r.get("role", ""),
-                "email": r.get("email", ""),
-                "about": r.get("about", ""),
-                "url": r.get("url", ""),
-            }
-            w.writerow(row)
-
-    return f"Wrote {len(new_rows)} new rows to {p} (skipped {len(rows) - len(new_rows)} duplicates)."
+    with CsvSink(path) as sink:
+        n = sink.write_rows(rows)
+    return f"Wrote {n} new rows to {sink.path} (skipped {len(rows) - n} duplicates)."
 
 
 # ---------- batching helper ----------
@@ -0,0 +1,109 @@
+# waits.py
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+# Content signals that mean "the part we scrape is on the page"
+PROFILE_READY_SELECTOR = "main h1, .pv-top-card, .ph5 h1"
+SERP_READY_SELECTOR = "#search, #rso, #botstuff"
+
+
+def percentile(samples, p: float) -> float:
+    """Nearest-rank percentile of `samples` (0 if empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(p / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+class ReadinessStats:
+    """Rolling window of observed time-to-ready (ms) for successful waits."""
+
+    def __init__(self, window: int = 200):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.timeouts = 0
+
+    def record(self, elapsed_ms: float, ready: bool) -> None:
+        if ready:
+            self.samples.append(elapsed_ms)
+        else:
+            self.timeouts += 1
+
+    def summary(self) -> Dict:
+        return {
+            "ready_p50_ms": round(percentile(self.samples, 50)),
+            "ready_p95_ms": round(percentile(self.samples, 95)),
+            "ready_samples": len(self.samples),
+            "ready_timeouts": self.timeouts,
+        }
+
+
+class WaitStrategy:
+    """
+    Wait for a content selector instead of sleeping a fixed time. `ceiling_ms` caps the
+    wait; once enough samples exist the ceiling adapts to `headroom` x observed p95,
+    clamped to [min_ceiling_ms, max_ceiling_ms]. If the selector never shows up we fall
+    back to a short network-idle wait so the page still gets a chance to settle.
+    """
+
+    def __init__(
+        self,
+        selector: str,
+        ceiling_ms: int = 5000,
+        min_ceiling_ms: int = 1000,
+        max_ceiling_ms: int = 15000,
+        idle_fallback_ms: int = 2000,
+        adaptive: bool = True,
+        headroom: float = 1.5,
+        min_samples: int = 20,
+    ):
+        self.selector = selector
+        self.ceiling_ms = ceiling_ms
+        self.min_ceiling_ms = min_ceiling_ms
+        self.max_ceiling_ms = max_ceiling_ms
+        self.idle_fallback_ms = idle_fallback_ms
+        self.adaptive = adaptive
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.stats = ReadinessStats()
+
+    def current_ceiling(self) -> int:
+        if not self.adaptive or len(self.stats.samples) < self.min_samples:
+            return self.ceiling_ms
+        learned = percentile(self.stats.samples, 95) * self.headroom
+        return int(min(self.max_ceiling_ms, max(self.min_ceiling_ms, learned)))
+
+    async def wait(self, page) -> float:
+        """Wait until `page` is ready; returns elapsed ms (also recorded in `stats`)."""
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        started = time.monotonic()
+        ready = True
+        try:
+            await page.wait_for_selector(self.selector, state="attached", timeout=self.current_ceiling())
+        except PlaywrightTimeoutError:
+            ready = False
+            try:
+                await page.wait_for_load_state("networkidle", timeout=self.idle_fallback_ms)
+            except PlaywrightTimeoutError:
+                pass
+        elapsed_ms = (time.monotonic() - started) * 1000.0
+        self.stats.record(elapsed_ms, ready)
+        return elapsed_ms
+
+
+def default_waits(profile_ceiling_ms: int = 5000, serp_ceiling_ms: int = 2000, adaptive: bool = True) -> Dict[str, WaitStrategy]:
+    """Wait strategies keyed by pool context name; the ceilings are the old fixed sleeps."""
+    return {
+        "profile": WaitStrategy(PROFILE_READY_SELECTOR, ceiling_ms=profile_ceiling_ms, adaptive=adaptive),
+        "serp": WaitStrategy(SERP_READY_SELECTOR, ceiling_ms=serp_ceiling_ms, adaptive=adaptive),
+    }
+
+
+async def wait_ready(page, strategy: Optional[WaitStrategy], fallback_ms: int) -> None:
+    """Use `strategy` if given, else the legacy fixed sleep."""
+    if strategy is None:
+        await page.wait_for_timeout(fallback_ms)
+    else:
+        await strategy.wait(page)
@@ -1,25 +1,84 @@
 # workflow.py
 import json
+import logging
 import re
-from langgraph.graph import StateGraph, END
-from typing import List, Dict
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, SystemMessage
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
 from models import GraphState, SearchConfig
 from prompts import LinkedInPrompts
+from fast_extract import fast_extract, is_confident
+from compact import PromptCompactor, build_compactor, estimate_tokens
+from llm_cache import LLMCache, cache_key
+from snapshots import SnapshotStore
 from tools import (
     google_collect_linkedin_urls,
+    collect_urls_from_snapshots,
+    build_engine,
     chunk_list,
     scrape_batch,
-    write_profiles_csv,
+    load_snapshot_batch,
+    iter_linkedin_urls_async,
 )
+from sinks import ProfileSink, open_sink
+from pipeline import StreamingPipeline
+from jobs import MultiJobPipeline
+from checkpoints import RunProgress, new_run_id, open_checkpointer
+from frontier import Frontier
+from seen_index import SeenIndex, canonical_profile_url, profile_urls_with_data, savable_rows
+from workqueue import Lease, WorkQueue, default_worker_id, open_queue
+from background import RunStatus
+from metrics import METRICS, StageProfiler, maybe_stage, run_metrics, timed
+
+log = logging.getLogger(__name__)
+
+EMPTY_FIELDS = {"name": "", "role": "", "email": "", "about": ""}
+
 
 class Workflow:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash")
+    def __init__(self, llm=None, keep_engine: bool = False):
+        # any LangChain chat model works here (see fakes.FakeExtractChatModel for offline runs);
+        # the default Gemini client is only built when a profile actually needs the LLM
+        self._llm = llm
+        self._built_model: Optional[str] = None  # model of the Gemini client we built, if any
         self.prompts = LinkedInPrompts()
-        self.workflow = self.build_graph()
-        
+        self.engine = None  # ScrapeEngine (browser pool + loop), owned for the duration of run()
+        self.keep_engine = keep_engine  # keep the browser open between runs (long-lived UIs)
+        self._engine_key = ""
+        self.extract_stats = self._new_extract_stats()
+        self._stats_lock = threading.Lock()  # extract_rows may run on several threads (pipeline mode)
+        self.llm_cache: Optional[LLMCache] = None  # opened per run unless disabled in config
+        self.snapshots: Optional[SnapshotStore] = None  # raw HTML read-through / offline source
+        self.sink: Optional[ProfileSink] = None  # output backend + URL index, open for the run
+        self.progress: Optional[RunProgress] = None  # per-URL scrape results of the current run
+        self.seen: Optional[SeenIndex] = None  # profiles saved by any run, across outputs
+        self.frontier: Optional[Frontier] = None  # large-run URL frontier (GraphState keeps the cursor)
+        self.compactor: Optional[PromptCompactor] = None  # trims LLM-bound lines to a token budget
+        self._checkpointer = None
+        self.profiler: Optional[StageProfiler] = None  # set for --profile runs
+        self.status: Optional[RunStatus] = None  # progress + cancel channel of a background run
+        self._graph = None
+
+    @property
+    def llm(self):
+        """The injected chat model, or the Gemini client once a run has needed one (else None)."""
+        return self._llm
+
+    def _chat_model(self, cfg: SearchConfig):
+        if self._llm is None or (self._built_model is not None and self._built_model != cfg.llm_model):
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            self._llm = ChatGoogleGenerativeAI(model=cfg.llm_model)
+            self._built_model = cfg.llm_model
+        return self._llm
+
+    @property
+    def workflow(self):
+        """The compiled graph without a checkpointer, built on first use."""
+        if self._graph is None:
+            self._graph = self.build_graph()
+        return self._graph
+
     @staticmethod
     def _extract_json_str(s: str) -> str:
         """
@@ -37,37 +96,358 @@ class Workflow:
             return s[start:end+1]
         return s
 
+    @staticmethod
+    def _extract_json_array_str(s: str) -> str:
+        """Like `_extract_json_str`, but for a top-level JSON array."""
+        s = s.strip()
+        s = re.sub(r"^```(?:json)?\s*", "", s)
+        s = re.sub(r"\s*```$", "", s)
+        start = s.find("[")
+        end = s.rfind("]")
+        if start != -1 and end != -1 and end > start:
+            return s[start:end+1]
+        return s
+
+    @staticmethod
+    def _normalize_fields(data: Dict, url: str) -> Dict:
+        """Ensure all fields exist and are stripped strings."""
+        return {
+            "name": (data.get("name") or "").strip(),
+            "role": (data.get("role") or "").strip(),
+            "email": (data.get("email") or "").strip(),
+            "about": (data.get("about") or "").strip(),
+            "url": (data.get("url") or url).strip() or url,
+        }
+
+    def _parse_single(self, llm_resp, url: str) -> Dict:
+        raw = getattr(llm_resp, "content", "") if llm_resp else ""
+        data = json.loads(self._extract_json_str(raw))
+        return self._normalize_fields(data, url)
+
+    def _messages_for(self, row: Dict) -> List:
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        system = SystemMessage(content=self.prompts.EXTRACT_SYSTEM)
+        human = HumanMessage(content=self.prompts.extract_user(row["url"], row["lines"]))
+        return [system, human]
+
+    @staticmethod
+    def _record_call(messages: List) -> None:
+        tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        METRICS.inc("llm_calls")
+        METRICS.inc("llm_prompt_tokens", tokens)
+        log.debug("🧮 LLM call: ~%d prompt tokens", tokens)
+
+# ---- Extraction strategies (each returns one structured row per input row, same order) ----
+    def _extract_serial(self, rows: List[Dict], cfg: SearchConfig) -> List[Dict]:
+        out = []
+        for row in rows:
+            try:
+                messages = self._messages_for(row)
+                self._record_call(messages)
+                out.append(self._parse_single(self._chat_model(cfg).invoke(messages), row["url"]))
+            except Exception as e:
+                out.append({**EMPTY_FIELDS, "url": row["url"], "error": str(e)})
+        return out
+
+    def _extract_concurrent(self, rows: List[Dict], cfg: SearchConfig) -> List[Dict]:
+        """One prompt per row, sent through `llm.batch` with at most `llm_concurrency` in flight."""
+        if not rows:
+            return []
+        prompts = [self._messages_for(row) for row in rows]
+        for messages in prompts:
+            self._record_call(messages)
+        responses = self._chat_model(cfg).batch(
+            prompts,
+            config={"max_concurrency": cfg.llm_concurrency},
+            return_exceptions=True,
+        )
+        out = []
+        for row, resp in zip(rows, responses):
+            try:
+                if isinstance(resp, Exception):
+                    raise resp
+                out.append(self._parse_single(resp, row["url"]))
+            except Exception as e:
+                out.append({**EMPTY_FIELDS, "url": row["url"], "error": str(e)})
+        return out
+
+    def _extract_packed(self, rows: List[Dict], cfg: SearchConfig) -> List[Dict]:
+        """
+        Pack `pack_size` profiles per prompt and read back a JSON array keyed by URL.
+        Rows missing from (or unparsable in) a pack answer are retried one-per-prompt,
+        so one bad profile never costs the rest of its pack.
+        """
+        if not rows:
+            return []
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        packs = chunk_list(rows, max(1, cfg.pack_size))
+        prompts = [
+            [SystemMessage(content=self.prompts.EXTRACT_SYSTEM),
+             HumanMessage(content=self.prompts.extract_many([(r["url"], r["lines"]) for r in pack]))]
+            for pack in packs
+        ]
+        for messages in prompts:
+            self._record_call(messages)
+        responses = self._chat_model(cfg).batch(
+            prompts,
+            config={"max_concurrency": cfg.llm_concurrency},
+            return_exceptions=True,
+        )
+
+        by_url: Dict[str, Dict] = {}
+        for pack, resp in zip(packs, responses):
+            if isinstance(resp, Exception):
+                continue
+            try:
+                items = json.loads(self._extract_json_array_str(getattr(resp, "content", "") or ""))
+            except Exception:
+                continue
+            wanted = {r["url"] for r in pack}
+            for item in items if isinstance(items, list) else []:
+                if isinstance(item, dict) and item.get("url") in wanted:
+                    by_url[item["url"]] = self._normalize_fields(item, item["url"])
+
+        leftovers = [r for r in rows if r["url"] not in by_url]
+        for row, data in zip(leftovers, self._extract_concurrent(leftovers, cfg)):
+            by_url[row["url"]] = data
+        return [by_url[r["url"]] for r in rows]
+
+    @timed("tool", tool="extract_rows")
+    def extract_rows(self, rows: List[Dict], cfg: SearchConfig) -> List[Dict]:
+        """
+        Structured rows for scraped {"url","lines"} rows. The rule-based fast path
+        answers confident rows; only the rest go to the LLM via `cfg.extract_mode`,
+        with their lines compacted to the prompt token budget first.
+        """
+        out: List[Optional[Dict]] = [None] * len(rows)
+        todo_idx = []
+        for i, row in enumerate(rows):
+            if not row.get("lines"):
+                out[i] = {**EMPTY_FIELDS, "url": row.get("url", ""), "error": row.get("error") or "no profile text"}
+                continue
+            if cfg.fast_path:
+                result = fast_extract(row)
+                if is_confident(result, cfg.fast_path_fields, cfg.fast_path_min_confidence):
+                    out[i] = result["fields"]
+                    with self._stats_lock:
+                        self.extract_stats["fast_rows"] += 1
+                    METRICS.inc("fast_path_rows")
+                    continue
+            todo_idx.append(i)
+        if self.compactor is not None:
+            self.compactor.observe(rows)
+
+        # content-addressed cache: identical profile text + prompt + model never hits the LLM twice
+        keys: Dict[int, str] = {}
+        if self.llm_cache is not None and todo_idx:
+            model = self._model_name(cfg)
+            # the empty user prompt fingerprints the template, so editing it invalidates old entries
+            prompt_id = self.prompts.EXTRACT_SYSTEM + self.prompts.extract_user("", [])
+            if self.compactor is not None:
+                prompt_id += self.compactor.fingerprint()
+            misses = []
+            for i in todo_idx:
+                keys[i] = cache_key(model, prompt_id, rows[i]["lines"])
+                hit = self.llm_cache.get(keys[i])
+                if hit is None:
+                    misses.append(i)
+                else:
+                    out[i] = {**hit, "url": rows[i].get("url", "")}
+            METRICS.inc("llm_cache_hits", len(todo_idx) - len(misses))
+            METRICS.inc("llm_cache_misses", len(misses))
+            todo_idx = misses
+
+        todo = [{"url": rows[i].get("url", ""), "lines": self._prompt_lines(rows[i])} for i in todo_idx]
+        strategy = {
+            "serial": self._extract_serial,
+            "concurrent": self._extract_concurrent,
+            "packed": self._extract_packed,
+        }.get(cfg.extract_mode, self._extract_concurrent)
+
+        started = time.monotonic()
+        results = strategy(todo, cfg)
+        if todo:
+            prompt_chars = sum(len(self.prompts.extract_user(r["url"], r["lines"])) for r in todo)
+            with self._stats_lock:
+                self.extract_stats["llm_rows"] += len(todo)
+                self.extract_stats["llm_seconds"] += time.monotonic() - started
+                self.extract_stats["llm_prompt_chars"] += prompt_chars
+
+        fresh: Dict[str, Dict] = {}
+        METRICS.inc("errors", sum(1 for d in results if "error" in d), stage="extract")
+        for i, data in zip(todo_idx, results):
+            # the input URL is the row's identity; the model's echo of it may differ
+            out[i] = {**data, "url": rows[i].get("url", "")}
+            if i in keys and "error" not in data:
+                fresh[keys[i]] = {k: v for k, v in data.items() if k != "url"}
+        if self.llm_cache is not None:
+            self.llm_cache.put_many(fresh)
+        return out
+
+    def _prompt_lines(self, row: Dict) -> List[str]:
+        """The lines an LLM prompt gets for `row`: compacted when a compactor is set."""
+        if self.compactor is None:
+            return row["lines"]
+        c = self.compactor.compact(row)
+        with self._stats_lock:
+            self.extract_stats["prompt_tokens_before"] += c["tokens_before"]
+            self.extract_stats["prompt_tokens_after"] += c["tokens_after"]
+        METRICS.inc("prompt_tokens_saved", c["tokens_before"] - c["tokens_after"])
+        return c["lines"]
+
+    def _model_name(self, cfg: SearchConfig) -> str:
+        """
+        The model in LLM cache keys: config's, unless a chat model was injected. Never builds
+        the client, so a run answered entirely from the cache needs no API key.
+        """
+        if self._llm is None or self._built_model is not None:
+            return cfg.llm_model
+        return getattr(self._llm, "model", None) or getattr(self._llm, "model_name", "") or type(self._llm).__name__
+
+    @staticmethod
+    def _new_extract_stats() -> Dict:
+        return {"fast_rows": 0, "llm_rows": 0, "llm_seconds": 0.0, "llm_prompt_chars": 0,
+                "prompt_tokens_before": 0, "prompt_tokens_after": 0}
+
+    def extract_report(self, cfg: SearchConfig) -> Dict:
+        """LLM-skip rate plus latency/cost the fast path saved, estimated from this run's LLM rows."""
+        st = self.extract_stats
+        total = st["fast_rows"] + st["llm_rows"]
+        per_row_s = st["llm_seconds"] / st["llm_rows"] if st["llm_rows"] else 0.0
+        per_row_tokens = st["llm_prompt_chars"] / 4 / st["llm_rows"] if st["llm_rows"] else 0.0  # ~4 chars/token
+        return {
+            "rows": total,
+            "llm_skip_rate": round(st["fast_rows"] / total, 3) if total else 0.0,
+            "latency_saved_s": round(st["fast_rows"] * per_row_s, 2),
+            "cost_saved_usd": round(st["fast_rows"] * per_row_tokens / 1000 * cfg.llm_usd_per_1k_input_tokens, 4),
+            "profile_tokens_before": st["prompt_tokens_before"],
+            "profile_tokens_after": st["prompt_tokens_after"],
+        }
+
 # ---- Nodes ----
     def _node_build_query(self, state: GraphState) -> GraphState:
         cfg: SearchConfig = state["config"]
         state["query_base"] = LinkedInPrompts.build_base_query(cfg.role, cfg.country)
-        print(f"🔍 Base query: {state['query_base']}")
+        log.info(f"🔍 Base query: {state['query_base']}")
         state["current_page"] = 1
         return state
 
     def _node_search_pages(self, state: GraphState) -> GraphState:
         cfg: SearchConfig = state["config"]
+        if self.status is not None:
+            self.status.check()
+        if self._frontier(state) is not None:
+            return self._search_into_frontier(state)
         pages = cfg.pages or 1
-        urls = google_collect_linkedin_urls(
-            query_base=state["query_base"],
-            pages=pages,
-            per_page=cfg.per_page,
-            browser=cfg.browser
-        )
+        if cfg.from_snapshots:
+            urls = collect_urls_from_snapshots(state["query_base"], pages, cfg.per_page, self.snapshots)
+        else:
+            urls = google_collect_linkedin_urls(
+                query_base=state["query_base"],
+                pages=pages,
+                per_page=cfg.per_page,
+                browser=cfg.browser,
+                engine=self.engine,
+                snapshots=self.snapshots,
+            )
         for url in urls:
-            print(f"🔗 Found URL: {url}")
+            log.debug("🔗 Found URL: %s", url)
         agg = set(state.get("urls", []))
-        agg.update(urls)
+        agg.update(canonical_profile_url(u) for u in urls)
         state["urls"] = sorted(agg)
+        if self.status is not None:
+            self.status.found(len(state["urls"]))
         return state
 
+    def _frontier(self, state: GraphState) -> Optional[Frontier]:
+        """The disk-backed frontier when this is a large run (its state carries a cursor)."""
+        return self.frontier if state.get("frontier_cursor") is not None else None
+
+    def _search_into_frontier(self, state: GraphState) -> GraphState:
+        """Large-run search: each SERP page's URLs go straight to the frontier, never into the state."""
+        cfg: SearchConfig = state["config"]
+        run_id = state.get("run_id", "")
+        pages = cfg.pages or 1
+        counts = {"found": 0, "skipped": 0}
+
+        def add(urls: List[str]) -> List[str]:
+            fresh = self.seen.fresh(urls) if self.seen is not None and not cfg.from_snapshots else set()
+            new = self.frontier.add(run_id, urls, skip=fresh)  # also the search's "seen on an earlier page"
+            skipped = {canonical_profile_url(u) for u in fresh}
+            counts["found"] += len(new)
+            counts["skipped"] += sum(1 for u in new if u in skipped)
+            return new
+
+        if cfg.from_snapshots:
+            add(collect_urls_from_snapshots(state["query_base"], pages, cfg.per_page, self.snapshots))
+        else:
+            async def collect() -> None:
+                eng = self.engine
+                async for _ in iter_linkedin_urls_async(
+                    state["query_base"], pages, cfg.per_page, eng.pool, wait=eng.waits.get("serp"),
+                    snapshots=self.snapshots, limiter=eng.serp_limiter, concurrency=eng.serp_concurrency,
+                    dedupe=add,
+                ):
+                    pass  # each page's URLs are already in the frontier
+
+            self.engine.run(collect())
+        if counts["skipped"]:
+            log.info(f"⏭️  Skipping {counts['skipped']} profiles saved in the last {cfg.rescrape_after_days:g} days")
+        log.info(f"🗂️  {counts['found']} URLs found; frontier for run {run_id} is on disk")
+        if self.status is not None:
+            self.status.found(counts["found"])
+        state["urls"] = []
+        state["frontier_left"] = self.frontier.remaining(run_id, state["frontier_cursor"])
+        return state
+
+    @staticmethod
+    def _resume_totals(values: Dict, next_node: str) -> Tuple[int, int]:
+        """Profiles and batches still to go in a checkpoint that already made its batches."""
+        if values.get("frontier_cursor") is not None:
+            profiles = values.get("frontier_left", 0)
+            batches = -(-profiles // values["config"].batch_size)
+        else:
+            profiles = sum(len(b) for b in values.get("batches") or [])
+            batches = len(values.get("batches") or [])
+        if next_node != "next_batch" and values.get("current_batch"):
+            profiles += len(values["current_batch"])  # stopped part-way through this batch
+            batches += 1
+        return profiles, batches
 
     def _node_make_batches(self, state: GraphState) -> GraphState:
         cfg: SearchConfig = state["config"]
-        state["batches"] = chunk_list(state["urls"], cfg.batch_size)
+        frontier = self._frontier(state)
+        if frontier is not None:
+            # batches are read from disk one at a time; only the cursor and a count live in the state
+            state["batches"] = []
+            state["frontier_left"] = frontier.remaining(state.get("run_id", ""), state["frontier_cursor"])
+            if self.status is not None:
+                self.status.queued(state["frontier_left"], batches=-(-state["frontier_left"] // cfg.batch_size))
+            return state
+        urls = state["urls"]
+        if self.seen is not None and not cfg.from_snapshots:
+            fresh = self.seen.fresh(urls)
+            if fresh:
+                log.info(f"⏭️  Skipping {len(fresh)} profiles saved in the last {cfg.rescrape_after_days:g} days")
+                urls = [u for u in urls if u not in fresh]
+        state["batches"] = chunk_list(urls, cfg.batch_size)
+        if self.status is not None:
+            self.status.queued(len(urls), batches=len(state["batches"]))
         return state
 
     def _node_next_batch(self, state: GraphState) -> GraphState:
+        if self.status is not None:
+            self.status.check()  # stop between batches; the checkpoint resumes at this one
+        frontier = self._frontier(state)
+        if frontier is not None:
+            urls, state["frontier_cursor"] = frontier.batch(
+                state.get("run_id", ""), state["frontier_cursor"], state["config"].batch_size
+            )
+            state["current_batch"] = urls
+            state["frontier_left"] = max(0, state["frontier_left"] - len(urls))
+            return state
         if not state["batches"]:
             state["current_batch"] = []
         else:
@@ -80,14 +460,33 @@ class Workflow:
         if not urls:
             state["batch_results"] = []
             return state
-        # Now returns [{"url": ..., "lines": [...]}, ...]
-        results = scrape_batch(
-            urls,
+        if cfg.from_snapshots:
+            state["batch_results"] = load_snapshot_batch(urls, self.snapshots, max_lines=100)
+            if self.status is not None:
+                self.status.scraped(len(urls))
+            return state
+
+        # profiles finished before a crash are reused, not refetched
+        run_id = state.get("run_id", "")
+        done = self.progress.scraped_rows(run_id, urls) if self.progress else {}
+        if done:
+            log.info(f"♻️  {len(done)}/{len(urls)} profiles in this batch already scraped")
+        on_result = (lambda row: self.progress.record_scraped(run_id, row)) if self.progress else None
+
+        # Now returns [{"url": ..., "lines": [...]}, ...]; the whole batch is awaited on the engine
+        fetched = scrape_batch(
+            [u for u in urls if u not in done],
             browser=cfg.browser,
             storage_state=cfg.storage_state,
             max_lines=100,
+            engine=self.engine,
+            snapshots=self.snapshots,
+            on_result=on_result,
         )
-        state["batch_results"] = results
+        by_url = {**done, **{r["url"]: r for r in fetched}}
+        state["batch_results"] = [by_url[u] for u in urls]
+        if self.status is not None:
+            self.status.scraped(len(urls))
         return state
 
     def _node_extract_batch(self, state: GraphState) -> GraphState:
@@ -95,61 +494,61 @@ class Workflow:
         Use LLM to convert text lines -> structured fields:
         name, role, email, about, url
         """
+        cfg: SearchConfig = state["config"]
         input_rows: List[Dict] = state.get("batch_results", [])
-        extracted: List[Dict] = []
-
-        for row in input_rows:
-            url = row.get("url", "")
-            lines = row.get("lines", [])
-            if not lines:
-                extracted.append({"name": "", "role": "", "email": "", "about": "", "url": url})
-                continue
-
-            system = SystemMessage(content=self.prompts.EXTRACT_SYSTEM)
-            human = HumanMessage(content=self.prompts.extract_user(url, lines))
-
-            try:
-                llm_resp = self.llm.invoke([system, human])
-                raw = getattr(llm_resp, "content", "") if llm_resp else ""
-                json_str = self._extract_json_str(raw)
-                data = json.loads(json_str)
-                # Ensure all fields exist
-                data = {
-                    "name": data.get("name", "").strip(),
-                    "role": data.get("role", "").strip(),
-                    "email": data.get("email", "").strip(),
-                    "about": data.get("about", "").strip(),
-                    "url": data.get("url", url).strip() or url,
-                }
-            except Exception as e:
-                data = {"name": "", "role": "", "email": "", "about": "", "url": url, "error": str(e)}
-            extracted.append(data)
+        extracted = self.extract_rows(input_rows, cfg)
 
         state["batch_results"] = extracted  # overwrite with structured rows
         return state
 
     def _node_save_batch(self, state: GraphState) -> GraphState:
-        cfg: SearchConfig = state["config"]
-        if state["batch_results"]:
-            msg = write_profiles_csv(state["batch_results"], cfg.output_csv)
-            print(msg)
+        rows = savable_rows(state["batch_results"])
+        failed = len(state["batch_results"]) - len(rows)
+        if failed:
+            METRICS.inc("rows_unsaved", failed)
+            log.warning(f"⚠️  {failed} profiles failed to scrape or extract; not saved, will be retried next run.")
+        if not rows and self.status is not None:
+            self.status.saved([])  # the batch is done even if nothing in it was savable
+        if rows:
+            new = [r for r in rows if r["url"] not in self.sink] if self.status else []
+            n = self.sink.write_rows(rows)
+            self.sink.flush()  # batch boundary
+            if self.status is not None:
+                self.status.saved(new[:n])
+            METRICS.inc("rows_written", n)
+            log.info(f"Wrote {n} new rows to {self.sink.path} (skipped {len(rows) - n} duplicates).")
+            if self.progress is not None:
+                self.progress.mark_saved(state.get("run_id", ""), [r["url"] for r in rows])
+            if self.seen is not None:
+                self.seen.mark(profile_urls_with_data(rows))
+        if self._frontier(state) is not None:
+            state["batch_results"] = []  # saved; keep checkpoints one cursor wide
         return state
 
     @staticmethod
     def _router_continue_or_end(state: GraphState):
-        return "continue" if state["batches"] else "end"
+        return "continue" if state["batches"] or state.get("frontier_left") else "end"
+
+    def _instrumented(self, name: str, node):
+        """Wrap a node so every call is timed (and profiled under --profile)."""
+        def run_node(state: GraphState) -> GraphState:
+            with METRICS.timer("node", node=name), maybe_stage(self.profiler, name):
+                return node(state)
+        return run_node
 
     # ---- Graph builder ----
-    def build_graph(self):
+    def build_graph(self, checkpointer=None):
+        from langgraph.graph import StateGraph, END
+
         g = StateGraph(GraphState)
 
-        g.add_node("build_query", self._node_build_query)
-        g.add_node("search_pages", self._node_search_pages)
-        g.add_node("make_batches", self._node_make_batches)
-        g.add_node("next_batch", self._node_next_batch)
-        g.add_node("scrape_batch", self._node_scrape_batch)
-        g.add_node("extract_batch", self._node_extract_batch)  # <-- new
-        g.add_node("save_batch", self._node_save_batch)
+        g.add_node("build_query", self._instrumented("build_query", self._node_build_query))
+        g.add_node("search_pages", self._instrumented("search_pages", self._node_search_pages))
+        g.add_node("make_batches", self._instrumented("make_batches", self._node_make_batches))
+        g.add_node("next_batch", self._instrumented("next_batch", self._node_next_batch))
+        g.add_node("scrape_batch", self._instrumented("scrape_batch", self._node_scrape_batch))
+        g.add_node("extract_batch", self._instrumented("extract_batch", self._node_extract_batch))
+        g.add_node("save_batch", self._instrumented("save_batch", self._node_save_batch))
 
         g.set_entry_point("build_query")
         g.add_edge("build_query", "search_pages")
@@ -165,9 +564,396 @@ class Workflow:
             {"continue": "next_batch", "end": END}
         )
 
-        return g.compile()
+        return g.compile(checkpointer=checkpointer)
+
+    # ---- Run lifecycle ----
+    def _open_resources(self, config: SearchConfig) -> None:
+        self.sink = open_sink(config.output_format, config.resolved_output_path())
+        self._open_shared(config)
+
+    def _open_shared(self, config: SearchConfig) -> None:
+        """Caches, indexes and the browser engine: everything but the output sink."""
+        self.extract_stats = self._new_extract_stats()
+        if config.llm_cache and self.llm_cache is None:
+            self.llm_cache = LLMCache(
+                config.llm_cache_path,
+                ttl_seconds=config.llm_cache_ttl_days * 86400,
+                max_entries=config.llm_cache_max_entries,
+            )
+        if self.compactor is None:
+            self.compactor = build_compactor(config.prompt_token_budget, config.boilerplate_lines,
+                                             learn=config.learn_boilerplate)
+        if (config.snapshots or config.from_snapshots) and self.snapshots is None:
+            self.snapshots = SnapshotStore(config.snapshot_path, ttl_seconds=config.snapshot_ttl_days * 86400)
+        if config.checkpoint and self.progress is None:
+            self.progress = RunProgress(config.checkpoint_path)
+        if config.seen_index and self.seen is None:
+            self.seen = SeenIndex(config.seen_index_path, ttl_seconds=config.rescrape_after_days * 86400)
+        if config.from_snapshots:
+            return  # offline re-parse: no browser at all
+        engine_args = self._engine_args(config)
+        key = repr(sorted(engine_args.items()))
+        if self.engine is not None and key == self._engine_key:
+            return  # kept from an earlier run with the same browser settings
+        self._shutdown_engine()
+        self.engine = build_engine(**engine_args)
+        self._engine_key = key
+
+    def _engine_args(self, config: SearchConfig) -> Dict:
+        """build_engine keyword arguments for this config; a changed value means a new engine."""
+        return dict(
+            browser=config.browser,
+            storage_state=config.storage_state,
+            headless=config.headless,
+            pool_size=config.pool_size,
+            max_page_uses=config.max_page_uses,
+            concurrency=config.concurrency,
+            min_interval=config.min_request_interval,
+            serp_concurrency=config.serp_concurrency,
+            serp_min_interval=config.serp_min_interval,
+            serp_jitter=config.serp_jitter,
+            block_resources=config.block_resources,
+            allow_urls=config.allow_urls,
+            http_cache_dir=config.http_cache_dir,
+            adaptive_waits=config.adaptive_waits,
+            adaptive_rate=config.adaptive_rate,
+            max_rate=config.max_request_rate,
+            serp_max_rate=config.serp_max_rate,
+        )
+
+    def _close_engine(self) -> Dict:
+        """
+        Final stats of the browser engine (empty if none was running); the engine is
+        closed unless `keep_engine` is set, in which case the next run reuses it.
+        """
+        if self.engine is None:
+            return {}
+        stats = {"pool": self.engine.pool.stats(), "readiness": self.engine.readiness(), "rates": self.engine.rates()}
+        if not self.keep_engine:
+            self._shutdown_engine()
+        return stats
+
+    def _shutdown_engine(self) -> None:
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+            self._engine_key = ""
+
+    def close(self) -> None:
+        """Release everything a long-lived Workflow holds: browser, caches and indexes."""
+        self._shutdown_engine()
+        for name in ("llm_cache", "snapshots", "progress", "seen", "frontier"):
+            store = getattr(self, name)
+            if store is not None:
+                store.close()
+                setattr(self, name, None)
+
+    def _print_summary(self, config: SearchConfig, engine_stats: Dict) -> None:
+        if engine_stats:
+            stats = engine_stats["pool"]
+            log.info(f"📈 {stats['pages_served']} pages at {stats['pages_per_minute']} pages/min "
+                  f"({stats['pages_recycled']} recycled), {stats['bytes_per_page'] / 1024:.1f} KiB/page, "
+                  f"{stats.get('requests_blocked', 0)} requests blocked")
+        rep = self.extract_report(config)
+        log.info(f"🧠 LLM skipped for {rep['llm_skip_rate']:.0%} of {rep['rows']} rows "
+              f"(~{rep['latency_saved_s']}s and ~${rep['cost_saved_usd']} saved)")
+        if rep["profile_tokens_before"]:
+            cut = 1 - rep["profile_tokens_after"] / rep["profile_tokens_before"]
+            log.info(f"✂️  Profile text in prompts: ~{rep['profile_tokens_before']} -> ~{rep['profile_tokens_after']} "
+                     f"tokens ({cut:.0%} smaller)")
+        if self.llm_cache is not None:
+            cs = self.llm_cache.stats()
+            log.info(f"🗃️  LLM cache: {cs['llm_cache_hits']} hits / {cs['llm_cache_misses']} misses")
+        if self.snapshots is not None:
+            ss = self.snapshots.stats()
+            log.info(f"📦 Snapshots: {ss['snapshot_hits']} reused / {ss['snapshot_misses']} fetched")
+        for kind, r in engine_stats.get("rates", {}).items():
+            log.info(f"🚦 {kind} pacing ended at {r['rate']} req/s, window {r['concurrency']} "
+                     f"({r['throttles']} throttles)")
+        for kind, r in engine_stats.get("readiness", {}).items():
+            log.info(f"⏱️  {kind} ready p50={r['ready_p50_ms']}ms p95={r['ready_p95_ms']}ms "
+                  f"(ceiling {r['ceiling_ms']}ms, {r['ready_timeouts']} timeouts)")
+
+    @staticmethod
+    def _recursion_limit(config: SearchConfig) -> int:
+        # 4 graph steps per batch; the most URLs a search can return is pages * per_page
+        max_batches = -(-(config.pages or 1) * config.per_page // max(1, config.batch_size))
+        return max(500, 20 + 4 * max_batches)
+
+    def _run_pipeline(self, config: SearchConfig, run_id: str) -> Dict:
+        """Streaming mode: same query, caches and sink as the graph, but stages overlap."""
+        state = self._node_build_query(GraphState(config=config, run_id=run_id))
+        state["urls"] = StreamingPipeline(self).run(config, state["query_base"], run_id)
+        state["batches"] = []
+        state["current_batch"] = []
+        state["batch_results"] = []
+        return state
+
+    @run_metrics()
+    def run(self, config: SearchConfig, status: Optional[RunStatus] = None) -> GraphState:
+        """
+        One search, start to finish. `status` (see background.RunStatus) receives
+        progress as batches are saved and can cancel the run between batches.
+        """
+        self.status = status
+        try:
+            return self._run(config)
+        finally:
+            self.status = None
+
+    def _run(self, config: SearchConfig) -> GraphState:
+        run_id = config.run_id or new_run_id()
+        if self.status is not None:
+            self.status.start(run_id)
+        if config.mode == "pipeline" and config.from_snapshots:
+            log.warning("⚠️  --from-snapshots runs on the graph path; ignoring pipeline mode")
+        pipeline_mode = config.mode == "pipeline" and not config.from_snapshots
+
+        graph = self.workflow
+        if config.checkpoint and not pipeline_mode:
+            self._checkpointer = open_checkpointer(config.checkpoint_path)
+            graph = self.build_graph(self._checkpointer)
+        try:
+            return self._run_graph(graph, config, run_id, pipeline_mode)
+        finally:
+            if self._checkpointer is not None:
+                self._checkpointer.conn.close()
+                self._checkpointer = None
+
+    def _run_graph(self, graph, config: SearchConfig, run_id: str, pipeline_mode: bool) -> GraphState:
+        lg_config = {"configurable": {"thread_id": run_id}}
+        graph_input = GraphState(config=config, run_id=run_id)
+        if config.large_run and not pipeline_mode:
+            graph_input["frontier_cursor"] = 0
+        elif config.large_run:
+            log.warning("⚠️  --large-run applies to graph mode; the pipeline already streams through bounded queues")
+        if config.resume and not pipeline_mode:
+            if self._checkpointer is None:
+                raise ValueError("Resuming needs checkpointing enabled")
+            saved = graph.get_state(lg_config)
+            if not saved.values:
+                raise ValueError(f"No checkpoint found for run {run_id} (finished runs are not kept)")
+            config = saved.values["config"]  # continue with the settings the run started with
+            if not saved.next:
+                log.info(f"✅ Run {run_id} already completed")
+                return GraphState(**saved.values)
+            left = (f"{saved.values.get('frontier_left', 0)} URLs" if saved.values.get("frontier_cursor") is not None
+                    else f"{len(saved.values.get('batches') or [])} batches")
+            log.info(f"♻️  Resuming run {run_id} at '{saved.next[0]}' ({left} left)")
+            if self.status is not None and saved.next[0] not in ("build_query", "search_pages", "make_batches"):
+                self.status.queued(*self._resume_totals(saved.values, saved.next[0]))  # make_batches won't run again
+            graph_input = None  # LangGraph continues from the checkpoint
+        else:
+            log.info(f"🧾 Run ID: {run_id} (resume with --resume {run_id})")
+        # sized from the settings the run started with, which a resume has just restored
+        lg_config["recursion_limit"] = self._recursion_limit(config)
+
+        self.profiler = StageProfiler(config.profile_dir, config.profiler) if config.profile_dir else None
+        engine_stats: Dict = {}
+        try:
+            self._open_resources(config)
+            if config.large_run and not pipeline_mode and self.frontier is None:
+                self.frontier = Frontier(config.frontier_path)
+            if pipeline_mode:
+                with METRICS.timer("node", node="pipeline"), maybe_stage(self.profiler, "pipeline"):
+                    final_state = self._run_pipeline(config, run_id)
+            else:
+                final_state = graph.invoke(graph_input, config=lg_config)
+                if final_state.get("frontier_cursor") is not None:
+                    self.frontier.clear(run_id)
+            self._prune_finished(run_id)
+        finally:
+            engine_stats = self._close_engine()
+            if self.sink is not None:
+                self.sink.close()
+                self.sink = None
+            self._export_metrics(config, run_id, engine_stats)
+        self._print_summary(config, engine_stats)
+        return GraphState(**final_state)
+
+    def _prune_finished(self, run_id: str) -> None:
+        """A finished run is never resumed: drop its graph checkpoints and per-URL progress."""
+        if self._checkpointer is not None:
+            self._checkpointer.delete_thread(run_id)
+        if self.progress is not None:
+            self.progress.clear(run_id)
+
+    @run_metrics()
+    def run_jobs(self, shared: SearchConfig, jobs: Dict[str, SearchConfig]) -> Dict[str, int]:
+        """
+        Run many searches in one process (see jobs.load_jobs). Browser settings, caches
+        and concurrency budgets come from `shared`; each job keeps its own query, page
+        count and output. Returns rows written per job.
+        """
+        if shared.from_snapshots:
+            raise ValueError("Job files run live searches; --from-snapshots isn't supported with --jobs")
+        run_id = shared.run_id or new_run_id()
+        log.info(f"🧾 Run ID: {run_id}, {len(jobs)} jobs (re-run with --run-id {run_id} to reuse scraped profiles)")
+
+        self.profiler = StageProfiler(shared.profile_dir, shared.profiler) if shared.profile_dir else None
+        sinks = {}
+        pipeline = None
+        try:
+            for name, job in jobs.items():
+                sinks[name] = open_sink(job.output_format, job.resolved_output_path())
+            self._open_shared(shared)
+            pipeline = MultiJobPipeline(self, jobs, sinks)
+            with METRICS.timer("node", node="jobs"), maybe_stage(self.profiler, "jobs"):
+                pipeline.run(shared, "", run_id)
+            self._prune_finished(run_id)
+        finally:
+            engine_stats = self._close_engine()
+            for sink in sinks.values():
+                sink.close()
+            written = pipeline.written if pipeline is not None else {}
+            self._export_metrics(shared, run_id, engine_stats, jobs=written)
+        for name, n in written.items():
+            log.info(f"📝 [{name}] {n} new rows in {jobs[name].resolved_output_path()}")
+        self._print_summary(shared, engine_stats)
+        return written
+
+    # ---- Distributed mode ----
+    @run_metrics()
+    def run_coordinator(self, config: SearchConfig) -> Dict[str, int]:
+        """
+        Search, push the new canonical URLs onto the work queue, then collect the rows
+        workers ack into this run's sink until nothing is pending or leased. Re-running
+        with the same --run-id pushes nothing twice and picks up uncollected rows.
+        """
+        run_id = config.run_id or new_run_id()
+        log.info(f"🧾 Run ID: {run_id} (coordinator, queue {config.queue_url})")
+        self.profiler = StageProfiler(config.profile_dir, config.profiler) if config.profile_dir else None
+        self._open_resources(config)
+        queue = open_queue(config.queue_url, max_attempts=config.max_attempts)
+        engine_stats: Dict = {}
+        try:
+            state = self._instrumented("build_query", self._node_build_query)(GraphState(config=config, run_id=run_id))
+            state = self._instrumented("search_pages", self._node_search_pages)(state)
+            urls = [u for u in state["urls"] if u not in self.sink]
+            if self.seen is not None:
+                fresh = self.seen.fresh(urls)
+                urls = [u for u in urls if u not in fresh]
+            added = queue.push(run_id, urls)
+            queue.finish_search(run_id)
+            METRICS.inc("queue_pushed", added)
+            log.info(f"📬 Queued {added} new URLs ({len(urls) - added} already queued) for run {run_id}")
+            engine_stats = self._close_engine()  # the browser isn't needed while workers scrape
+            with METRICS.timer("node", node="collect"), maybe_stage(self.profiler, "collect"):
+                self._collect(queue, config, run_id)
+            counts = queue.counts(run_id)
+            self._prune_finished(run_id)
+        finally:
+            engine_stats = self._close_engine() or engine_stats
+            queue.close()
+            self.sink.close()
+            self.sink = None
+            self._export_metrics(config, run_id, engine_stats)
+        if counts["failed"]:
+            log.warning(f"⚠️  {counts['failed']} URLs failed on every attempt")
+        self._print_summary(config, engine_stats)
+        return counts
+
+    def _collect(self, queue: WorkQueue, config: SearchConfig, run_id: str) -> None:
+        """Move acked rows from the queue into the sink (the only writer) until the run is drained."""
+        last_report = 0.0
+        while True:
+            rows = queue.results(run_id, limit=max(1, config.batch_size) * 10)
+            if rows:
+                self._node_save_batch(GraphState(config=config, run_id=run_id, batch_results=rows))
+                queue.mark_saved(run_id, [r["url"] for r in rows])
+                continue
+            counts = queue.counts(run_id)
+            # "done" too: a worker may ack between the empty results() above and counts()
+            if not counts["pending"] and not counts["leased"] and not counts["done"]:
+                return
+            if time.monotonic() - last_report > 30:
+                log.info(f"⏳ Waiting for workers: {counts['pending']} pending, {counts['leased']} leased, "
+                         f"{counts['saved']} saved, {counts['failed']} failed")
+                last_report = time.monotonic()
+            time.sleep(config.worker_poll_s)
+
+    @run_metrics()
+    def run_worker(self, config: SearchConfig, worker_id: Optional[str] = None) -> int:
+        """
+        Lease URLs from the work queue, scrape and extract them with this process's
+        browser and LLM, and ack the rows. Exits once the queue has been idle for
+        `worker_idle_exit_s`. Returns how many profiles this worker acked.
+        """
+        worker_id = worker_id or default_worker_id()
+        log.info(f"👷 Worker {worker_id} on queue {config.queue_url}")
+        self.profiler = StageProfiler(config.profile_dir, config.profiler) if config.profile_dir else None
+        self._open_shared(config)
+        queue = open_queue(config.queue_url, max_attempts=config.max_attempts)
+        acked = 0
+        try:
+            idle_since = None
+            while True:
+                leases = queue.lease(worker_id, max(config.batch_size, config.concurrency), config.lease_seconds)
+                if leases:
+                    idle_since = None
+                    with METRICS.timer("node", node="work"), maybe_stage(self.profiler, "work"):
+                        acked += self._work(queue, leases, config)
+                    continue
+                if queue.idle():
+                    idle_since = idle_since or time.monotonic()
+                    if time.monotonic() - idle_since >= config.worker_idle_exit_s:
+                        break
+                time.sleep(config.worker_poll_s)
+        finally:
+            engine_stats = self._close_engine()
+            queue.close()
+            self._export_metrics(config, f"worker-{worker_id}", engine_stats)
+        log.info(f"👷 Worker {worker_id} acked {acked} profiles")
+        self._print_summary(config, engine_stats)
+        return acked
+
+    def _work(self, queue: WorkQueue, leases: List[Lease], config: SearchConfig) -> int:
+        scraped = scrape_batch(
+            [l.url for l in leases],
+            browser=config.browser,
+            storage_state=config.storage_state,
+            max_lines=100,
+            engine=self.engine,
+            snapshots=self.snapshots,
+        )
+        by_url = {r["url"]: r for r in scraped}
+        queue.extend(leases, config.lease_seconds)  # the LLM step gets a full lease too
+
+        ok: List[Lease] = []
+        for lease in leases:
+            row = by_url.get(lease.url) or {"error": "not scraped"}
+            if row.get("error"):
+                queue.fail(lease, row["error"])
+            else:
+                ok.append(lease)
+        rows = self.extract_rows([by_url[l.url] for l in ok], config)
+        acked = 0
+        for lease, row in zip(ok, rows):
+            if not savable_rows([row]):  # extraction failed or found nothing: let it be retried
+                queue.fail(lease, row.get("error") or "no fields extracted")
+                continue
+            if queue.ack(lease, {**row, "url": lease.url}):
+                acked += 1
+            else:
+                METRICS.inc("queue_lost_leases")  # expired and redelivered; the other worker's result counts
+        METRICS.inc("queue_acked", acked)
+        return acked
 
-    def run(self, config: SearchConfig) -> GraphState:
-        initial_state = GraphState(config=config)
-        final_state = self.workflow.invoke(initial_state, config={"recursion_limit": 500})
-        return GraphState(**final_state)
\ No newline at end of file
+    def _export_metrics(self, config: SearchConfig, run_id: str, engine_stats: Dict, **extra) -> None:
+        """JSON run report, Prometheus textfile and profiler output, whichever are enabled."""
+        pool = engine_stats.get("pool", {})
+        for name in ("bytes_transferred", "pages_served", "pages_recycled", "pages_per_minute", "requests_blocked"):
+            if name in pool:
+                METRICS.set(name, pool[name])
+        if config.report_dir:
+            path = f"{config.report_dir}/{run_id}.json"
+            if "jobs" not in extra:
+                extra["output"] = config.resolved_output_path()
+            METRICS.write_json(path, run_id=run_id, mode="jobs" if "jobs" in extra else config.mode, **extra)
+            log.info(f"📊 Run report: {path}")
+        if config.prometheus_textfile:
+            METRICS.write_prometheus(config.prometheus_textfile)
+        if self.profiler is not None:
+            for path in self.profiler.dump():
+                log.info(f"🔬 Profile: {path}")
+            self.profiler = None
@@ -0,0 +1,265 @@
+# workqueue.py
+import json
+import socket
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from seen_index import canonical_profile_url
+from sqlite_store import SqliteStore
+
+
+class Lease(NamedTuple):
+    run_id: str
+    url: str
+    token: str  # proves this worker still owns the item when it acks
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue(ABC):
+    """
+    Durable profile-URL queue between a coordinator and any number of workers.
+    The coordinator `push`es canonical URLs and calls `finish_search`; workers
+    `lease` items for `lease_seconds`, then `ack` a structured row or `fail`. An
+    unacked lease expires and the item is handed to another worker, up to
+    `max_attempts` times. Acks from a lease that already expired are refused, so
+    each profile's result is recorded once. The coordinator moves acked rows into
+    its sink with `results` + `mark_saved`.
+    """
+
+    @abstractmethod
+    def push(self, run_id: str, urls: Iterable[str]) -> int:
+        """Queue URLs for `run_id`; returns how many were new."""
+
+    @abstractmethod
+    def finish_search(self, run_id: str) -> None:
+        """No more URLs will be pushed for `run_id`."""
+
+    @abstractmethod
+    def lease(self, worker_id: str, n: int, lease_seconds: float) -> List[Lease]:
+        ...
+
+    @abstractmethod
+    def extend(self, leases: List[Lease], lease_seconds: float) -> None:
+        ...
+
+    @abstractmethod
+    def ack(self, lease: Lease, row: Dict) -> bool:
+        """Record the row; False if the lease was lost (expired and redelivered)."""
+
+    @abstractmethod
+    def fail(self, lease: Lease, error: str) -> None:
+        ...
+
+    @abstractmethod
+    def results(self, run_id: str, limit: int = 100) -> List[Dict]:
+        """Acked rows not yet saved by the coordinator."""
+
+    @abstractmethod
+    def mark_saved(self, run_id: str, urls: List[str]) -> None:
+        ...
+
+    @abstractmethod
+    def counts(self, run_id: str) -> Dict[str, int]:
+        """Items per state: pending, leased, done, saved, failed."""
+
+    @abstractmethod
+    def idle(self, stale_after: float = 600.0) -> bool:
+        """
+        True when nothing is left to lease and no live run may still push: a run whose
+        coordinator hasn't finished searching counts only while it was heard from in
+        the last `stale_after` seconds, so a crashed coordinator can't keep workers up.
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+    def __enter__(self) -> "WorkQueue":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class SqliteWorkQueue(SqliteStore, WorkQueue):
+    """
+    WorkQueue in one SQLite file (WAL mode): fine for workers on one host or on a
+    shared volume with working file locks. Leases are claimed inside BEGIN IMMEDIATE,
+    so two workers never get the same item.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS work_items ("
+        " run_id TEXT NOT NULL, url TEXT NOT NULL, state TEXT NOT NULL DEFAULT 'pending',"
+        " attempts INTEGER NOT NULL DEFAULT 0, lease_token TEXT, lease_owner TEXT, lease_expires REAL,"
+        " result TEXT, error TEXT, updated_at REAL NOT NULL, PRIMARY KEY (run_id, url))",
+        "CREATE INDEX IF NOT EXISTS work_items_state ON work_items(state, lease_expires)",
+        "CREATE TABLE IF NOT EXISTS work_runs ("
+        " run_id TEXT PRIMARY KEY, search_done INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL,"
+        " heartbeat REAL NOT NULL)",
+    )
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        # autocommit: transactions are explicit (see _tx); wait out other processes' writes
+        super().__init__(path, isolation_level=None, timeout=30)
+        self.max_attempts = max_attempts
+
+    def _tx(self):
+        # serialize writers across processes; readers are never blocked in WAL mode
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def push(self, run_id: str, urls: Iterable[str]) -> int:
+        now = time.time()
+        rows = [(run_id, canonical_profile_url(u), now) for u in urls if u]
+        with self._lock:
+            self._tx()
+            try:
+                self._conn.execute(
+                    "INSERT INTO work_runs(run_id, created_at, heartbeat) VALUES (?, ?, ?)"
+                    " ON CONFLICT(run_id) DO UPDATE SET heartbeat = excluded.heartbeat",
+                    (run_id, now, now),
+                )
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO work_items(run_id, url, updated_at) VALUES (?, ?, ?)", rows
+                )
+                added = self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def finish_search(self, run_id: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO work_runs(run_id, search_done, created_at, heartbeat) VALUES (?, 1, ?, ?)"
+                " ON CONFLICT(run_id) DO UPDATE SET search_done = 1, heartbeat = excluded.heartbeat",
+                (run_id, now, now),
+            )
+
+    def _expire(self, now: float) -> None:
+        # expired leases that used up their attempts are given up on
+        self._conn.execute(
+            "UPDATE work_items SET state = 'failed', error = 'lease expired', lease_token = NULL, updated_at = ?"
+            " WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, now, self.max_attempts),
+        )
+
+    def lease(self, worker_id: str, n: int, lease_seconds: float) -> List[Lease]:
+        now = time.time()
+        with self._lock:
+            self._tx()
+            try:
+                self._expire(now)
+                picked = self._conn.execute(
+                    "SELECT run_id, url FROM work_items"
+                    " WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?)"
+                    " ORDER BY attempts, updated_at LIMIT ?",
+                    (now, n),
+                ).fetchall()
+                leases = [Lease(run_id, url, uuid.uuid4().hex) for run_id, url in picked]
+                self._conn.executemany(
+                    "UPDATE work_items SET state = 'leased', attempts = attempts + 1, lease_token = ?,"
+                    " lease_owner = ?, lease_expires = ?, updated_at = ? WHERE run_id = ? AND url = ?",
+                    [(l.token, worker_id, now + lease_seconds, now, l.run_id, l.url) for l in leases],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return leases
+
+    def extend(self, leases: List[Lease], lease_seconds: float) -> None:
+        expires = time.time() + lease_seconds
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE work_items SET lease_expires = ? WHERE run_id = ? AND url = ? AND lease_token = ?"
+                " AND state = 'leased'",
+                [(expires, l.run_id, l.url, l.token) for l in leases],
+            )
+
+    def _finish(self, lease: Lease, state: str, result: Optional[str], error: Optional[str]) -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE work_items SET state = ?, result = ?, error = ?, lease_token = NULL, updated_at = ?"
+                " WHERE run_id = ? AND url = ? AND lease_token = ? AND state = 'leased'",
+                (state, result, error, time.time(), lease.run_id, lease.url, lease.token),
+            )
+            return cur.rowcount == 1
+
+    def ack(self, lease: Lease, row: Dict) -> bool:
+        return self._finish(lease, "done", json.dumps(row), None)
+
+    def fail(self, lease: Lease, error: str) -> None:
+        # back to pending for another worker, unless this was the last attempt
+        with self._lock:
+            self._conn.execute(
+                "UPDATE work_items SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,"
+                " error = ?, lease_token = NULL, updated_at = ?"
+                " WHERE run_id = ? AND url = ? AND lease_token = ? AND state = 'leased'",
+                (self.max_attempts, error, time.time(), lease.run_id, lease.url, lease.token),
+            )
+
+    def results(self, run_id: str, limit: int = 100) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM work_items WHERE run_id = ? AND state = 'done' LIMIT ?", (run_id, limit)
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def mark_saved(self, run_id: str, urls: List[str]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE work_items SET state = 'saved', result = NULL, updated_at = ?"
+                " WHERE run_id = ? AND url = ? AND state = 'done'",
+                [(now, run_id, canonical_profile_url(u)) for u in urls],
+            )
+
+    def counts(self, run_id: str) -> Dict[str, int]:
+        with self._lock:
+            # with every worker gone nobody leases again: give up on spent leases here too
+            self._expire(time.time())
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM work_items WHERE run_id = ? GROUP BY state", (run_id,)
+            ).fetchall()
+        out = {"pending": 0, "leased": 0, "done": 0, "saved": 0, "failed": 0}
+        out.update(dict(rows))
+        return out
+
+    def idle(self, stale_after: float = 600.0) -> bool:
+        with self._lock:
+            searching = self._conn.execute(
+                "SELECT 1 FROM work_runs WHERE search_done = 0 AND heartbeat >= ? LIMIT 1",
+                (time.time() - stale_after,),
+            ).fetchone()
+            open_items = self._conn.execute(
+                "SELECT 1 FROM work_items WHERE state IN ('pending', 'leased') LIMIT 1"
+            ).fetchone()
+        return searching is None and open_items is None
+
+
+QUEUES = {
+    "sqlite": SqliteWorkQueue,
+}
+
+
+def open_queue(url: str, max_attempts: int = 3) -> WorkQueue:
+    """`sqlite:///path/queue.sqlite` or a bare path (SQLite). Other backends register in QUEUES."""
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        scheme, rest = "sqlite", url
+    elif scheme == "sqlite":
+        rest = rest[1:] if rest.startswith("/") else rest  # sqlite:///rel.db -> rel.db, sqlite:////abs -> /abs
+    try:
+        cls = QUEUES[scheme]
+    except KeyError:
+        raise ValueError(f"Unknown work queue backend '{scheme}' (choose from {', '.join(QUEUES)})")
+    return cls(rest, max_attempts=max_attempts)